@@ -0,0 +1,78 @@
+"""Benchmark extraction strategies offline against the local synthetic CDS backend.
+
+Runs the same query as a full CSV extract, a full Parquet extract, a streamed Parquet
+extract and a repeat through the query result cache, then prints the metrics of each.
+
+Usage:
+    python benchmarks/benchmark_extraction.py --rows 1000000
+"""
+
+import argparse
+import tempfile
+
+from gov_uk_dashboards.data.extract_metrics import format_extract_metrics_table
+from gov_uk_dashboards.data.get_data import GenericDataQuery, set_query_result_cache
+from gov_uk_dashboards.data.local_backend import (
+    SYNTHETIC_TABLE_NAME,
+    local_cds_backend,
+)
+from gov_uk_dashboards.data.query_cache import QueryResultCache
+
+SERVER = "local-cds"
+
+
+def _make_query(directory, filename, file_format, batch_size=None):
+    class BenchmarkQuery(GenericDataQuery):
+        """Query reading the whole synthetic table."""
+
+        dir = directory
+        server = SERVER
+
+        def query(self):
+            """Return the query text."""
+            return f"SELECT * FROM {SYNTHETIC_TABLE_NAME}"
+
+    BenchmarkQuery.filename = filename
+    BenchmarkQuery.file_format = file_format
+    BenchmarkQuery.batch_size = batch_size
+    return BenchmarkQuery()
+
+
+def main():
+    """Run each extraction strategy and print a table of their metrics."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with local_cds_backend(
+        SERVER, rows=args.rows
+    ), tempfile.TemporaryDirectory() as out:
+        queries = [
+            _make_query(out, "full.csv", "csv"),
+            _make_query(out, "full.parquet", "parquet"),
+            _make_query(out, "streamed.parquet", "parquet", args.batch_size),
+        ]
+        for query in queries:
+            query.get_data_from_cds()
+
+        set_query_result_cache(QueryResultCache(f"{out}/cache"))
+        try:
+            cached_queries = [
+                _make_query(out, "uncached.arrow", "ipc"),
+                _make_query(out, "cached.arrow", "ipc"),
+            ]
+            for query in cached_queries:
+                query.get_data_from_cds()
+        finally:
+            set_query_result_cache(None)
+
+        print(
+            format_extract_metrics_table(
+                [query.metrics for query in queries + cached_queries]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
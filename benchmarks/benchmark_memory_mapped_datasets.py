@@ -0,0 +1,101 @@
+"""Compare the memory used by app workers loading an Arrow IPC extract with and without
+memory mapping.
+
+Starts several worker processes which each load the same file with load_data_file and read
+every column, as a dashboard worker would. While all workers hold the data, each reports its
+resident set size (RSS) and proportional set size (PSS). PSS splits shared pages between the
+processes mapping them, so its total across workers is the memory actually used. Reading
+/proc requires Linux.
+
+Usage:
+    python benchmarks/benchmark_memory_mapped_datasets.py --rows 10000000 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+import polars as pl
+
+from gov_uk_dashboards.constants import AREA_CODE, DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.data.data_files import load_data_file, write_data_file
+
+
+def _get_memory_mb() -> dict[str, float]:
+    memory_mb = {}
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss"):
+                memory_mb[name] = int(value.split()[0]) / 1024
+    return memory_mb
+
+
+def _run_worker(path, memory_map, results, loaded, finished):
+    before = _get_memory_mb()
+    df = load_data_file(path, memory_map=memory_map)
+    # Read every value, as filtering and plotting would, so all pages are resident.
+    df.select(pl.all().hash().sum())
+    loaded.wait()
+    after = _get_memory_mb()
+    results.put({name: value - before[name] for name, value in after.items()})
+    finished.wait()
+
+
+def _measure_workers(path: str, workers: int, memory_map: bool) -> list[dict]:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    loaded = context.Barrier(workers)
+    finished = context.Event()
+    processes = [
+        context.Process(
+            target=_run_worker, args=(path, memory_map, results, loaded, finished)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    worker_memory = [results.get() for _ in processes]
+    finished.set()
+    for process in processes:
+        process.join()
+    return worker_memory
+
+
+def _get_test_data(rows: int) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            MEASURE: rng.choice([f"Measure {i}" for i in range(20)], rows),
+            AREA_CODE: rng.choice([f"E0600{i:04}" for i in range(300)], rows),
+            DATE_VALID: rng.integers(19000, 20000, rows).astype("datetime64[D]"),
+            VALUE: rng.random(rows),
+        }
+    )
+
+
+def main():
+    """Write a test extract and print the memory used per worker for each load mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "extract.arrow")
+        write_data_file(_get_test_data(args.rows), path)
+        print(f"File size: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        print(f"{'Load':<14}{'Worker':>8}{'RSS MB':>10}{'PSS MB':>10}")
+        for memory_map in (False, True):
+            label = "memory mapped" if memory_map else "copied"
+            worker_memory = _measure_workers(path, args.workers, memory_map)
+            for i, memory in enumerate(worker_memory):
+                print(f"{label:<14}{i:>8}{memory['Rss']:>10.1f}{memory['Pss']:>10.1f}")
+            total_pss = sum(memory["Pss"] for memory in worker_memory)
+            print(f"{label:<14}{'total':>8}{'':>10}{total_pss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark TimeSeriesChart build time against the number of traces.
+
+For each trace count, builds a chart from monthly data for that many local authorities and
+reports the median time to build the chart, with and without Plotly's property validators,
+and to split the data into traces by filtering once per trace compared with the single
+partition pass used by the chart. It then reports the
+time to build and serialise the figure, and the size of its JSON, rendered as SVG (go.Scatter)
+and as WebGL (go.Scattergl).
+
+Usage:
+    python benchmarks/benchmark_time_series_chart.py --trace-counts 10 100 300 --months 120
+"""
+
+import argparse
+import datetime
+from statistics import median
+from time import perf_counter
+from typing import Optional
+
+import polars as pl
+
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+from gov_uk_dashboards.constants import AREA_CODE, DATE_VALID, VALUE
+
+
+def get_benchmark_chart_data(trace_count: int, months: int) -> pl.DataFrame:
+    """Return shuffled monthly values for trace_count area codes."""
+    dates = [
+        datetime.date(2000 + month // 12, month % 12 + 1, 1).isoformat()
+        for month in range(months)
+    ]
+    return pl.DataFrame(
+        {
+            AREA_CODE: [f"E06{i:06}" for i in range(trace_count) for _ in dates],
+            DATE_VALID: dates * trace_count,
+            VALUE: [float(i % 97) for i in range(trace_count * months)],
+        }
+    ).sample(fraction=1.0, shuffle=True, seed=0)
+
+
+def get_benchmark_chart(
+    df: pl.DataFrame,
+    webgl_point_threshold: Optional[int] = None,
+    validate_figure: bool = True,
+) -> TimeSeriesChart:
+    """Build a chart with a trace per area code, all but the first grey, using WebGL when it
+    has more than webgl_point_threshold points, and with Plotly's property validators if
+    validate_figure."""
+    trace_names = df[AREA_CODE].unique().sort().to_list()
+    return TimeSeriesChart(
+        {"main_title": "Benchmark", "subtitle": "Time series"},
+        VALUE,
+        {
+            trace_name: {
+                "custom_data": [DATE_VALID, VALUE],
+                "hover_text_headers": ["Date", "Value"],
+            }
+            for trace_name in trace_names
+        },
+        df,
+        trace_names,
+        trace_name_column=AREA_CODE,
+        grey_traces=trace_names[1:],
+        webgl_point_threshold=webgl_point_threshold,
+        validate_figure=validate_figure,
+    )
+
+
+def _time(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def _split_by_filter(chart: TimeSeriesChart) -> list[pl.DataFrame]:
+    return [
+        chart.filtered_df.filter(pl.col(chart.trace_name_column) == trace_name).sort(
+            chart.x_axis_column
+        )
+        for trace_name in chart.trace_name_list
+    ]
+
+
+def main():
+    """Print the median build, split and render comparison times for each trace count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace-counts", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'Traces':>8}{'Build ms':>12}{'Unvalidated ms':>17}{'Filter split ms':>18}"
+        f"{'Partition ms':>15}"
+    )
+    for trace_count in args.trace_counts:
+        df = get_benchmark_chart_data(trace_count, args.months)
+        chart = get_benchmark_chart(df)
+        build = _time(lambda: get_benchmark_chart(df).fig, args.repeats)
+        unvalidated_build = _time(
+            lambda: get_benchmark_chart(df, validate_figure=False).fig, args.repeats
+        )
+        # pylint: disable=protected-access
+        partition = _time(chart._get_df_list_for_time_series, args.repeats)
+        filtered = _time(lambda: _split_by_filter(chart), args.repeats)
+        print(
+            f"{trace_count:>8}{build * 1000:>12.1f}{unvalidated_build * 1000:>17.1f}"
+            f"{filtered * 1000:>18.1f}"
+            f"{partition * 1000:>15.1f}"
+        )
+
+    print()
+    _print_rendering_comparison(args.trace_counts, args.months, args.repeats)
+
+
+def _print_rendering_comparison(trace_counts: list[int], months: int, repeats: int):
+    print(
+        f"{'Traces':>8}{'Points':>10}{'SVG ms':>10}{'WebGL ms':>10}"
+        f"{'SVG KB':>10}{'WebGL KB':>10}"
+    )
+    for trace_count in trace_counts:
+        df = get_benchmark_chart_data(trace_count, months)
+        svg_fig = get_benchmark_chart(df).fig
+        webgl_fig = get_benchmark_chart(df, webgl_point_threshold=0).fig
+        svg_build = _time(lambda: get_benchmark_chart(df).fig.to_json(), repeats)
+        webgl_build = _time(
+            lambda: get_benchmark_chart(df, webgl_point_threshold=0).fig.to_json(),
+            repeats,
+        )
+        print(
+            f"{trace_count:>8}{sum(len(trace.x) for trace in svg_fig.data):>10}"
+            f"{svg_build * 1000:>10.1f}{webgl_build * 1000:>10.1f}"
+            f"{len(svg_fig.to_json()) / 1024:>10.1f}"
+            f"{len(webgl_fig.to_json()) / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Downsample time series for plotting with Largest-Triangle-Three-Buckets (LTTB)"""
+
+import numpy as np
+import polars as pl
+
+
+def get_lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select the indices of at most max_points points which keep the visual shape of a line,
+    using Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points between are split into
+    max_points - 2 buckets, and from each the point forming the largest triangle with the
+    previously selected point and the average of the next bucket is kept.
+
+    Args:
+        x (np.ndarray): Increasing x values.
+        y (np.ndarray): y values, without NaNs.
+        max_points (int): Maximum number of points to keep, at least 3.
+
+    Returns:
+        np.ndarray: Increasing indices of the points to keep.
+    """
+    point_count = len(x)
+    if point_count <= max_points:
+        return np.arange(point_count)
+    if max_points < 3:
+        raise ValueError("max_points must be at least 3")
+
+    bucket_edges = np.linspace(1, point_count - 1, max_points - 1).astype(int)
+    indices = np.empty(max_points, dtype=int)
+    indices[0] = 0
+    indices[-1] = point_count - 1
+    selected = 0
+    for bucket in range(max_points - 2):
+        start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+        if bucket == max_points - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_end = bucket_edges[bucket + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample_time_series_df(
+    df: pl.DataFrame, x_column: str, y_column: str, max_points: int
+) -> pl.DataFrame:
+    """
+    Return the rows of df for at most max_points points of its line, selected with
+    get_lttb_indices, keeping every column so hover data stays aligned with the points.
+
+    Rows with a null or NaN y value are also kept, so gaps in the line stay where they are.
+
+    Args:
+        df (pl.DataFrame): Data for one trace, sorted by x_column.
+        x_column (str): Column of x values. Dates as "%Y-%m-%d" strings, temporal or numeric.
+            Other columns are treated as evenly spaced.
+        y_column (str): Column of numeric y values.
+        max_points (int): Maximum number of points with a y value to keep, at least 3.
+
+    Returns:
+        pl.DataFrame: The selected rows of df, in their original order.
+    """
+    if df.height <= max_points:
+        return df
+    x_values = df[x_column]
+    if x_values.dtype == pl.String:
+        x_values = x_values.str.to_datetime("%Y-%m-%d", strict=False)
+    if x_values.dtype.is_temporal():
+        x_values = x_values.to_physical()
+    if not x_values.dtype.is_numeric() or x_values.null_count():
+        x_values = pl.int_range(df.height, eager=True)
+
+    row_index = np.arange(df.height)
+    y_values = df[y_column].cast(pl.Float64).fill_nan(None)
+    has_y_value = y_values.is_not_null().to_numpy()
+    lttb_indices = get_lttb_indices(
+        x_values.cast(pl.Float64).to_numpy()[has_y_value],
+        y_values.to_numpy()[has_y_value],
+        max_points,
+    )
+    keep = np.union1d(row_index[has_y_value][lttb_indices], row_index[~has_y_value])
+    return df[keep]
@@ -6,7 +6,7 @@ from dash import dcc
 
 
 def generate_dash_graph_from_figure(
-    figure: Figure,
+    figure: Union[Figure.Figure, Dict[str, Any]],
     graph_name: str,
     graph_style: Union[Dict[str, Any], None] = None,
     double_click_attribute: Union[str, bool] = False,
@@ -17,7 +17,8 @@ def generate_dash_graph_from_figure(
     customisation of the graph's appearance and behavior, and includes default pointer cursor,
     from "default-cursor-graph" class.
     Args:
-    - figure: Plotly.graph_objects.Figure instance to be displayed within the Dash Graph component.
+    - figure: Plotly.graph_objects.Figure instance, or a figure as a plain dict, to be displayed
+              within the Dash Graph component.
     - graph_name: A name for the id of the graph component.
     - graph_style: An optional dictionary specifying CSS styles to apply to the graph component.
     - double_click_attribute: Determines the action taken on double-clicking the graph.
@@ -33,7 +34,10 @@ def generate_dash_graph_from_figure(
     if "height" not in graph_style.keys():
         graph_style["height"] = "450px"
 
-    figure.update_layout(dragmode=False)
+    if isinstance(figure, dict):
+        figure.setdefault("layout", {})["dragmode"] = False
+    else:
+        figure.update_layout(dragmode=False)
     # pylint: disable=duplicate-code
     return dcc.Graph(
         id=f"{graph_name}-graph",
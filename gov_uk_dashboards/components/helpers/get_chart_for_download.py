@@ -1,8 +1,21 @@
 """get_chart_for_download"""
 
+from typing import Any, Union
+import plotly.graph_objects as go
+
 from gov_uk_dashboards.constants import MAIN_TITLE, SUBTITLE
 
 
+def get_figure_copy(fig: Union[go.Figure, dict[str, Any]]) -> go.Figure:
+    """Returns a deep copy of fig that can be changed without affecting fig.
+
+    fig has already been validated, or assembled from valid plain dicts, so the copy skips
+    Plotly's property validators, which makes it several times quicker than building the
+    figure again.
+    """
+    return go.Figure(fig, _validate=False)
+
+
 def get_chart_for_download(self, fig):
     """Returns a fig with title and subtitle for download as png"""
     main_title = self.title_data[MAIN_TITLE]
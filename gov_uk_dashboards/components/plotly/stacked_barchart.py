@@ -1,7 +1,7 @@
 """stacked_barchart function"""
 
 import json
-from typing import Optional
+from typing import Any, Optional, Union
 from dash import html
 from dateutil.relativedelta import relativedelta
 import polars as pl
@@ -10,8 +10,14 @@ import plotly.graph_objects as go
 
 from gov_uk_dashboards.components.helpers.get_chart_for_download import (
     get_chart_for_download,
+    get_figure_copy,
 )
 from gov_uk_dashboards.components.plotly.time_series_and_stacked_barchart_helper_functions import (
+    COMPACT_DATAFRAME_TYPE,
+    add_traces_to_figure,
+    create_trace,
+    decode_dataframe_compact,
+    encode_dataframe_compact,
     format_yaxes,
 )
 from gov_uk_dashboards.constants import (
@@ -79,6 +85,7 @@ class StackedBarChart:
         y_axis_tick_prefix: Optional[str] = None,
         x_hoverformat: Optional[str] = "%b %Y",
         use_plotly_automated_y_axis: bool = False,
+        validate_figure: bool = True,
     ):
         """Initializes the StackedBarChart instance.
         To display the chart, call the `get_stacked_bar_chart()` method.
@@ -105,6 +112,10 @@ class StackedBarChart:
             total_trace_name (Optional[str], optional): Name for an optional total to be added to
                 bottom of hover text, must be in MEASURE column of df, line_trace_name will display
                 in legend. Defaults to None.
+            validate_figure (bool, optional): Whether to build traces with Plotly's property
+                validators. If False they are assembled as plain dicts, with numeric data as
+                typed arrays, which is much quicker for charts with many traces.
+                Defaults to True.
         """
         self.title_data = title_data
         self.y_axis_column = y_axis_column
@@ -131,7 +142,19 @@ class StackedBarChart:
         self.y_axis_tick_prefix = y_axis_tick_prefix
         self.x_hoverformat = x_hoverformat
         self.use_plotly_automated_y_axis = use_plotly_automated_y_axis
-        self.fig = self.create_stacked_bar_chart()
+        self.validate_figure = validate_figure
+        self._fig = None
+
+    @property
+    def fig(self) -> Union[go.Figure, dict[str, Any]]:
+        """The stacked bar chart, created on first use, as a plain dict if not validate_figure."""
+        if self._fig is None:
+            self._fig = self.create_stacked_bar_chart()
+        return self._fig
+
+    @fig.setter
+    def fig(self, fig: Union[go.Figure, dict[str, Any]]):
+        self._fig = fig
 
     def get_stacked_bar_chart(self) -> html.Div:
         """Creates and returns stacked bar chart for display on application.
@@ -163,12 +186,22 @@ class StackedBarChart:
         except (TypeError, OverflowError):
             return False
 
-    def to_dict(self):
-        "Converts class attributes to json format."
+    def to_dict(self, compact: bool = False):
+        """Converts class attributes to json format.
+
+        Args:
+            compact (bool, optional): Whether to encode DataFrames as compressed Arrow IPC
+                rather than a list of row dicts, which is much smaller and quicker to restore,
+                e.g. from a dcc.Store. Defaults to False.
+        """
         result = {}
         for k, v in self.__dict__.items():
+            if k == "_fig":
+                continue
             if self.is_json_serializable(v):
                 result[k] = v
+            elif isinstance(v, pl.DataFrame) and compact:
+                result[k] = encode_dataframe_compact(v)
             elif isinstance(v, pl.DataFrame):
                 result[k] = {"_type": "polars_df", "data": v.to_dicts()}
             elif hasattr(v, "to_dict"):
@@ -182,9 +215,13 @@ class StackedBarChart:
         "Creates a class instance from dict of attributes."
         restored = {}
         for k, v in data.items():
+            if k in ["fig", "_fig"]:
+                continue
             if isinstance(v, dict) and "_type" in v:
                 if v["_type"] == "polars_df":
                     restored[k] = pl.DataFrame(v["data"])
+                elif v["_type"] == COMPACT_DATAFRAME_TYPE:
+                    restored[k] = decode_dataframe_compact(v)
                 elif v["_type"] == "custom":
                     # optionally restore known nested types here
                     pass
@@ -194,7 +231,7 @@ class StackedBarChart:
 
     def get_stacked_bar_chart_for_download(self):
         """Return fig with title and subtitle for download as png"""
-        return get_chart_for_download(self, self.create_stacked_bar_chart())
+        return get_chart_for_download(self, get_figure_copy(self.fig))
 
     def create_stacked_bar_chart(
         self,
@@ -203,11 +240,14 @@ class StackedBarChart:
         # pylint: disable=too-many-locals
 
         fig = go.Figure()
+        traces = []
         if self.total_trace_name is not None:
             df = self.df.filter(pl.col(MEASURE) == self.total_trace_name)
 
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                create_trace(
+                    go.Scatter,
+                    self.validate_figure,
                     x=df[self.x_axis_column],
                     y=df[self.y_axis_column],
                     customdata=self._get_custom_data(self.total_trace_name, df),
@@ -238,7 +278,7 @@ class StackedBarChart:
                 colour_list,
             )
         ):
-            fig.add_trace(
+            traces.append(
                 self.create_bar_chart_trace(
                     df.sort(self.x_axis_column),
                     trace_name,
@@ -251,8 +291,10 @@ class StackedBarChart:
             colour = AFAccessibleColours.CATEGORICAL.value[len(self.trace_name_list)]
             df = self.df.filter(pl.col(MEASURE) == self.line_trace_name)
 
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                create_trace(
+                    go.Scatter,
+                    self.validate_figure,
                     x=df[FINANCIAL_YEAR_ENDING],
                     y=df[VALUE],
                     customdata=self._get_custom_data(self.line_trace_name, df),
@@ -300,7 +342,7 @@ class StackedBarChart:
 
         fig.update_layout(**layout)
         self._format_xaxis(fig)
-        return fig
+        return add_traces_to_figure(fig, traces, self.validate_figure)
 
     def create_bar_chart_trace(
         self,
@@ -317,6 +359,9 @@ class StackedBarChart:
             trace_name (str): Name of trace.
             hover_label (dict[str,str]): Properties for hoverlabel parameter.
             colour (str): Colour for bar.
+
+        Returns:
+            The trace, as a plain dict if validate_figure is False, see create_trace.
         """
         if (
             self.initially_hidden_traces is not None
@@ -326,14 +371,14 @@ class StackedBarChart:
         else:
             visible = True
 
-        return go.Bar(
+        return create_trace(
+            go.Bar,
+            self.validate_figure,
             x=df[self.x_axis_column],
             y=df[self.y_axis_column],
             name=trace_name + LEGEND_SPACING,
             visible=visible,
-            hovertemplate=[
-                self._get_hover_template(trace_name) for i in range(df.shape[0])
-            ],
+            hovertemplate=self._get_hover_template(trace_name),
             customdata=self._get_custom_data(trace_name, df),
             hoverlabel=hover_label,
             marker={"color": colour},
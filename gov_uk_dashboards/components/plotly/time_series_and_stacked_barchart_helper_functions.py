@@ -1,11 +1,31 @@
 """time_series_and_stacked_barchart_helper_functions"""
 
+import base64
+import io
 import math
-from typing import List
+import re
+from datetime import date, datetime
+from typing import Any, List, Union
+import numpy as np
 import plotly
+import plotly.graph_objects as go
 import polars as pl
 from gov_uk_dashboards import colours
 
+COMPACT_DATAFRAME_TYPE = "polars_ipc"
+COMPACT_DATAFRAME_VERSION = 1
+# Plotly.js typed array dtypes, by NumPy dtype. Plotly.js has no 64-bit integer arrays.
+PLOTLY_TYPED_ARRAY_DTYPES = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+
 
 def format_yaxes(
     fig: plotly.graph_objects.Figure,
@@ -58,6 +78,107 @@ def format_yaxes(
     )
 
 
+def create_trace(
+    trace_class: type, validate: bool = True, **trace_properties
+) -> Union[go.Scatter, go.Scattergl, go.Bar, dict[str, Any]]:
+    """
+    Create a trace, as a trace_class object or, if validate is False, as a plain dict for a
+    figure assembled by add_traces_to_figure.
+
+    The plain dict skips Plotly's property validators, which dominate building charts with
+    many traces, so trace_properties must already be valid. Properties set to None are
+    dropped, and Polars Series and DataFrames are converted with get_typed_array.
+
+    Args:
+        trace_class (type): Trace class, e.g. go.Scatter.
+        validate (bool, optional): Whether to create a validated trace_class object.
+            Defaults to True.
+        **trace_properties: Properties of the trace, as passed to trace_class.
+
+    Returns:
+        Union[go.Scatter, go.Scattergl, go.Bar, dict[str, Any]]: The trace.
+    """
+    if validate:
+        return trace_class(**trace_properties)
+    # pylint: disable=protected-access
+    trace = {"type": trace_class._path_str}
+    for key, value in trace_properties.items():
+        if isinstance(value, (pl.Series, pl.DataFrame)):
+            trace[key] = get_typed_array(value)
+        elif value is not None:
+            trace[key] = value
+    return trace
+
+
+def get_typed_array(
+    values: Union[pl.Series, pl.DataFrame],
+) -> Union[dict[str, str], list]:
+    """
+    Return numeric values as a base64 encoded typed array, in the {"dtype", "bdata"} form
+    Plotly.js reads straight into a typed array. This is smaller and much quicker to
+    serialise than a JSON list of numbers.
+
+    A DataFrame of numeric columns becomes a two dimensional typed array, with a "shape".
+    Nulls become NaN, which Plotly.js also treats as missing, and 64-bit integers are cast to
+    32-bit if they fit. Other values are returned as a list, or a list of rows for a DataFrame.
+
+    Args:
+        values (Union[pl.Series, pl.DataFrame]): Values for a trace property, e.g. y.
+
+    Returns:
+        Union[dict[str, str], list]: The typed array, or values as a list.
+    """
+    if isinstance(values, pl.DataFrame):
+        if values.width == 0 or not all(dtype.is_numeric() for dtype in values.dtypes):
+            return values.rows()
+        array = values.to_numpy()
+    else:
+        if not values.dtype.is_numeric():
+            return values.to_list()
+        array = values.to_numpy()
+    if array.dtype.kind in "iu" and array.dtype.itemsize == 8:
+        fits_int32 = array.size == 0 or (
+            array.min() >= np.iinfo(np.int32).min
+            and array.max() <= np.iinfo(np.int32).max
+        )
+        array = array.astype(np.int32 if fits_int32 else np.float64)
+    if str(array.dtype) not in PLOTLY_TYPED_ARRAY_DTYPES:
+        return values.rows() if isinstance(values, pl.DataFrame) else values.to_list()
+
+    typed_array = {
+        "dtype": PLOTLY_TYPED_ARRAY_DTYPES[str(array.dtype)],
+        "bdata": base64.b64encode(np.ascontiguousarray(array)).decode("ascii"),
+    }
+    if array.ndim > 1:
+        typed_array["shape"] = ", ".join(str(length) for length in array.shape)
+    return typed_array
+
+
+def add_traces_to_figure(
+    fig: go.Figure, traces: list, validate: bool = True
+) -> Union[go.Figure, dict[str, Any]]:
+    """
+    Add traces made by create_trace to fig, which holds the rest of the chart.
+
+    Args:
+        fig (go.Figure): Figure with the chart's layout.
+        traces (list): Traces from create_trace, created with the same validate.
+        validate (bool, optional): Whether the traces were validated. If not, the figure is
+            returned as a plain dict of fig's layout and the trace dicts, which dcc.Graph
+            accepts as it is. Defaults to True.
+
+    Returns:
+        Union[go.Figure, dict[str, Any]]: The figure with traces, as a plain dict if not
+            validate.
+    """
+    if validate:
+        fig.add_traces(traces)
+        return fig
+    figure = fig.to_dict()
+    figure["data"] = traces
+    return figure
+
+
 def generate_human_readable_yticks(
     y_min: float, y_max: float, max_ticks: int = 10
 ) -> List[float]:
@@ -167,3 +288,69 @@ def compute_y_axis_ticks(
 
     ticks = generate_human_readable_yticks(y_axis_min, y_axis_max)
     return ticks
+
+
+def encode_dataframe_compact(df: pl.DataFrame) -> dict[str, Any]:
+    """
+    Encode df for a JSON payload, such as a dcc.Store, as zstd compressed Arrow IPC in
+    base64.
+
+    This is much smaller and quicker to round trip than a list of row dicts, and keeps the
+    column types.
+
+    Args:
+        df (pl.DataFrame): DataFrame to encode.
+
+    Returns:
+        dict[str, Any]: JSON serialisable dict, tagged with its type and format version, to
+            pass to decode_dataframe_compact.
+    """
+    buffer = io.BytesIO()
+    df.write_ipc(buffer, compression="zstd")
+    return {
+        "_type": COMPACT_DATAFRAME_TYPE,
+        "_version": COMPACT_DATAFRAME_VERSION,
+        "data": base64.b64encode(buffer.getvalue()).decode("ascii"),
+    }
+
+
+def decode_dataframe_compact(value: dict[str, Any]) -> pl.DataFrame:
+    """
+    Decode a DataFrame encoded by encode_dataframe_compact.
+
+    Args:
+        value (dict[str, Any]): Dict returned by encode_dataframe_compact.
+
+    Returns:
+        pl.DataFrame: The encoded DataFrame.
+
+    Raises:
+        ValueError: If value was encoded with an unsupported format version.
+    """
+    if value.get("_version") != COMPACT_DATAFRAME_VERSION:
+        raise ValueError(
+            f"Unsupported {COMPACT_DATAFRAME_TYPE} version: {value.get('_version')}"
+        )
+    return pl.read_ipc(io.BytesIO(base64.b64decode(value["data"])))
+
+
+def render_hover_template(hovertemplate: str, customdata: tuple) -> str:
+    """Return hovertemplate with its customdata placeholders filled in from customdata, as
+    Plotly.js shows them, and without its <extra></extra> label."""
+    return re.sub(
+        r"%\{customdata\[(\d+)\]\}",
+        lambda match: _format_hover_value(customdata[int(match.group(1))]),
+        hovertemplate,
+    ).replace("<extra></extra>", "")
+
+
+def _format_hover_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
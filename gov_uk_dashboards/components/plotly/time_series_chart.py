@@ -1,8 +1,9 @@
 """get_time_series_chart function"""
 
 from datetime import datetime, date
+from functools import lru_cache
 import json
-from typing import Optional
+from typing import Any, Optional, Union
 from dateutil.relativedelta import relativedelta
 from dash import html
 import polars as pl
@@ -10,7 +11,13 @@ import polars as pl
 import plotly.graph_objects as go
 
 from gov_uk_dashboards.components.plotly.time_series_and_stacked_barchart_helper_functions import (
+    COMPACT_DATAFRAME_TYPE,
+    add_traces_to_figure,
+    create_trace,
+    decode_dataframe_compact,
+    encode_dataframe_compact,
     format_yaxes,
+    render_hover_template,
 )
 from gov_uk_dashboards.constants import (
     CHART_LABEL_FONT_SIZE,
@@ -21,9 +28,11 @@ from gov_uk_dashboards.constants import (
     MAIN_TITLE,
     SHOW_INITIAL_MARKER,
     SUBTITLE,
-    YEAR,
 )
 from gov_uk_dashboards.colours import AFAccessibleColours
+from gov_uk_dashboards.components.helpers.downsample_time_series import (
+    downsample_time_series_df,
+)
 from gov_uk_dashboards.components.helpers.display_chart_or_table_with_header import (
     display_chart_or_table_with_header,
 )
@@ -36,6 +45,7 @@ from gov_uk_dashboards.components.helpers.plotting_helper_functions import (
 )
 from gov_uk_dashboards.components.helpers.get_chart_for_download import (
     get_chart_for_download,
+    get_figure_copy,
 )
 from gov_uk_dashboards.components.helpers.update_layout_bgcolor_margin import (
     update_layout_bgcolor_margin,
@@ -50,6 +60,10 @@ from gov_uk_dashboards.lib.datetime_functions.datetime_functions import (
     replace_jun_jul_month_abbreviations,
 )
 
+# Charts with more points than this render with WebGL. Browsers limit the WebGL contexts on a
+# page, so this stays high enough that only the largest charts use one.
+WEBGL_POINT_THRESHOLD = 20_000
+
 
 class TimeSeriesChart:
     """Class for use in generating time series charts."""
@@ -97,6 +111,9 @@ class TimeSeriesChart:
         stacked: Optional[bool] = False,
         top_trace: Optional[str] = None,
         hide_markers: bool = True,
+        max_points_per_trace: Optional[int] = None,
+        webgl_point_threshold: Optional[int] = WEBGL_POINT_THRESHOLD,
+        validate_figure: bool = True,
     ):  # pylint: disable=duplicate-code
         self.title_data = title_data
         self.y_axis_column = y_axis_column
@@ -149,9 +166,29 @@ class TimeSeriesChart:
         self.stacked = stacked
         self.top_trace = top_trace
         self.hide_markers = hide_markers
+        self.max_points_per_trace = max_points_per_trace
+        self.webgl_point_threshold = webgl_point_threshold
+        self.validate_figure = validate_figure
         self.colour_list = self._get_colour_list()
-        self.fig = self.create_time_series_chart()
         self.footnote = footnote
+        if not self.x_unified_hovermode and self.x_hoverformat is not None:
+            raise ValueError(
+                "x_hoverformat can only be specified if x_unified_hovermode is True"
+            )
+        if self.max_points_per_trace is not None and self.max_points_per_trace < 3:
+            raise ValueError("max_points_per_trace must be at least 3")
+        self._fig = None
+
+    @property
+    def fig(self) -> Union[go.Figure, dict[str, Any]]:
+        """The time series chart, created on first use, as a plain dict if not validate_figure."""
+        if self._fig is None:
+            self._fig = self.create_time_series_chart()
+        return self._fig
+
+    @fig.setter
+    def fig(self, fig: Union[go.Figure, dict[str, Any]]):
+        self._fig = fig
 
     def get_time_series_chart(self) -> html.Div:
         """Creates and returns time series chart for display on application.
@@ -185,13 +222,23 @@ class TimeSeriesChart:
         except (TypeError, OverflowError):
             return False
 
-    def to_dict(self):
-        "Converts class attributes to json format."
+    def to_dict(self, compact: bool = False):
+        """Converts class attributes to json format.
+
+        Args:
+            compact (bool, optional): Whether to encode DataFrames as compressed Arrow IPC
+                rather than a list of row dicts, which is much smaller and quicker to restore,
+                e.g. from a dcc.Store. Defaults to False.
+        """
         # pylint: disable=duplicate-code
         result = {}
         for k, v in self.__dict__.items():
+            if k == "_fig":
+                continue
             if self.is_json_serializable(v):
                 result[k] = v
+            elif isinstance(v, pl.DataFrame) and compact:
+                result[k] = encode_dataframe_compact(v)
             elif isinstance(v, pl.DataFrame):
                 result[k] = {"_type": "polars_df", "data": v.to_dicts()}
             elif isinstance(v, pl.Series):
@@ -203,13 +250,16 @@ class TimeSeriesChart:
     @classmethod
     def from_dict(cls, data):
         "Creates a class instance from dict of attributes."
+        # pylint: disable=duplicate-code
         restored = {}
         for k, v in data.items():
-            if k in ["markers", "colour_list", "fig"]:
+            if k in ["markers", "colour_list", "fig", "_fig"]:
                 continue
             if isinstance(v, dict) and "_type" in v:
                 if v["_type"] == "polars_df":
                     restored[k] = pl.DataFrame(v["data"])
+                elif v["_type"] == COMPACT_DATAFRAME_TYPE:
+                    restored[k] = decode_dataframe_compact(v)
                 elif v["_type"] == "polars_series":
                     restored[k] = pl.Series(v["data"])
                 else:
@@ -221,7 +271,7 @@ class TimeSeriesChart:
 
     def get_time_series_chart_for_download(self):
         """Return fig with title and subtitle for download as png"""
-        return get_chart_for_download(self, self.create_time_series_chart())
+        return get_chart_for_download(self, get_figure_copy(self.fig))
 
     def create_time_series_chart(
         self,
@@ -230,19 +280,18 @@ class TimeSeriesChart:
         # pylint: disable=too-many-locals
         # pylint: disable=duplicate-code
 
-        if not self.x_unified_hovermode and self.x_hoverformat is not None:
-            raise ValueError(
-                "x_hoverformat can only be specified if x_unified_hovermode is True"
-            )
-
         fig = go.Figure()
+        traces = []
+        trace_dfs = self._get_trace_dfs()
         if self.additional_line:
             x_0 = self.additional_line["x0"]
             y_0 = self.additional_line["y0"]
             x_1 = self.additional_line["x1"]
             y_1 = self.additional_line["y1"]
             line_color = self.additional_line["color"]
-            trace_connector = go.Scatter(
+            trace_connector = create_trace(
+                go.Scatter,
+                self.validate_figure,
                 x=[x_0, x_1],
                 y=[y_0, y_1],
                 mode="lines",
@@ -252,21 +301,26 @@ class TimeSeriesChart:
                 showlegend=False,  # Optional: hide it from legend too
                 legendgroup=self.additional_line["legend_group"],
             )
-            fig.add_trace(trace_connector)
-        # pylint: disable=unused-variable
+            traces.append(trace_connector)
+        trace_df_list = [
+            self._downsample_trace_df(df)
+            for df in self._get_df_list_for_time_series(trace_dfs)
+        ]
+        use_webgl = self._use_webgl(sum(df.height for df in trace_df_list))
+        time_series_traces = []
         for i, (
             df,
             trace_name,
             colour,
-            marker,
         ) in enumerate(
             zip(
-                self._get_df_list_for_time_series(),
+                trace_df_list,
                 self.trace_name_list,
                 self.colour_list,
-                self.markers,
             )
         ):
+            # markers are reused once every symbol has been used, so no trace is dropped
+            marker = self.markers[i % len(self.markers)]
             # by default hide initial marker for a trace
             if SHOW_INITIAL_MARKER in df.columns and True in df.get_column(
                 SHOW_INITIAL_MARKER
@@ -278,62 +332,50 @@ class TimeSeriesChart:
                 focus_palette_list = AFAccessibleColours.FOCUS_PALETTE.value
                 colour = focus_palette_list[1]
             legendgroup = self._get_legend_group(df)
-            fig.add_trace(
-                self.create_time_series_trace(
-                    df.sort(self.x_axis_column),
-                    trace_name,
-                    line_style=(
-                        {"dash": "dot", "color": colour}
-                        if self.dashed_trace_name_list is not None
-                        and trace_name in self.dashed_trace_name_list
-                        else {"dash": "solid", "color": colour}
-                    ),
-                    marker={"symbol": marker, "size": marker_sizes, "opacity": 1},
-                    legendgroup=legendgroup,
+            trace = self.create_time_series_trace(
+                df,
+                trace_name,
+                line_style=(
+                    {"dash": "dot", "color": colour}
+                    if self.dashed_trace_name_list is not None
+                    and trace_name in self.dashed_trace_name_list
+                    else {"dash": "solid", "color": colour}
                 ),
+                marker={"symbol": marker, "size": marker_sizes, "opacity": 1},
+                legendgroup=legendgroup,
+                use_webgl=use_webgl,
+                # WebGL traces have no zorder and are drawn in order, so focus traces are
+                # added last, with legendrank keeping the legend in trace_name_list order
+                legendrank=i if use_webgl else None,
+            )
+            time_series_traces.append(
+                (self._get_zorder(trace_name) if use_webgl else 0, trace)
             )
+        traces.extend(
+            trace for _, trace in sorted(time_series_traces, key=lambda t: t[0])
+        )
 
         if self.filled_traces_dict:
-            fill_df = self.filtered_df.filter(
-                pl.col(self.trace_name_column).is_in(
-                    [
-                        self.filled_traces_dict["upper"],
-                        self.filled_traces_dict["lower"],
-                    ]
-                )
-            ).sort(self.x_axis_column)
+            upper_df, lower_df = (
+                trace_dfs.get(self.filled_traces_dict[bound], self.filtered_df.clear())
+                for bound in ("upper", "lower")
+            )
+            fill_df = pl.concat([upper_df, lower_df]).sort(self.x_axis_column)
             x_series = fill_df[self.x_axis_column].unique().sort().to_list()
-            upper_trace = self.filled_traces_dict["upper"]
-            lower_trace = self.filled_traces_dict["lower"]
-            y_upper = fill_df.filter(pl.col(self.trace_name_column) == upper_trace)[
-                self.y_axis_column
-            ].to_list()
-            y_lower = fill_df.filter(pl.col(self.trace_name_column) == lower_trace)[
-                self.y_axis_column
-            ].to_list()
-            y_upper_formatted_value = fill_df.filter(
-                pl.col(self.trace_name_column) == upper_trace
-            )["FORMATTED_VALUE"].to_list()
-            y_lower_formatted_value = fill_df.filter(
-                pl.col(self.trace_name_column) == lower_trace
-            )["FORMATTED_VALUE"].to_list()
-            formatted_dates = fill_df.filter(
-                pl.col(self.trace_name_column) == upper_trace
-            )["FORMATTED_DATE"].to_list()
-            hover_text = [
-                f"{self.filled_traces_dict['name']} - {date}: "
-                f"{low_value} - {high_value}<extra></extra>"
-                for low_value, high_value, date in zip(
-                    y_lower_formatted_value,
-                    y_upper_formatted_value,
-                    formatted_dates,
+            y_upper = upper_df[self.y_axis_column].to_list()
+            y_lower = lower_df[self.y_axis_column].to_list()
+            hover_data = list(
+                zip(
+                    upper_df["FORMATTED_DATE"].to_list(),
+                    lower_df["FORMATTED_VALUE"].to_list(),
+                    upper_df["FORMATTED_VALUE"].to_list(),
                 )
-            ]
-
-            hover_text_full = hover_text + hover_text[::-1]
+            )
             legendgroup = self._get_legend_group(fill_df)
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                create_trace(
+                    go.Scatter,
+                    self.validate_figure,
                     x=x_series + x_series[::-1],
                     y=y_upper + y_lower[::-1],
                     fill="toself",
@@ -342,7 +384,11 @@ class TimeSeriesChart:
                     ),
                     line={"color": "rgba(255,255,255,0)"},
                     name=self.filled_traces_dict["name"] + LEGEND_SPACING,
-                    hovertemplate=hover_text_full,
+                    hovertemplate=(
+                        f"{self.filled_traces_dict['name']} - %{{customdata[0]}}: "
+                        "%{customdata[1]} - %{customdata[2]}<extra></extra>"
+                    ),
+                    customdata=hover_data + hover_data[::-1],
                     hoveron="points",
                     legendgroup=legendgroup,
                 )
@@ -420,7 +466,18 @@ class TimeSeriesChart:
             hovermode="x unified" if self.x_unified_hovermode is True else "closest",
             hoverdistance=self.hover_distance,  # Increase distance to simulate hover 'always on'
         )
-        return fig
+        return add_traces_to_figure(fig, traces, self.validate_figure)
+
+    def _downsample_trace_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Downsample a trace's data to max_points_per_trace points, if set.
+
+        Stacked traces are not downsampled, as they must share their x values.
+        """
+        if self.max_points_per_trace is None or self.stacked:
+            return df
+        return downsample_time_series_df(
+            df, self.x_axis_column, self.y_axis_column, self.max_points_per_trace
+        )
 
     def _get_legend_group(self, df):
         if "legend_group" in df.columns and len(df) > 0:
@@ -440,6 +497,12 @@ class TimeSeriesChart:
             tickmode="array",
             range=range_x,
             hoverformat=self.x_hoverformat,
+            # set rather than detected, as unvalidated traces give dates as timestamps
+            type=(
+                None
+                if self.xaxis_tick_text_format == XAxisFormat.FINANCIAL_QUARTER.value
+                else "date"
+            ),
         )
 
     def create_time_series_trace(
@@ -449,6 +512,8 @@ class TimeSeriesChart:
         line_style: dict[str, str],
         marker: dict[str, str],
         legendgroup: str,
+        use_webgl: bool = False,
+        legendrank: Optional[int] = None,
     ):
         """Creates a trace for the plot.
         Args:
@@ -458,6 +523,11 @@ class TimeSeriesChart:
             line_style (dict[str, str]): Properties for line_style parameter.
             marker (dict[str,str]): Properties for marker parameter.
             legendgroup (str): Name to group by in legend,
+            use_webgl (bool): Whether to render the trace with WebGL, as a go.Scattergl, rather
+                than SVG. Defaults to False.
+            legendrank (Optional[int]): Rank of the trace in the legend. Defaults to None.
+        Returns:
+            The trace, as a plain dict if validate_figure is False, see create_trace.
         """
         if (
             self.initially_hidden_traces is not None
@@ -467,62 +537,91 @@ class TimeSeriesChart:
         else:
             visible = True
 
-        return go.Scatter(
-            x=df[self.x_axis_column],
-            y=df[self.y_axis_column],
-            line=line_style,
-            name=self._get_trace_name(trace_name) + LEGEND_SPACING,
-            hovertemplate=self._get_hover_template(df, trace_name),
-            customdata=self._get_custom_data(df, trace_name),
-            marker=marker,
-            hoverlabel=None,
-            showlegend=(
+        trace_properties = {
+            "x": self._get_trace_x_values(df),
+            "y": df[self.y_axis_column],
+            "line": line_style,
+            "name": self._get_trace_name(trace_name) + LEGEND_SPACING,
+            **self._get_hover_properties(df, trace_name),
+            "marker": marker,
+            "hoverlabel": None,
+            "showlegend": (
                 trace_name in self.legend_dict if self.legend_dict is not None else True
             ),
-            legendgroup=legendgroup,
-            stackgroup="one" if self.stacked else None,
-            visible=visible,
-            zorder=(
-                1000
-                if (self.grey_traces is not None and trace_name not in self.grey_traces)
-                or (self.top_trace is not None and trace_name == self.top_trace)
-                else 500
-            ),  # ensure focus trace appears on top of background traces
-            mode=(
+            "legendgroup": legendgroup,
+            "visible": visible,
+            "mode": (
                 "lines" if self.hide_markers else "lines+markers"
             ),  # if None default is "lines+markers" when there are < 20 points, otherwise "lines"
+            "legendrank": legendrank,
+        }
+        if use_webgl:
+            return create_trace(go.Scattergl, self.validate_figure, **trace_properties)
+        return create_trace(
+            go.Scatter,
+            self.validate_figure,
+            **trace_properties,
+            stackgroup="one" if self.stacked else None,
+            # ensure focus trace appears on top of background traces
+            zorder=self._get_zorder(trace_name),
         )
 
-    def _get_hover_template(self, df, trace_name):
-        return [
-            (
-                ""
-                if i == 0
-                and self.trace_names_to_prevent_hover_of_first_point_list is not None
-                and trace_name in self.trace_names_to_prevent_hover_of_first_point_list
-                else self._get_custom_hover_template(i, df, trace_name)
-            )
-            for i in range(df.shape[0])  # the number of rows in df
-        ]
+    def _get_trace_x_values(self, df: pl.DataFrame) -> pl.Series:
+        """Return the x values for a trace.
+
+        If validate_figure is False, dates are given as milliseconds since the epoch, which
+        create_trace encodes as a typed array and Plotly.js reads as dates on the date x-axis.
+        """
+        x_values = df[self.x_axis_column]
+        if (
+            self.validate_figure
+            or self.xaxis_tick_text_format == XAxisFormat.FINANCIAL_QUARTER.value
+        ):
+            return x_values
+        if x_values.dtype == pl.String:
+            dates = x_values.str.to_datetime("%Y-%m-%d", strict=False)
+            if dates.null_count() != x_values.null_count():
+                return x_values
+            x_values = dates
+        if not x_values.dtype.is_temporal():
+            return x_values
+        return x_values.cast(pl.Datetime("ms")).dt.epoch("ms").cast(pl.Float64)
+
+    def _get_zorder(self, trace_name):
+        return (
+            1000
+            if (self.grey_traces is not None and trace_name not in self.grey_traces)
+            or (self.top_trace is not None and trace_name == self.top_trace)
+            else 500
+        )
 
-    def _get_custom_hover_template(self, i, df, trace_name):
+    def _use_webgl(self, point_count: int) -> bool:
+        """Whether to render traces with WebGL, for charts with more than
+        webgl_point_threshold points. Stacked charts stay SVG, as WebGL cannot stack traces.
+        """
+        return (
+            self.webgl_point_threshold is not None
+            and not self.stacked
+            and point_count > self.webgl_point_threshold
+        )
+
+    def _get_hover_template(self, trace_name):
+        """Return the hover template shared by every point of the trace.
+
+        Where the last point shows different hover data, its values and hover text headers
+        are swapped in through customdata, see _get_custom_data.
+        """
         if self.x_unified_hovermode is True:
             if self.x_unified_hovertemplate is not None:
                 return self.x_unified_hovertemplate.format(trace_name=trace_name)
             return f"{trace_name}: " + "%{customdata[0]}<extra></extra>"
 
         hover_text_headers = self.hover_data[trace_name][HOVER_TEXT_HEADERS]
-        if (
-            self.hover_data_for_traces_with_different_hover_for_last_point is not None
-            and trace_name
-            in self.hover_data_for_traces_with_different_hover_for_last_point
-            and i == df.shape[0] - 1
-        ):
-            hover_text_headers = (
-                self.hover_data_for_traces_with_different_hover_for_last_point[
-                    trace_name
-                ][HOVER_TEXT_HEADERS]
-            )
+        if self._get_last_point_hover_data(trace_name) is not None:
+            header_index = len(self.hover_data[trace_name][CUSTOM_DATA])
+            hover_text_headers = [
+                f"%{{customdata[{header_index + i}]}}" for i in range(2)
+            ]
         # pylint: disable=duplicate-code
 
         return (
@@ -533,193 +632,185 @@ class TimeSeriesChart:
             ": %{customdata[1]}<extra></extra>"
         )
 
-    def _get_custom_data(self, df, trace_name):
-        # For last points of trace_name in [], we want different custom data.
-        customdata = df[self.hover_data[trace_name][CUSTOM_DATA]]
+    def _get_hover_properties(self, df, trace_name) -> dict[str, Any]:
+        """Return the hover properties of a trace.
+
+        Plotly.js draws a point's hover label whenever it has a hover template, so traces in
+        trace_names_to_prevent_hover_of_first_point_list get their hover text rendered into
+        hovertext and a hoverinfo of "none" for the first point. In x unified hovermode
+        points with a hoverinfo of "none" are left out, so the template is kept."""
+        hovertemplate = self._get_hover_template(trace_name)
+        customdata = self._get_custom_data(df, trace_name)
         if (
-            self.hover_data_for_traces_with_different_hover_for_last_point is not None
-            and trace_name
-            in self.hover_data_for_traces_with_different_hover_for_last_point
+            self.trace_names_to_prevent_hover_of_first_point_list is None
+            or trace_name not in self.trace_names_to_prevent_hover_of_first_point_list
+            or df.is_empty()
         ):
-            customdata = [
-                (
-                    [df[col][i] for col in self.hover_data[trace_name][CUSTOM_DATA]]
-                    if i < df.shape[0] - 1
-                    else [
-                        df[col][i]
-                        for col in self.hover_data_for_traces_with_different_hover_for_last_point[
-                            trace_name
-                        ][
-                            CUSTOM_DATA
-                        ]
-                    ]
-                )  # Use different columns for the last point
-                for i in range(df.shape[0])
+            return {"hovertemplate": hovertemplate, "customdata": customdata}
+        if self.x_unified_hovermode is True:
+            return {
+                "hovertemplate": hovertemplate,
+                "customdata": customdata,
+                "hoverinfo": ["none"] + ["all"] * (df.height - 1),
+            }
+        rows = customdata.rows() if isinstance(customdata, pl.DataFrame) else customdata
+        return {
+            "customdata": customdata,
+            "hovertext": [render_hover_template(hovertemplate, row) for row in rows],
+            "hoverinfo": ["none"] + ["text"] * (df.height - 1),
+        }
+
+    def _get_last_point_hover_data(self, trace_name):
+        if (
+            self.hover_data_for_traces_with_different_hover_for_last_point is None
+            or trace_name
+            not in self.hover_data_for_traces_with_different_hover_for_last_point
+        ):
+            return None
+        return self.hover_data_for_traces_with_different_hover_for_last_point[
+            trace_name
+        ]
+
+    def _get_custom_data(self, df, trace_name):
+        columns = self.hover_data[trace_name][CUSTOM_DATA]
+        last_point_hover_data = self._get_last_point_hover_data(trace_name)
+        if last_point_hover_data is None:
+            return df[columns]
+
+        # For the last point use different columns, and add the hover text headers as
+        # columns so the trace's single hover template can show different headers for it.
+        last_point_columns = last_point_hover_data[CUSTOM_DATA]
+        is_last_point = pl.int_range(pl.len()) == pl.len() - 1
+        headers = (
+            []
+            if self.x_unified_hovermode is True
+            else [
+                pl.when(is_last_point)
+                .then(pl.lit(last_point_header))
+                .otherwise(pl.lit(header))
+                .alias(f"hover_text_header_{i}")
+                for i, (header, last_point_header) in enumerate(
+                    zip(
+                        self.hover_data[trace_name][HOVER_TEXT_HEADERS],
+                        last_point_hover_data[HOVER_TEXT_HEADERS],
+                    )
+                )
             ]
-        return customdata
+        )
+        if all(
+            df.schema[column] == df.schema[last_point_column]
+            for column, last_point_column in zip(columns, last_point_columns)
+        ):
+            return df.select(
+                *(
+                    pl.when(is_last_point)
+                    .then(pl.col(last_point_column))
+                    .otherwise(pl.col(column))
+                    .alias(f"customdata_{i}")
+                    for i, (column, last_point_column) in enumerate(
+                        zip(columns, last_point_columns)
+                    )
+                ),
+                *headers,
+            )
+
+        # Columns of different types are not cast to a common type, which would change how
+        # their values are shown, e.g. 2.0 as "2.0" or dates as numbers. Each point keeps
+        # its own values instead.
+        header_rows = df.select(headers).rows() if headers else [()] * df.height
+        rows = (
+            df.head(-1).select(columns).rows()
+            + df.tail(1).select(last_point_columns).rows()
+        )
+        return [row + header_row for row, header_row in zip(rows, header_rows)]
 
     def _get_trace_name(self, trace_name):
         if self.legend_dict is not None and trace_name in self.legend_dict:
             return self.legend_dict[trace_name]
         return trace_name
 
-    # pylint: disable=too-many-statements
     def _get_x_axis_content(self):
-        """Generates tick text and values for the x-axis based on the unique years calculated from
-        the DATE_VALID column in the dataframe.
+        """Generates tick text and values for the x-axis based on the dates in the
+        x_axis_column, which may hold "%Y-%m-%d" strings or be a pl.Date or pl.Datetime column.
         Returns:
             tuple: A tuple containing tick_text, tick_values and range_x.
         """
-        if self.xaxis_tick_text_format == XAxisFormat.YEAR.value:
-            df_with_year_column = self.filtered_df.with_columns(
-                pl.col(self.x_axis_column)
-                .str.strptime(pl.Date, "%Y-%m-%d")
-                .dt.year()
-                .alias(YEAR)
-            )
-            date_list = df_with_year_column[self.x_axis_column].unique().to_list()
-            min_date_string = min(date_list)
-            max_date_string = max(date_list)
-            min_datetime = datetime.strptime(min_date_string, "%Y-%m-%d")
-            max_datetime = datetime.strptime(max_date_string, "%Y-%m-%d")
-            year_list = df_with_year_column[YEAR].unique().to_list()
-            tick_text = list(range(min(year_list) - 1, max(year_list) + 2))
-            tick_values = [date(year, 1, 1) for year in tick_text]
-            range_x = [
-                min_datetime,
-                max_datetime + relativedelta(months=2),
-            ]
-
-        elif self.xaxis_tick_text_format == XAxisFormat.MONTH_YEAR.value:
-            df = self.filtered_df.with_columns(
-                pl.col(self.x_axis_column)
-                .str.strptime(pl.Date, "%Y-%m-%d")
-                .alias(self.x_axis_column)
-            ).sort(self.x_axis_column)
-
-            if self.x_axis_start_datetime:
-                start_datetime = self.x_axis_start_datetime
-            else:
-                start_datetime = df[self.x_axis_column].min()
-
-            latest_datetime = df[self.x_axis_column].max()
-            tick_text = []
-            current = start_datetime
-            while current <= latest_datetime:
-                tick_text.append(current.strftime("%b %Y"))
-                current += relativedelta(months=1)
-
-            tick_text_length = len(tick_text)
-            total_tick_points = int((tick_text_length / 5) * 7)
-            total_tick_points = min(total_tick_points, tick_text_length + 1)
-            additional_tick_points = total_tick_points - tick_text_length
-            last_current_tick_text = datetime.strptime(tick_text[-1], "%b %Y")
-
-            for x in range(additional_tick_points):
-                tick_text = tick_text + [
-                    (last_current_tick_text + relativedelta(months=x + 1)).strftime(
-                        "%b %Y"
-                    )
-                ]
-
-            tick_values = [
-                datetime.strptime(month_year, "%b %Y").replace(day=1)
-                for month_year in tick_text
-            ]
-
-            range_x = [
-                tick_values[0],
-                tick_values[-1] + relativedelta(days=45),
-            ]
-
-        elif self.xaxis_tick_text_format == XAxisFormat.MONTH_YEAR_MONTHLY_DATA.value:
-            df = self.filtered_df.with_columns(
-                pl.col(self.x_axis_column)
-                .str.strptime(pl.Date, "%Y-%m-%d")
-                .alias(self.x_axis_column)
-            ).sort(self.x_axis_column)
-
-            start_datetime = datetime(2024, 7, 1).date()
-            latest_datetime = df[self.x_axis_column].max()
-            extra_datetime = latest_datetime + relativedelta(months=1)
-
-            tick_text = []
-            current = start_datetime
-            while current <= extra_datetime:
-                tick_text.append(current.strftime("%b %Y"))
-                current += relativedelta(months=1)
-
-            tick_values = [
-                datetime.strptime(month_year, "%b %Y").replace(day=1)
-                for month_year in tick_text
-            ]
-
-            range_x = [
-                tick_values[0],
-                tick_values[-1] + relativedelta(days=40),
-            ]
-            tick_text = replace_jun_jul_month_abbreviations(tick_text)
-        elif self.xaxis_tick_text_format == XAxisFormat.FINANCIAL_QUARTER.value:
+        if self.xaxis_tick_text_format == XAxisFormat.FINANCIAL_QUARTER.value:
             tick_values = [1, 2, 3, 4]
             tick_text = [
                 convert_financial_quarter_to_financial_quarter_text(quarter)
                 for quarter in tick_values
             ]
+            return tick_text, tick_values, [1, 4.2]
 
-            range_x = [1, 4.2]
-
-        elif self.xaxis_tick_text_format == XAxisFormat.WEEK.value:
-            df = self.filtered_df.with_columns(
-                pl.col(self.x_axis_column)
-                .str.strptime(pl.Datetime, "%Y-%m-%d", strict=False)
-                .alias(self.x_axis_column)
-            ).sort(self.x_axis_column)
-
-            start_datetime = df[self.x_axis_column].min() - relativedelta(weeks=1)
-            latest_datetime = df[self.x_axis_column].max() + relativedelta(weeks=1)
-
-            start_of_week = start_datetime - relativedelta(
-                days=start_datetime.weekday()
+        dates = self.filtered_df.get_column(self.x_axis_column)
+        date_type = (
+            pl.Datetime
+            if self.xaxis_tick_text_format == XAxisFormat.WEEK.value
+            else pl.Date
+        )
+        if dates.dtype == pl.String:
+            dates = dates.str.strptime(
+                date_type, "%Y-%m-%d", strict=date_type == pl.Date
             )
+        else:
+            dates = dates.cast(date_type)
+        tick_text, tick_values, range_x = _get_x_axis_ticks(
+            self.xaxis_tick_text_format,
+            dates.min(),
+            dates.max(),
+            self.x_axis_start_datetime,
+        )
+        return list(tick_text), list(tick_values), list(range_x)
 
-            tick_values = []
-            tick_text = []
-
-            current = start_of_week
-            while current <= latest_datetime:
-                tick_values.append(current)
-                tick_text.append(current.strftime("%d %b %Y"))  # e.g. "29 Sep 2025"
-                current += relativedelta(weeks=1)
+    def _get_trace_dfs(self) -> Optional[dict[Any, pl.DataFrame]]:
+        """Split filtered_df into a dataframe per value of trace_name_column, each sorted by
+        x_axis_column.
 
-            range_x = [start_datetime, latest_datetime]
-        else:
-            raise ValueError(
-                f"Invalid xaxis_tick_text_format: {self.xaxis_tick_text_format}"
-            )
-        return tick_text, tick_values, range_x
+        The data is sorted once and split in a single pass, rather than filtered and sorted
+        for every trace. Returns None if trace_name_column is None.
+        """
+        if self.trace_name_column is None:
+            return None
+        sorted_df = self.filtered_df.sort(self.x_axis_column, maintain_order=True)
+        return {
+            trace_name: df
+            for (trace_name,), df in sorted_df.partition_by(
+                self.trace_name_column, as_dict=True, maintain_order=True
+            ).items()
+        }
+
+    def _get_df_list_for_time_series(
+        self, trace_dfs: Optional[dict[Any, pl.DataFrame]] = None
+    ) -> list[pl.DataFrame]:
+        """Return the data for each trace in trace_name_list, sorted by x_axis_column.
 
-    def _get_df_list_for_time_series(self) -> list[pl.DataFrame]:
-        if self.trace_name_column is not None:
-            df_list = [
-                self.filtered_df.filter(pl.col(self.trace_name_column) == trace_name)
-                for trace_name in self.trace_name_list
-            ]
-        else:
-            df_list = [self.filtered_df]
-        return df_list
+        Args:
+            trace_dfs (Optional[dict[Any, pl.DataFrame]]): Result of _get_trace_dfs, if
+                already computed.
+        """
+        if self.trace_name_column is None:
+            return [self.filtered_df.sort(self.x_axis_column, maintain_order=True)]
+        if trace_dfs is None:
+            trace_dfs = self._get_trace_dfs()
+        return [
+            trace_dfs.get(trace_name, self.filtered_df.clear())
+            for trace_name in self.trace_name_list
+        ]
 
     def _get_colour_list(self):
         """Returns a list of colours (one per trace in trace_name_list).
 
         If `trace_colour_groups` is provided, traces in the same group share a colour.
-        Traces not in any group get their own colour from the palette.
+        Traces not in any group get their own colour from the palette. The palette is
+        repeated if there are more traces than colours.
         """
         palette = self._get_base_palette()
         palette = self._apply_colour_shift(palette)
 
         groups = getattr(self, "trace_colour_groups", None) or []
         if not groups:
-            return palette[: len(self.trace_name_list)]
+            return [palette[i % len(palette)] for i in range(len(self.trace_name_list))]
 
         trace_to_group_id = self._build_trace_to_group_id(groups)
         return self._assign_colours_with_groups(palette, trace_to_group_id)
@@ -812,3 +903,95 @@ class TimeSeriesChart:
                 colour_idx += 1
 
         return [trace_colour[t] for t in self.trace_name_list]
+
+
+def _get_month_starts(start: date, months: int) -> pl.Series:
+    return pl.datetime_range(
+        datetime(start.year, start.month, 1),
+        datetime(start.year, start.month, 1) + relativedelta(months=months - 1),
+        "1mo",
+        eager=True,
+    )
+
+
+@lru_cache(maxsize=256)
+def _get_x_axis_ticks(
+    xaxis_tick_text_format: str,
+    min_date: Union[date, datetime],
+    max_date: Union[date, datetime],
+    start_date: Optional[date] = None,
+) -> tuple[tuple, tuple, tuple]:
+    """Return the tick text, tick values and range of an x-axis showing min_date to max_date
+    in xaxis_tick_text_format, as tuples so the cached result cannot be changed.
+
+    Args:
+        xaxis_tick_text_format (str): An XAxisFormat value, other than FINANCIAL_QUARTER.
+        min_date (Union[date, datetime]): Earliest date in the data. A datetime for
+            XAxisFormat.WEEK, otherwise a date.
+        max_date (Union[date, datetime]): Latest date in the data, of the same type.
+        start_date (Optional[date]): Date of the first tick for XAxisFormat.MONTH_YEAR.
+            Defaults to min_date.
+    """
+    if xaxis_tick_text_format == XAxisFormat.YEAR.value:
+        tick_text = tuple(range(min_date.year - 1, max_date.year + 2))
+        tick_values = tuple(date(year, 1, 1) for year in tick_text)
+        min_datetime = datetime.combine(min_date, datetime.min.time())
+        max_datetime = datetime.combine(max_date, datetime.min.time())
+        return (
+            tick_text,
+            tick_values,
+            (min_datetime, max_datetime + relativedelta(months=2)),
+        )
+
+    if xaxis_tick_text_format == XAxisFormat.MONTH_YEAR.value:
+        start_date = start_date if start_date else min_date
+        # A tick for each month stepping from start_date up to max_date. The day of the month
+        # is clipped to the shortest month passed, so decides if max_date's month is included
+        months = (
+            (max_date.year - start_date.year) * 12 + max_date.month - start_date.month
+        )
+        month_starts = _get_month_starts(start_date, max(months, 0) + 1)
+        last_tick_day = min(start_date.day, month_starts.dt.month_end().dt.day().min())
+        tick_count = months + (1 if last_tick_day <= max_date.day else 0)
+        # Pad with a month's tick, for space after the last point
+        tick_count = min(int((tick_count / 5) * 7), tick_count + 1)
+        tick_values = _get_month_starts(start_date, tick_count)
+        return (
+            tuple(tick_values.dt.strftime("%b %Y")),
+            tuple(tick_values),
+            (tick_values[0], tick_values[-1] + relativedelta(days=45)),
+        )
+
+    if xaxis_tick_text_format == XAxisFormat.MONTH_YEAR_MONTHLY_DATA.value:
+        start_date = date(2024, 7, 1)
+        end_date = max_date + relativedelta(months=1)
+        months = (
+            (end_date.year - start_date.year) * 12 + end_date.month - start_date.month
+        )
+        tick_values = _get_month_starts(start_date, months + 1)
+        return (
+            tuple(
+                replace_jun_jul_month_abbreviations(
+                    tick_values.dt.strftime("%b %Y").to_list()
+                )
+            ),
+            tuple(tick_values),
+            (tick_values[0], tick_values[-1] + relativedelta(days=40)),
+        )
+
+    if xaxis_tick_text_format == XAxisFormat.WEEK.value:
+        start_datetime = min_date - relativedelta(weeks=1)
+        latest_datetime = max_date + relativedelta(weeks=1)
+        tick_values = pl.datetime_range(
+            start_datetime - relativedelta(days=start_datetime.weekday()),
+            latest_datetime,
+            "1w",
+            eager=True,
+        )
+        return (
+            tuple(tick_values.dt.strftime("%d %b %Y")),  # e.g. "29 Sep 2025"
+            tuple(tick_values),
+            (start_datetime, latest_datetime),
+        )
+
+    raise ValueError(f"Invalid xaxis_tick_text_format: {xaxis_tick_text_format}")
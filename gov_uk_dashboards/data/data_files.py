@@ -0,0 +1,487 @@
+"""Write and load data extracts as CSV, Parquet or Arrow IPC files"""
+
+import os
+from pathlib import Path
+import shutil
+from typing import Any, Iterable, Optional, Union
+from urllib.parse import quote
+
+import polars as pl
+import polars.selectors as cs
+
+from gov_uk_dashboards.data.enums import DataFileFormat
+
+FILE_SUFFIX_TO_FORMAT = {
+    ".csv": DataFileFormat.CSV.value,
+    ".parquet": DataFileFormat.PARQUET.value,
+    ".pq": DataFileFormat.PARQUET.value,
+    ".arrow": DataFileFormat.IPC.value,
+    ".ipc": DataFileFormat.IPC.value,
+    ".feather": DataFileFormat.IPC.value,
+}
+
+
+def get_data_file_format(path: Union[str, Path]) -> str:
+    """Return the DataFileFormat value for a file, based on its suffix.
+
+    Raises:
+        ValueError: If the suffix is not a recognised data file suffix.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in FILE_SUFFIX_TO_FORMAT:
+        raise ValueError(
+            f"Cannot infer data file format from '{path}'. "
+            f"Expected one of: {', '.join(FILE_SUFFIX_TO_FORMAT)}."
+        )
+    return FILE_SUFFIX_TO_FORMAT[suffix]
+
+
+def apply_schema(
+    df: Union[pl.DataFrame, pl.LazyFrame], schema: Optional[dict[str, pl.DataType]]
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """Cast the columns of df named in schema to the declared types.
+
+    Use pl.Categorical or pl.Enum for low-cardinality strings, pl.Date for ISO date strings
+    and narrow integer types such as pl.Int16, to reduce memory and speed up filtering.
+    Columns not named in schema are left unchanged.
+
+    Args:
+        df (Union[pl.DataFrame, pl.LazyFrame]): Data to cast.
+        schema (Optional[dict[str, pl.DataType]]): Column names mapped to their types.
+            If None, df is returned unchanged.
+
+    Raises:
+        ValueError: If a column in schema is not in df.
+    """
+    if not schema:
+        return df
+    current_schema = df.collect_schema()
+    missing_columns = [name for name in schema if name not in current_schema]
+    if missing_columns:
+        raise ValueError(
+            f"Schema columns not found in data: {', '.join(missing_columns)}"
+        )
+    columns = []
+    for name, dtype in schema.items():
+        if current_schema[name] == dtype:
+            continue
+        column = pl.col(name)
+        if current_schema[name] == pl.String and dtype == pl.Date:
+            column = column.str.to_date()
+        elif current_schema[name] == pl.String and dtype == pl.Datetime:
+            column = column.str.to_datetime()
+        columns.append(column.cast(dtype))
+    return df.with_columns(columns) if columns else df
+
+
+def write_data_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    df: pl.DataFrame,
+    path: Union[str, Path],
+    file_format: Optional[str] = None,
+    parquet_compression: str = "zstd",
+    ipc_compression: str = "uncompressed",
+    partition_by: Optional[list[str]] = None,
+) -> None:
+    """Write a dataframe to path in the given format.
+
+    The file is written to a temporary path first and then moved into place, so readers
+    never see a partially written file.
+
+    If partition_by is set, path is written as a directory of Parquet files in a Hive
+    layout, e.g. "extract.parquet/measure=Measure%201/Area_Code=E06000001/00000000.parquet".
+    The partition columns are kept in the files, so their types are preserved.
+    load_data_file then only reads the partitions matching its filters.
+
+    Args:
+        df (pl.DataFrame): Data to write.
+        path (Union[str, Path]): Location of the output file.
+        file_format (Optional[str]): A DataFileFormat value. Inferred from the suffix of
+            path if None.
+        parquet_compression (str): Compression codec used for Parquet files.
+            Defaults to "zstd".
+        ipc_compression (str): Compression codec used for Arrow IPC files, one of
+            "uncompressed", "lz4" or "zstd". Only uncompressed files can be memory mapped
+            by load_data_file. Defaults to "uncompressed".
+        partition_by (Optional[list[str]]): Columns to partition a Parquet file by.
+
+    Raises:
+        ValueError: If partition_by is set for a format other than Parquet.
+    """
+    file_format = file_format or get_data_file_format(path)
+    temp_path = f"{path}.tmp"
+    _check_partition_by(file_format, partition_by)
+
+    if partition_by:
+        remove_data_file(temp_path)
+        df.write_parquet(
+            temp_path,
+            compression=parquet_compression,
+            statistics=True,
+            partition_by=partition_by,
+            mkdir=True,
+        )
+    elif file_format == DataFileFormat.CSV.value:
+        df.write_csv(temp_path)
+    elif file_format == DataFileFormat.PARQUET.value:
+        df.write_parquet(temp_path, compression=parquet_compression, statistics=True)
+    elif file_format == DataFileFormat.IPC.value:
+        df.write_ipc(temp_path, compression=ipc_compression)
+    else:
+        raise ValueError(f"Invalid file_format: {file_format}")
+
+    replace_data_file(temp_path, path)
+
+
+def write_data_file_in_batches(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    batches: Iterable[pl.DataFrame],
+    path: Union[str, Path],
+    file_format: Optional[str] = None,
+    parquet_compression: str = "zstd",
+    ipc_compression: str = "uncompressed",
+    partition_by: Optional[list[str]] = None,
+) -> int:
+    """Write an iterable of dataframes to a single file, one batch at a time.
+
+    Only one batch is held in memory at once. Each batch becomes a row group of a Parquet
+    file, or a record batch of an Arrow IPC file. Batches must share the schema of the first
+    batch, except that a column which has only been null so far takes the type of the first
+    batch with values for it, rewriting the batches already written. Writing Parquet or
+    Arrow IPC requires pyarrow.
+
+    As with write_data_file, the file is written to a temporary path and then moved into
+    place. If there are no batches an empty file is written.
+
+    If partition_by is set, path is written as a partitioned directory as described in
+    write_data_file, with a file for each partition of each batch.
+
+    Args:
+        batches (Iterable[pl.DataFrame]): Dataframes to write, in order.
+        path (Union[str, Path]): Location of the output file.
+        file_format (Optional[str]): A DataFileFormat value. Inferred from the suffix of
+            path if None.
+        parquet_compression (str): Compression codec used for Parquet files.
+            Defaults to "zstd".
+        ipc_compression (str): Compression codec used for Arrow IPC files, one of
+            "uncompressed", "lz4" or "zstd". Only uncompressed files can be memory mapped
+            by load_data_file. Defaults to "uncompressed".
+        partition_by (Optional[list[str]]): Columns to partition a Parquet file by.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If partition_by is set for a format other than Parquet.
+    """
+    file_format = file_format or get_data_file_format(path)
+    temp_path = f"{path}.tmp"
+    _check_partition_by(file_format, partition_by)
+
+    if partition_by:
+        row_count = _write_partitioned_parquet_in_batches(
+            batches, temp_path, partition_by, parquet_compression
+        )
+    elif file_format == DataFileFormat.CSV.value:
+        row_count = _write_csv_in_batches(batches, temp_path)
+    elif file_format in (DataFileFormat.PARQUET.value, DataFileFormat.IPC.value):
+        row_count = _write_arrow_in_batches(
+            batches, temp_path, file_format, parquet_compression, ipc_compression
+        )
+    else:
+        raise ValueError(f"Invalid file_format: {file_format}")
+
+    replace_data_file(temp_path, path)
+    return row_count
+
+
+def replace_data_file(source: Union[str, Path], path: Union[str, Path]) -> None:
+    """Move the file or partitioned directory at source to path, replacing path.
+
+    Files are replaced atomically. A directory can't be, so the old one is moved aside
+    first and there is a brief moment when path does not exist.
+    """
+    if not os.path.isdir(source) and not os.path.isdir(path):
+        os.replace(source, path)
+        return
+    old_path = f"{path}.old"
+    remove_data_file(old_path)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(source, path)
+    remove_data_file(old_path)
+
+
+def remove_data_file(path: Union[str, Path]) -> None:
+    """Remove the file or partitioned directory at path, if it exists."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _check_partition_by(file_format: str, partition_by: Optional[list[str]]) -> None:
+    if partition_by and file_format != DataFileFormat.PARQUET.value:
+        raise ValueError("partition_by is only supported for Parquet files.")
+
+
+def _get_partition_directory(names: list[str], values: tuple) -> str:
+    # Matches the layout written by polars, so values are percent-encoded.
+    return os.path.join(
+        *(
+            f"{name}="
+            + ("__HIVE_DEFAULT_PARTITION__" if value is None else quote(str(value), ""))
+            for name, value in zip(names, values)
+        )
+    )
+
+
+def _write_partitioned_parquet_in_batches(
+    batches: Iterable[pl.DataFrame],
+    path: str,
+    partition_by: list[str],
+    parquet_compression: str,
+) -> int:
+    remove_data_file(path)
+    os.makedirs(path)
+    row_count = 0
+    for i, batch in enumerate(batches):
+        for values, partition in batch.partition_by(partition_by, as_dict=True).items():
+            partition_path = os.path.join(
+                path, _get_partition_directory(partition_by, values)
+            )
+            os.makedirs(partition_path, exist_ok=True)
+            partition.write_parquet(
+                os.path.join(partition_path, f"{i:08}.parquet"),
+                compression=parquet_compression,
+                statistics=True,
+            )
+        row_count += batch.height
+    return row_count
+
+
+def _write_csv_in_batches(batches: Iterable[pl.DataFrame], path: str) -> int:
+    row_count = 0
+    with open(path, "wb") as file:
+        for i, batch in enumerate(batches):
+            batch.write_csv(file, include_header=i == 0)
+            row_count += batch.height
+    return row_count
+
+
+def _write_arrow_in_batches(
+    batches: Iterable[pl.DataFrame],
+    path: str,
+    file_format: str,
+    parquet_compression: str,
+    ipc_compression: str,
+) -> int:
+    row_count = 0
+    writer = None
+    schema = None
+    try:
+        for batch in batches:
+            if file_format == DataFileFormat.IPC.value:
+                # An IPC file can only hold one dictionary per column, but each batch of a
+                # categorical column has its own, so store the values instead. The newest
+                # compat level keeps polars' own string layout, so strings can be memory
+                # mapped by load_data_file without being copied.
+                table = batch.with_columns(
+                    (cs.categorical() | cs.enum()).cast(pl.String)
+                ).to_arrow(compat_level=pl.CompatLevel.newest())
+            else:
+                table = batch.to_arrow()
+            if writer is None:
+                schema = table.schema
+                writer = _open_arrow_writer(
+                    path, file_format, schema, parquet_compression, ipc_compression
+                )
+            elif table.schema != schema:
+                promoted_schema = _promote_null_fields(schema, table.schema)
+                if promoted_schema != schema:
+                    # A column only had nulls so far, so rewrite what has been written
+                    # with the column's type from this batch.
+                    writer.close()
+                    writer = None
+                    writer = _rewrite_arrow_file(
+                        path,
+                        file_format,
+                        promoted_schema,
+                        parquet_compression,
+                        ipc_compression,
+                    )
+                    schema = promoted_schema
+                table = table.cast(schema)
+            writer.write_table(table)
+            row_count += batch.height
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if schema is None:
+        write_data_file(
+            pl.DataFrame(), path, file_format, ipc_compression=ipc_compression
+        )
+    return row_count
+
+
+def _open_arrow_writer(
+    path: str,
+    file_format: str,
+    schema: Any,
+    parquet_compression: str,
+    ipc_compression: str,
+) -> Any:
+    # pylint: disable=import-outside-toplevel
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    if file_format == DataFileFormat.PARQUET.value:
+        return pyarrow.parquet.ParquetWriter(
+            path, schema, compression=parquet_compression
+        )
+    return pyarrow.ipc.new_file(
+        path,
+        schema,
+        options=pyarrow.ipc.IpcWriteOptions(
+            compression=_get_pyarrow_ipc_compression(ipc_compression)
+        ),
+    )
+
+
+def _promote_null_fields(schema: Any, batch_schema: Any) -> Any:
+    """Return schema with the type of each Null column taken from batch_schema."""
+    # pylint: disable=import-outside-toplevel
+    import pyarrow
+
+    return pyarrow.schema(
+        (
+            batch_schema.field(field.name)
+            if pyarrow.types.is_null(field.type)
+            and field.name in batch_schema.names
+            and not pyarrow.types.is_null(batch_schema.field(field.name).type)
+            else field
+        )
+        for field in schema
+    )
+
+
+def _rewrite_arrow_file(
+    path: str,
+    file_format: str,
+    schema: Any,
+    parquet_compression: str,
+    ipc_compression: str,
+) -> Any:
+    """Rewrite the batches written to path with schema, and return a writer to append to
+    it."""
+    # pylint: disable=import-outside-toplevel
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    written_path = f"{path}.written"
+    os.replace(path, written_path)
+    writer = _open_arrow_writer(
+        path, file_format, schema, parquet_compression, ipc_compression
+    )
+    try:
+        if file_format == DataFileFormat.PARQUET.value:
+            # Keep a row group per batch, as written by _write_arrow_in_batches.
+            with pyarrow.parquet.ParquetFile(written_path) as reader:
+                for i in range(reader.num_row_groups):
+                    writer.write_table(reader.read_row_group(i).cast(schema))
+        else:
+            with pyarrow.ipc.open_file(written_path) as reader:
+                for i in range(reader.num_record_batches):
+                    writer.write_table(
+                        pyarrow.Table.from_batches([reader.get_batch(i)]).cast(schema)
+                    )
+    except BaseException:
+        writer.close()
+        raise
+    finally:
+        os.remove(written_path)
+    return writer
+
+
+def _get_pyarrow_ipc_compression(ipc_compression: str) -> Optional[str]:
+    return None if ipc_compression == "uncompressed" else ipc_compression
+
+
+def load_data_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: Union[str, Path],
+    file_format: Optional[str] = None,
+    lazy: bool = False,
+    schema: Optional[dict[str, pl.DataType]] = None,
+    memory_map: bool = True,
+    filters: Optional[dict[str, Any]] = None,
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """Load a data file written by write_data_file.
+
+    Uncompressed Arrow IPC files are memory mapped by default, so the loaded frame is backed
+    by the operating system's page cache rather than memory owned by the process. Every
+    process loading the same file, such as each gunicorn worker, then shares one copy of
+    the data. Columns cast by schema are still copied, so store IPC files with their final
+    types.
+
+    A Parquet directory written with partition_by is read as a Hive partitioned dataset.
+    Only the partitions matching filters are read, e.g. filters={MEASURE: "Measure 1"}.
+
+    Args:
+        path (Union[str, Path]): Location of the file.
+        file_format (Optional[str]): A DataFileFormat value. Inferred from the suffix of
+            path if None.
+        lazy (bool): If True, return a LazyFrame which scans the file rather than reading
+            it eagerly. Defaults to False.
+        schema (Optional[dict[str, pl.DataType]]): Declared column types, applied with
+            apply_schema. Needed to restore types lost by CSV files.
+        memory_map (bool): If True, memory map Arrow IPC files. On Windows a memory mapped
+            file cannot be replaced until every frame using it is dropped, so set this to
+            False there if files are rewritten while the app is running. Defaults to True.
+        filters (Optional[dict[str, Any]]): Column names mapped to the value, or list of
+            values, of the rows to keep. Applied before the file is read, so matching
+            partitions and Parquet row groups are skipped. Values are compared with the
+            columns as stored, before schema is applied.
+
+    Returns:
+        Union[pl.DataFrame, pl.LazyFrame]: The loaded data.
+    """
+    file_format = file_format or get_data_file_format(path)
+    if filters:
+        # Filter the raw scan, as polars cannot prune Hive partitions once the partition
+        # columns have been cast, e.g. to a declared Categorical type.
+        df = apply_schema(
+            load_data_file(path, file_format, lazy=True, memory_map=memory_map).filter(
+                _get_filter_expression(filters)
+            ),
+            schema,
+        )
+        return df if lazy else df.collect()
+
+    if file_format == DataFileFormat.PARQUET.value and os.path.isdir(path):
+        df = pl.scan_parquet(path, hive_partitioning=True)
+        df = df if lazy else df.collect()
+    elif file_format == DataFileFormat.CSV.value:
+        df = pl.scan_csv(path) if lazy else pl.read_csv(path)
+    elif file_format == DataFileFormat.PARQUET.value:
+        df = pl.scan_parquet(path) if lazy else pl.read_parquet(path)
+    elif file_format == DataFileFormat.IPC.value:
+        # Rechunking would copy the mapped record batches into memory owned by the process.
+        df = (
+            pl.scan_ipc(path, memory_map=memory_map)
+            if lazy
+            else pl.read_ipc(path, memory_map=memory_map, rechunk=not memory_map)
+        )
+    else:
+        raise ValueError(f"Invalid file_format: {file_format}")
+    return apply_schema(df, schema)
+
+
+def _get_filter_expression(filters: dict[str, Any]) -> pl.Expr:
+    return pl.all_horizontal(
+        (
+            pl.col(name).is_in(value)
+            if isinstance(value, (list, tuple, set))
+            else pl.col(name) == value
+        )
+        for name, value in filters.items()
+    )
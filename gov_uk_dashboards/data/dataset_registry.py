@@ -0,0 +1,245 @@
+"""Process-wide registry which loads each data file once and shares the loaded frame.
+
+Dashboards often load the same file several times per request, e.g. through the
+df_function() passed to get_rolling_period_context_card or
+get_tracenamelist_and_legend_order. Loading through get_dataset instead returns the frame
+already loaded by this process. Frames are shared between callers, so must not be modified
+in place.
+
+Once the estimated size of the loaded frames exceeds the memory budget, the least recently
+used frames are evicted. The default budget is read from the
+DATASET_REGISTRY_MEMORY_BUDGET_MB environment variable, and is unlimited if it is not set.
+
+Files rewritten by a data refresh are picked up without restarting the app by calling
+reload_changed_datasets, or start_auto_reload to do so in a background thread. Under
+gunicorn, start_auto_reload must be called in each worker, e.g. from a post_fork hook, as
+threads do not survive the fork. A file which fails to reload is logged and its previous
+frame is kept, so one bad file never stops the others from being reloaded.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any, Optional, Union
+
+import polars as pl
+
+from gov_uk_dashboards.data.data_files import load_data_file
+
+logger = logging.getLogger(__name__)
+
+
+def _get_frame_size(df: Union[pl.DataFrame, pl.LazyFrame]) -> int:
+    # A LazyFrame only holds a query plan, the data is read when it is collected.
+    return df.estimated_size() if isinstance(df, pl.DataFrame) else 0
+
+
+def _get_file_signature(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass
+class _CachedDataset:
+    df: Union[pl.DataFrame, pl.LazyFrame]
+    size: int
+    file_signature: tuple[int, int]
+    load_kwargs: dict[str, Any]
+
+
+def _load_dataset(load_kwargs: dict[str, Any]) -> Optional[_CachedDataset]:
+    """Load a dataset, returning None if the file changed while it was being read."""
+    file_signature = _get_file_signature(load_kwargs["path"])
+    df = load_data_file(**load_kwargs)
+    if _get_file_signature(load_kwargs["path"]) != file_signature:
+        return None
+    return _CachedDataset(df, _get_frame_size(df), file_signature, load_kwargs)
+
+
+class DatasetRegistry:  # pylint: disable=too-many-instance-attributes
+    """Cache of loaded data files, evicting least recently used files over a memory budget."""
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None):
+        """
+        Args:
+            memory_budget_bytes (Optional[int]): Maximum estimated size of the cached frames.
+                The most recently used frame is always kept, even if it alone exceeds the
+                budget. Unlimited if None.
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+        # Maps each key to a _CachedDataset, least recently used first
+        self._datasets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._auto_reload_thread: Optional[threading.Thread] = None
+        self._stop_auto_reload = threading.Event()
+
+    def get_dataset(
+        self,
+        path: Union[str, Path],
+        lazy: bool = False,
+        schema: Optional[dict[str, pl.DataType]] = None,
+        file_format: Optional[str] = None,
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Return the data in path, loading it with load_data_file if it is not cached.
+
+        Args:
+            path (Union[str, Path]): Location of the data file.
+            lazy (bool): If True, return a LazyFrame which scans the file. Defaults to False.
+            schema (Optional[dict[str, pl.DataType]]): Declared column types.
+            file_format (Optional[str]): A DataFileFormat value. Inferred from the suffix of
+                path if None.
+        """
+        key = self._get_key(path, lazy, schema)
+        with self._lock:
+            if key in self._datasets:
+                self._datasets.move_to_end(key)
+                self.hits += 1
+                return self._datasets[key].df
+            self.misses += 1
+
+        load_kwargs = {
+            "path": os.path.abspath(path),
+            "file_format": file_format,
+            "lazy": lazy,
+            "schema": schema,
+        }
+        dataset = _load_dataset(load_kwargs)
+        if dataset is None:
+            # The file was replaced while loading, so return it uncached and let the next
+            # call load the new version.
+            return load_data_file(**load_kwargs)
+
+        with self._lock:
+            self._datasets[key] = dataset
+            self._datasets.move_to_end(key)
+            self._evict_over_budget()
+        return dataset.df
+
+    def reload_changed_datasets(self) -> list[str]:
+        """Reload cached datasets whose file has changed since it was loaded.
+
+        Files are reloaded without holding the registry lock, so callers of get_dataset are
+        never blocked by a reload and keep receiving the previous frame until the new one is
+        swapped in.
+
+        Returns:
+            list[str]: Paths of the reloaded files.
+        """
+        with self._lock:
+            cached_datasets = list(self._datasets.items())
+
+        reloaded_paths = []
+        for key, cached_dataset in cached_datasets:
+            path = cached_dataset.load_kwargs["path"]
+            try:
+                if _get_file_signature(path) == cached_dataset.file_signature:
+                    continue
+                dataset = _load_dataset(cached_dataset.load_kwargs)
+            except OSError:
+                # The file is missing, e.g. part way through being replaced. Keep serving the
+                # cached frame and try again on the next reload.
+                continue
+            except Exception:  # pylint: disable=broad-except
+                # E.g. the new file cannot be read with the cached schema. Keep serving the
+                # cached frame and carry on reloading the other datasets.
+                logger.exception("Failed to reload %s, keeping the cached frame", path)
+                continue
+            if dataset is None:
+                continue
+
+            with self._lock:
+                if self._datasets.get(key) is cached_dataset:
+                    self._datasets[key] = dataset
+                    self.reloads += 1
+                    reloaded_paths.append(path)
+                self._evict_over_budget()
+        return reloaded_paths
+
+    def start_auto_reload(self, interval_seconds: float = 30) -> None:
+        """Start a daemon thread calling reload_changed_datasets every interval_seconds."""
+        if self._auto_reload_thread is not None and self._auto_reload_thread.is_alive():
+            return
+        self._stop_auto_reload.clear()
+        self._auto_reload_thread = threading.Thread(
+            target=self._auto_reload,
+            args=(interval_seconds,),
+            name="dataset-registry-auto-reload",
+            daemon=True,
+        )
+        self._auto_reload_thread.start()
+
+    def stop_auto_reload(self) -> None:
+        """Stop the thread started by start_auto_reload."""
+        self._stop_auto_reload.set()
+        if self._auto_reload_thread is not None:
+            self._auto_reload_thread.join()
+            self._auto_reload_thread = None
+
+    def _auto_reload(self, interval_seconds: float) -> None:
+        while not self._stop_auto_reload.wait(interval_seconds):
+            try:
+                self.reload_changed_datasets()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Dataset auto reload failed, retrying next interval")
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the hit, miss, eviction and reload counters, and the number and size of
+        cached frames."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+                "datasets": len(self._datasets),
+                "size_bytes": sum(dataset.size for dataset in self._datasets.values()),
+            }
+
+    def clear(self) -> None:
+        """Remove every cached frame. Counters are not reset."""
+        with self._lock:
+            self._datasets.clear()
+
+    def _get_key(self, path, lazy, schema) -> tuple:
+        schema_key = (
+            tuple((name, str(dtype)) for name, dtype in schema.items())
+            if schema
+            else None
+        )
+        return (os.path.abspath(path), lazy, schema_key)
+
+    def _evict_over_budget(self) -> None:
+        if self.memory_budget_bytes is None:
+            return
+        total_size = sum(dataset.size for dataset in self._datasets.values())
+        while total_size > self.memory_budget_bytes and len(self._datasets) > 1:
+            _, dataset = self._datasets.popitem(last=False)
+            total_size -= dataset.size
+            self.evictions += 1
+
+
+def _get_default_memory_budget_bytes() -> Optional[int]:
+    memory_budget_mb = os.environ.get("DATASET_REGISTRY_MEMORY_BUDGET_MB")
+    if not memory_budget_mb:
+        return None
+    return int(float(memory_budget_mb) * 1024 * 1024)
+
+
+dataset_registry = DatasetRegistry(_get_default_memory_budget_bytes())
+
+
+def get_dataset(
+    path: Union[str, Path],
+    lazy: bool = False,
+    schema: Optional[dict[str, pl.DataType]] = None,
+    file_format: Optional[str] = None,
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """Return the data in path from the process-wide dataset_registry."""
+    return dataset_registry.get_dataset(path, lazy, schema, file_format)
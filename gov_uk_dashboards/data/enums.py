@@ -0,0 +1,11 @@
+"""Classes to be used for defined enums in the data layer"""
+
+from enum import Enum
+
+
+class DataFileFormat(Enum):
+    """Enum for the file formats data extracts can be written to and loaded from"""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+    IPC = "ipc"
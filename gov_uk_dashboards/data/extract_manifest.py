@@ -0,0 +1,108 @@
+"""Utilities for recording the content of data extracts in a manifest file.
+
+The manifest is a JSON file stored in an extract directory. It records a stable hash, the row
+count, the schema and the write options of each extract in that directory, so a refresh can
+tell whether newly queried data, or the way it is written, differs from the file already
+written and leave the file untouched if not.
+"""
+
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Iterable, Iterator, Optional, Union
+
+import polars as pl
+
+EXTRACT_MANIFEST_FILENAME = "extract_manifest.json"
+# Fixed seeds, so rows hash the same in every process.
+HASH_ROWS_SEEDS = {"seed": 0, "seed_1": 1, "seed_2": 2, "seed_3": 3}
+
+_MANIFEST_LOCK = threading.Lock()
+
+
+class ExtractHasher:
+    """Incrementally hash dataframes, so a streamed extract can be hashed batch by batch.
+
+    The hash covers the column names and types, and the values of every row in order. It does
+    not depend on how the rows are split into batches. Each row is hashed with polars'
+    hash_rows, which supports every column type that can be written to file, including
+    nested and binary columns. Row hashes may change between polars versions, which only
+    causes an unchanged extract to be rewritten once.
+    """
+
+    def __init__(self):
+        self._sha = sha256()
+        self.rows = 0
+        self.schema: Optional[dict[str, str]] = None
+
+    def update(self, df: pl.DataFrame) -> None:
+        """Add the rows of df to the hash."""
+        if self.schema is None:
+            self.schema = {name: str(dtype) for name, dtype in df.schema.items()}
+            self._sha.update(json.dumps(self.schema).encode("utf-8"))
+        self._sha.update(df.hash_rows(**HASH_ROWS_SEEDS).to_numpy().tobytes())
+        self.rows += df.height
+
+    def hash_batches(self, batches: Iterable[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+        """Yield each batch unchanged, adding it to the hash."""
+        for batch in batches:
+            self.update(batch)
+            yield batch
+
+    def get_manifest_entry(self, write_options: Optional[dict] = None) -> dict:
+        """Return the manifest entry for the rows hashed so far.
+
+        Args:
+            write_options (Optional[dict]): Options the extract is written with, e.g. its
+                file format and compression, so changing them rewrites unchanged data.
+        """
+        return {
+            "hash": self._sha.hexdigest(),
+            "rows": self.rows,
+            "schema": self.schema or {},
+            "write_options": write_options or {},
+        }
+
+
+def get_extract_manifest_entry(
+    df: pl.DataFrame, write_options: Optional[dict] = None
+) -> dict:
+    """Return the manifest entry (hash, row count, schema and write options) for df."""
+    hasher = ExtractHasher()
+    hasher.update(df)
+    return hasher.get_manifest_entry(write_options)
+
+
+def read_extract_manifest(directory: Union[str, Path]) -> dict:
+    """Return the manifest for directory, or an empty dict if there is none."""
+    path = Path(directory) / EXTRACT_MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def extract_is_unchanged(
+    directory: Union[str, Path], filename: str, manifest_entry: dict
+) -> bool:
+    """Return True if filename exists in directory and its manifest entry, including the
+    write options, matches."""
+    if not os.path.exists(os.path.join(directory, filename)):
+        return False
+    return read_extract_manifest(directory).get(filename) == manifest_entry
+
+
+def update_extract_manifest(
+    directory: Union[str, Path], filename: str, manifest_entry: dict
+) -> None:
+    """Record manifest_entry for filename in the manifest for directory."""
+    path = Path(directory) / EXTRACT_MANIFEST_FILENAME
+    with _MANIFEST_LOCK:
+        manifest = read_extract_manifest(directory)
+        manifest[filename] = manifest_entry
+        content = json.dumps(manifest, sort_keys=True, indent=2)
+
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        temp_path.replace(path)
@@ -0,0 +1,139 @@
+"""Structured performance metrics for data extracts.
+
+GenericDataQuery records an ExtractMetrics for each extract it runs and emits it as a JSON
+line. Set the EXTRACT_METRICS_PATH environment variable to also append the lines to a file,
+so extract performance can be compared across releases. run_data_queries logs a summary
+table of the metrics for the whole batch.
+"""
+
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import threading
+from typing import Optional, Union
+
+_METRICS_FILE_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractMetrics:  # pylint: disable=too-many-instance-attributes
+    """
+    Performance metrics for one run of a data extract.
+
+    Attributes:
+        filename (str): Filename of the extract.
+        server (str): CDS server queried.
+        mode (str): "full", "incremental" or "streamed".
+        status (Optional[str]): "updated" or "unchanged".
+        query_seconds (float): Time spent running the query and fetching rows.
+        write_seconds (float): Time spent writing the file. 0 if it was unchanged.
+        total_seconds (float): Wall time for the whole extract.
+        rows (int): Number of rows in the extract.
+        bytes_written (int): Size of the file written. 0 if it was unchanged.
+        peak_memory_increase_bytes (Optional[int]): How far the extract raised the peak
+            resident memory of the process above its peak when the extract started. 0 if
+            the extract stayed below an earlier peak, and it includes any extracts run
+            concurrently. None where this is not available, e.g. on Windows.
+        schema_fingerprint (str): Short hash of the column names and types, which changes
+            when the shape of the extract changes.
+    """
+
+    filename: str
+    server: str
+    mode: str = "full"
+    status: Optional[str] = None
+    query_seconds: float = 0.0
+    write_seconds: float = 0.0
+    total_seconds: float = 0.0
+    rows: int = 0
+    bytes_written: int = 0
+    peak_memory_increase_bytes: Optional[int] = None
+    schema_fingerprint: str = ""
+
+    def to_json(self) -> str:
+        """Return the metrics as a single line of JSON."""
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+def get_schema_fingerprint(schema: dict[str, str]) -> str:
+    """Return a short hash of schema, a dict of column names to type names."""
+    return sha256(json.dumps(schema).encode("utf-8")).hexdigest()[:16]
+
+
+def get_peak_memory_bytes() -> Optional[int]:
+    """Return the peak resident memory of this process, or None if it is not available."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return peak_memory if sys.platform == "darwin" else peak_memory * 1024
+
+
+def get_path_size(path: Union[str, Path]) -> int:
+    """Return the size of the file at path, or of every file under a directory."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, filename))
+        for root, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+
+def emit_extract_metrics(metrics: ExtractMetrics) -> None:
+    """Log metrics as a JSON line, and append it to EXTRACT_METRICS_PATH if set."""
+    line = metrics.to_json()
+    logger.info(line)
+    metrics_path = os.environ.get("EXTRACT_METRICS_PATH")
+    if metrics_path:
+        with _METRICS_FILE_LOCK:
+            with open(metrics_path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+
+def format_extract_metrics_table(metrics: list[ExtractMetrics]) -> str:
+    """Return a plain text table of metrics, slowest extract first."""
+    # The first three columns hold text, so are left aligned, and the rest numbers.
+    columns = [
+        ("Extract", lambda m: m.filename),
+        ("Mode", lambda m: m.mode),
+        ("Status", lambda m: m.status or ""),
+        ("Query s", lambda m: f"{m.query_seconds:.2f}"),
+        ("Write s", lambda m: f"{m.write_seconds:.2f}"),
+        ("Rows", lambda m: f"{m.rows:,}"),
+        ("MB", lambda m: f"{m.bytes_written / 1024 / 1024:.1f}"),
+        (
+            "Peak +MB",
+            lambda m: (
+                ""
+                if m.peak_memory_increase_bytes is None
+                else f"{m.peak_memory_increase_bytes / 1024 / 1024:.0f}"
+            ),
+        ),
+        ("Schema", lambda m: m.schema_fingerprint),
+    ]
+    rows = [
+        [get_value(m) for _, get_value in columns]
+        for m in sorted(metrics, key=lambda m: m.total_seconds, reverse=True)
+    ]
+    widths = [
+        max([len(name)] + [len(row[i]) for row in rows])
+        for i, (name, _) in enumerate(columns)
+    ]
+    lines = ["  ".join(name.ljust(width) for (name, _), width in zip(columns, widths))]
+    lines += [
+        "  ".join(
+            value.ljust(width) if i < 3 else value.rjust(width)
+            for i, (value, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    ]
+    return "\n".join(line.rstrip() for line in lines)
@@ -1,9 +1,51 @@
 """Get data from a data source e.g. locally or blob storage"""
 
+import asyncio
+from concurrent.futures import Executor
+from contextlib import contextmanager
+import copy
+from dataclasses import dataclass
+import datetime
+from functools import partial
+import hashlib
+import json
+import logging
 import os
-from time import perf_counter
+import threading
+from time import monotonic, perf_counter
+from typing import Any, Callable, Generator, Iterator, Optional, Union
 import polars as pl
 
+from gov_uk_dashboards.constants import AREA_CODE, DATE_VALID, MEASURE
+from gov_uk_dashboards.data.data_files import (
+    apply_schema,
+    load_data_file,
+    remove_data_file,
+    replace_data_file,
+    write_data_file,
+    write_data_file_in_batches,
+)
+from gov_uk_dashboards.data.enums import DataFileFormat
+from gov_uk_dashboards.data.extract_metrics import (
+    ExtractMetrics,
+    emit_extract_metrics,
+    get_path_size,
+    get_peak_memory_bytes,
+    get_schema_fingerprint,
+)
+from gov_uk_dashboards.data.extract_manifest import (
+    ExtractHasher,
+    extract_is_unchanged,
+    get_extract_manifest_entry,
+    update_extract_manifest,
+)
+from gov_uk_dashboards.data.query_cache import (
+    QueryResultCache,
+    get_query_result_cache_from_environment,
+)
+
+logger = logging.getLogger(__name__)
+
 
 def get_cds_odbc_connection_string(server: str) -> str:
     """Return the ODBC connection string for the CDS Dashboards database.
@@ -32,43 +74,702 @@ def get_cds_odbc_connection_string(server: str) -> str:
     )
 
 
-def read_cds_query_odbc(query: str, server: str) -> pl.DataFrame:
-    """Read data from CDS using the direct ODBC path."""
+def connect_to_cds_odbc(server: str) -> Any:
+    """Open a new pyodbc connection to the CDS Dashboards database."""
+    import pyodbc  # pylint: disable=import-outside-toplevel
+
+    return pyodbc.connect(get_cds_odbc_connection_string(server))
+
+
+class CdsConnectionPool:
+    """Pool of reusable DB-API connections to a single server.
+
+    Connections are handed out most recently used first. Idle connections are closed once
+    they have been unused for idle_timeout_seconds, and each idle connection is checked with
+    health_check_query before it is reused. At most max_size connections are open at once;
+    callers wait for a connection to be returned once that limit is reached.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 4,
+        idle_timeout_seconds: float = 300,
+        health_check_query: str = "SELECT 1",
+    ):
+        """
+        Args:
+            connect (Callable[[], Any]): Function returning a new DB-API connection.
+            max_size (int): Maximum number of open connections. Defaults to 4.
+            idle_timeout_seconds (float): Seconds an idle connection is kept before it is
+                closed. Defaults to 300.
+            health_check_query (str): Query run on an idle connection before it is reused.
+                Defaults to "SELECT 1".
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.connect = connect
+        self.max_size = max_size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.health_check_query = health_check_query
+        self._idle_connections: list[tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        self._available = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Context manager which borrows a connection and returns it to the pool."""
+        self._available.acquire()  # pylint: disable=consider-using-with
+        try:
+            connection = self._get_connection()
+        except BaseException:
+            self._available.release()
+            raise
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                self._idle_connections.append((connection, monotonic()))
+            self._available.release()
+
+    @property
+    def idle_count(self) -> int:
+        """Number of idle connections currently held by the pool."""
+        with self._lock:
+            return len(self._idle_connections)
+
+    def close_idle_connections(self, older_than_seconds: float = 0) -> None:
+        """Close idle connections unused for at least older_than_seconds."""
+        cutoff = monotonic() - older_than_seconds
+        with self._lock:
+            expired = [
+                c for c, last_used in self._idle_connections if last_used <= cutoff
+            ]
+            self._idle_connections = [
+                (c, last_used)
+                for c, last_used in self._idle_connections
+                if last_used > cutoff
+            ]
+        for connection in expired:
+            _close_quietly(connection)
+
+    def _get_connection(self) -> Any:
+        self.close_idle_connections(self.idle_timeout_seconds)
+        while True:
+            with self._lock:
+                if not self._idle_connections:
+                    break
+                connection, _ = self._idle_connections.pop()
+            if self._is_healthy(connection):
+                return connection
+            _close_quietly(connection)
+        return self.connect()
+
+    def _is_healthy(self, connection: Any) -> bool:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+
+def _close_quietly(connection: Any) -> None:
+    try:
+        connection.close()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+_CONNECTION_POOLS: dict[str, CdsConnectionPool] = {}
+_CONNECTION_POOLS_LOCK = threading.Lock()
+
+
+def get_cds_connection_pool(server: str) -> CdsConnectionPool:
+    """Return the connection pool for server, creating an ODBC pool if there is none."""
+    with _CONNECTION_POOLS_LOCK:
+        if server not in _CONNECTION_POOLS:
+            _CONNECTION_POOLS[server] = CdsConnectionPool(
+                lambda: connect_to_cds_odbc(server)
+            )
+        return _CONNECTION_POOLS[server]
+
+
+def set_cds_connection_pool(server: str, pool: CdsConnectionPool) -> None:
+    """Use pool for all queries against server, e.g. a pool of sqlite3 connections in tests."""
+    with _CONNECTION_POOLS_LOCK:
+        _CONNECTION_POOLS[server] = pool
+
+
+def close_cds_connection_pool(server: str, pool: CdsConnectionPool) -> None:
+    """Close the idle connections of pool, and forget it if it is still the pool for
+    server. The pools of other servers are left open."""
+    with _CONNECTION_POOLS_LOCK:
+        if _CONNECTION_POOLS.get(server) is pool:
+            del _CONNECTION_POOLS[server]
+    pool.close_idle_connections()
+
+
+def close_cds_connection_pools() -> None:
+    """Close the idle connections of every pool and forget the pools."""
+    with _CONNECTION_POOLS_LOCK:
+        pools = list(_CONNECTION_POOLS.values())
+        _CONNECTION_POOLS.clear()
+    for pool in pools:
+        pool.close_idle_connections()
+
+
+_QUERY_RESULT_CACHE: Optional[QueryResultCache] = (
+    get_query_result_cache_from_environment()
+)
+
+
+def set_query_result_cache(cache: Optional[QueryResultCache]) -> None:
+    """Cache the results of read_cds_query_odbc in cache, or stop caching if None.
+
+    By default results are only cached if the CDS_QUERY_CACHE_DIR environment variable is
+    set, see gov_uk_dashboards.data.query_cache.
+    """
+    global _QUERY_RESULT_CACHE  # pylint: disable=global-statement
+    _QUERY_RESULT_CACHE = cache
+
+
+def read_cds_query_odbc(
+    query: str, server: str, parameters: Optional[list] = None
+) -> pl.DataFrame:
+    """Read data from CDS using the direct ODBC path.
+
+    Connections are borrowed from the pool for server, so repeated queries in a process
+    reuse an open connection rather than logging in again. If a query result cache is set,
+    a result cached within its TTL is returned without querying CDS. Failing to cache a
+    result is logged as a warning and does not fail the query.
+
+    Args:
+        query (str): SQL query, using "?" placeholders for any parameters.
+        server (str): CDS server name.
+        parameters (Optional[list]): Values bound to the placeholders in query.
+    """
+    cache = _QUERY_RESULT_CACHE
+    if cache is not None:
+        df = cache.get(query, server, parameters)
+        if df is not None:
+            logger.info("Using cached query result")
+            return df
+
+    execute_options = {"parameters": parameters} if parameters else None
+    with get_cds_connection_pool(server).connection() as connection:
+        df = pl.read_database(
+            query, connection=connection, execute_options=execute_options
+        )
+    if cache is not None:
+        # The data has been fetched, so a result which cannot be cached is still returned.
+        try:
+            cache.put(query, server, parameters, df)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not cache query result", exc_info=True)
+    return df
+
+
+def read_cds_query_arrow_odbc(
+    query: str, server: str, parameters: Optional[list] = None
+) -> pl.DataFrame:
+    """Read data from CDS with polars' columnar arrow-odbc reader, on a new connection.
+
+    read_cds_query_odbc fetches rows through a pooled pyodbc cursor, and polars infers column
+    types from the fetched Python values. arrow-odbc instead fetches column batches straight
+    into Arrow memory, typed from the ODBC result set, which can be quicker for large
+    extracts and may give different types. It logs in for every query, and its results are
+    not cached.
+
+    Args:
+        query (str): SQL query, using "?" placeholders for any parameters.
+        server (str): CDS server name.
+        parameters (Optional[list]): Values bound to the placeholders in query.
+    """
+    execute_options = {"parameters": parameters} if parameters else None
     return pl.read_database(
         query,
         connection=get_cds_odbc_connection_string(server),
+        execute_options=execute_options,
+    )
+
+
+async def read_cds_query_odbc_async(
+    query: str,
+    server: str,
+    parameters: Optional[list] = None,
+    executor: Optional[Executor] = None,
+) -> pl.DataFrame:
+    """Awaitable version of read_cds_query_odbc, run on executor so the event loop is not
+    blocked while the query runs.
+
+    Args:
+        query (str): SQL query, using "?" placeholders for any parameters.
+        server (str): CDS server name.
+        parameters (Optional[list]): Values bound to the placeholders in query.
+        executor (Optional[Executor]): Executor to run the query on. The event loop's
+            default thread pool if None.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, partial(read_cds_query_odbc, query, server, parameters=parameters)
+    )
+
+
+def read_cds_query_odbc_in_batches(
+    query: str, server: str, batch_size: int, parameters: Optional[list] = None
+) -> Iterator[pl.DataFrame]:
+    """Read data from CDS as an iterator of dataframes of at most batch_size rows.
+
+    The pooled connection is held until the iterator is exhausted or closed.
+
+    Args:
+        query (str): SQL query, using "?" placeholders for any parameters.
+        server (str): CDS server name.
+        batch_size (int): Maximum number of rows fetched from the cursor at a time.
+        parameters (Optional[list]): Values bound to the placeholders in query.
+    """
+    execute_options = {"parameters": parameters} if parameters else None
+    with get_cds_connection_pool(server).connection() as connection:
+        yield from pl.read_database(
+            query,
+            connection=connection,
+            iter_batches=True,
+            batch_size=batch_size,
+            execute_options=execute_options,
+        )
+
+
+def quote_sql_identifier(name: str) -> str:
+    """Return name quoted as a SQL Server identifier, e.g. "Date valid" -> "[Date valid]"."""
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def get_incremental_query(query: str, watermark_column: str) -> str:
+    """Wrap query so it only returns rows where watermark_column is at or after a "?"
+    parameter.
+
+    Rows at the watermark are included, as more may have arrived since the last extract,
+    e.g. another measure for the latest date.
+
+    query must be usable as a derived table, i.e. it cannot end with an ORDER BY clause.
+    """
+    return (
+        f"SELECT * FROM ({query.strip().rstrip(';')}) AS incremental_query "
+        f"WHERE {quote_sql_identifier(watermark_column)} >= ?"
     )
 
 
+# SQL Server rejects statements with more than 2100 parameters
+MAX_QUERY_PARAMETERS = 2100
+
+
+@dataclass
+class QueryFilter:  # pylint: disable=too-many-instance-attributes
+    """
+    Column projection and row predicates applied to a query by the database, so only the
+    slice of an extract a dashboard needs is transferred.
+
+    Values are passed as query parameters and column names are quoted, so neither is
+    interpolated into the SQL as written.
+
+    Attributes:
+        columns (Optional[list[str]]): Columns to select. All columns if None.
+        measures (Optional[list[str]]): Values of measure_column to keep.
+        area_codes (Optional[list[str]]): Values of area_code_column to keep.
+        start_date (Optional[datetime.date]): Earliest value of date_column to keep.
+        end_date (Optional[datetime.date]): Latest value of date_column to keep.
+        measure_column (str): Column filtered by measures. Defaults to MEASURE.
+        area_code_column (str): Column filtered by area_codes. Defaults to AREA_CODE.
+        date_column (str): Column filtered by start_date and end_date.
+            Defaults to DATE_VALID.
+    """
+
+    columns: Optional[list[str]] = None
+    measures: Optional[list[str]] = None
+    area_codes: Optional[list[str]] = None
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    measure_column: str = MEASURE
+    area_code_column: str = AREA_CODE
+    date_column: str = DATE_VALID
+
+    def __post_init__(self):
+        for name in ("columns", "measures", "area_codes"):
+            if getattr(self, name) is not None and len(getattr(self, name)) == 0:
+                raise ValueError(f"{name} must not be empty, use None to keep all.")
+
+    def apply(self, query: str) -> tuple[str, list]:
+        """Wrap query so it only returns the filtered columns and rows.
+
+        query must be usable as a derived table, i.e. it cannot end with an ORDER BY clause.
+
+        Returns:
+            tuple[str, list]: The SQL, with a "?" placeholder for each parameter, and the
+                parameters.
+
+        Raises:
+            ValueError: If the filter needs more parameters than SQL Server allows.
+        """
+        predicates = []
+        parameters = []
+        for column, values in (
+            (self.measure_column, self.measures),
+            (self.area_code_column, self.area_codes),
+        ):
+            if values is not None:
+                placeholders = ", ".join("?" for _ in values)
+                predicates.append(f"{quote_sql_identifier(column)} IN ({placeholders})")
+                parameters.extend(values)
+        for operator, date in ((">=", self.start_date), ("<=", self.end_date)):
+            if date is not None:
+                predicates.append(
+                    f"{quote_sql_identifier(self.date_column)} {operator} ?"
+                )
+                parameters.append(date)
+        if len(parameters) > MAX_QUERY_PARAMETERS:
+            raise ValueError(
+                f"Query filter has {len(parameters)} parameters, more than the "
+                f"{MAX_QUERY_PARAMETERS} allowed."
+            )
+
+        projection = (
+            ", ".join(quote_sql_identifier(column) for column in self.columns)
+            if self.columns
+            else "*"
+        )
+        sql = (
+            f"SELECT {projection} FROM ({query.strip().rstrip(';')}) AS filtered_query"
+        )
+        if predicates:
+            sql += " WHERE " + " AND ".join(predicates)
+        return sql, parameters
+
+    def get_key(self) -> str:
+        """Return a short hash identifying this filter, for naming its extract file."""
+        return hashlib.sha256(
+            json.dumps(self.__dict__, default=str, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+
 class GenericDataQuery:
-    """Static class for the generic data query."""
+    """Static class for the generic data query.
+
+    Set file_format to a DataFileFormat value to write the extract as Parquet or Arrow IPC
+    rather than CSV. The filename should use a matching suffix, e.g. ".parquet". Arrow IPC
+    extracts are memory mapped by load_data, so app workers on the same machine share one
+    copy of the data. Keep ipc_compression as "uncompressed" for this to work.
+
+    Set watermark_column for append-only tables to only pull rows at or after the latest
+    watermark already in the local file. New rows are appended and, if unique_key is set,
+    deduplicated on those columns keeping the newest row, so rows at the watermark which are
+    pulled again replace the local ones. Without unique_key, local rows at the watermark are
+    replaced by those pulled. The full query is run instead if there is no local file,
+    or the new rows do not have exactly the local file's columns and types, apart from
+    columns which are all null. Set schema so the types of CSV extracts, which are inferred
+    when the file is loaded, match those from CDS.
+
+    Set schema to a dict of column names to polars types to pin the types of those columns,
+    e.g. {MEASURE: pl.Categorical, DATE_VALID: pl.Date}. The types are applied when the data
+    is extracted and again by load_data, so they are kept even for CSV files.
+
+    Set batch_size to stream the full query to file batch_size rows at a time, so the whole
+    result is never held in memory. Incremental extracts are not streamed.
+
+    Use with_filter to extract only some columns, measures, areas or dates of the query.
+
+    Set arrow_odbc to True to read full extracts with read_cds_query_arrow_odbc, polars'
+    columnar arrow-odbc reader on a new connection, rather than a pooled pyodbc connection.
+    This can be quicker for large extracts, but column types may differ, see
+    read_cds_query_arrow_odbc. Incremental and streamed extracts always use the pool.
+
+    Set partition_by to write a Parquet extract as a directory partitioned by those columns,
+    e.g. [MEASURE]. load_data(filters={MEASURE: "Measure 1"}) then only reads the files for
+    that measure. Use columns with few distinct values, as each value gets its own files.
+
+    After each run, metrics holds the ExtractMetrics for the extract, which are also emitted
+    as a JSON line.
+    """
 
     filename: str
     dir: str
     query: str
     server: str
     stats_release: bool = False
+    file_format: str = DataFileFormat.CSV.value
+    parquet_compression: str = "zstd"
+    ipc_compression: str = "uncompressed"
+    watermark_column: Optional[str] = None
+    unique_key: Optional[list[str]] = None
+    batch_size: Optional[int] = None
+    schema: Optional[dict[str, pl.DataType]] = None
+    query_filter: Optional[QueryFilter] = None
+    partition_by: Optional[list[str]] = None
+    arrow_odbc: bool = False
+    extract_status: Optional[str] = None
+    metrics: Optional[ExtractMetrics] = None
 
     # @staticmethod
-    def get_data_from_cds(self):
-        """Pull data from CDS and write it to CSV."""
-        print(self.filename)
+    def get_data_from_cds(self, full_refresh: bool = False):
+        """Pull data from CDS and write it to file_format.
 
-        start = perf_counter()
+        The file is only rewritten if the data, or the file_format, compression or
+        partition_by it is written with, differ from those recorded for it in the extract
+        manifest for dir. extract_status is set to "updated" or "unchanged".
+
+        Args:
+            full_refresh (bool): If True, run the full query even if watermark_column is set.
+                Defaults to False.
+        """
+        logger.info(self.filename)
 
-        sql_query = read_cds_query_odbc(self.query(), self.server)
+        start = perf_counter()
+        start_peak_memory = get_peak_memory_bytes()
+        self.metrics = ExtractMetrics(filename=self.filename, server=self.server)
 
-        print(f"{self.filename} query took {perf_counter()-start} seconds")
+        sql_query = None
+        if self.watermark_column is not None and not full_refresh:
+            sql_query = self._get_incremental_data()
 
         os.makedirs(self.dir, exist_ok=True)
-        sql_query.write_csv(self.get_file_location())
+        if sql_query is None and self.batch_size is not None:
+            manifest_entry = self._stream_data_to_file()
+        else:
+            if sql_query is None:
+                query, parameters = self.get_filtered_query()
+                read_query = (
+                    read_cds_query_arrow_odbc
+                    if self.arrow_odbc
+                    else read_cds_query_odbc
+                )
+                sql_query = apply_schema(
+                    read_query(query, self.server, parameters=parameters), self.schema
+                )
+            self.metrics.query_seconds = perf_counter() - start
+
+            manifest_entry = get_extract_manifest_entry(
+                sql_query, self._get_write_options()
+            )
+            if not self._is_unchanged(manifest_entry):
+                write_start = perf_counter()
+                write_data_file(
+                    sql_query,
+                    self.get_file_location(),
+                    self.file_format,
+                    parquet_compression=self.parquet_compression,
+                    ipc_compression=self.ipc_compression,
+                    partition_by=self.partition_by,
+                )
+                self.metrics.write_seconds = perf_counter() - write_start
+                self._record_update(manifest_entry)
+
+        self._finish_metrics(start, start_peak_memory, manifest_entry)
 
         if self.stats_release:
             return self.filename
 
         return None
 
+    async def get_data_from_cds_async(
+        self, full_refresh: bool = False, executor: Optional[Executor] = None
+    ) -> Optional[str]:
+        """Awaitable version of get_data_from_cds.
+
+        The query and file write run on executor, so other extracts and I/O can be awaited
+        concurrently in the same event loop.
+
+        Args:
+            full_refresh (bool): If True, run the full query even if watermark_column is set.
+                Defaults to False.
+            executor (Optional[Executor]): Executor to run the extract on. The event loop's
+                default thread pool if None.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, partial(self.get_data_from_cds, full_refresh)
+        )
+
+    def with_filter(self, query_filter: QueryFilter) -> "GenericDataQuery":
+        """Return a copy of this query which only extracts the data matching query_filter.
+
+        The copy writes to its own file, named after the filter, so each slice is cached
+        separately and re-extracting the same slice reuses its file. If query_filter selects
+        columns, the copy's schema only keeps the types of those columns.
+        """
+        filtered_query = copy.copy(self)
+        filtered_query.query_filter = query_filter
+        if self.schema is not None and query_filter.columns is not None:
+            filtered_query.schema = {
+                column: dtype
+                for column, dtype in self.schema.items()
+                if column in query_filter.columns
+            }
+        stem, suffix = os.path.splitext(self.filename)
+        filtered_query.filename = f"{stem}_{query_filter.get_key()}{suffix}"
+        return filtered_query
+
+    def get_filtered_query(self) -> tuple[str, Optional[list]]:
+        """Return the SQL to run, with query_filter applied, and its parameters."""
+        if self.query_filter is None:
+            return self.query(), None
+        return self.query_filter.apply(self.query())
+
+    def _stream_data_to_file(self) -> dict:
+        """Stream the query to file and return its manifest entry."""
+        self.metrics.mode = "streamed"
+        start = perf_counter()
+        hasher = ExtractHasher()
+        query, parameters = self.get_filtered_query()
+        new_file_location = f"{self.get_file_location()}.new"
+        write_data_file_in_batches(
+            hasher.hash_batches(
+                apply_schema(batch, self.schema)
+                for batch in self._time_query(
+                    read_cds_query_odbc_in_batches(
+                        query, self.server, self.batch_size, parameters=parameters
+                    )
+                )
+            ),
+            new_file_location,
+            self.file_format,
+            parquet_compression=self.parquet_compression,
+            ipc_compression=self.ipc_compression,
+            partition_by=self.partition_by,
+        )
+        # Fetching and writing batches alternate, so writing is the time not spent fetching.
+        self.metrics.write_seconds = perf_counter() - start - self.metrics.query_seconds
+
+        manifest_entry = hasher.get_manifest_entry(self._get_write_options())
+        if self._is_unchanged(manifest_entry):
+            remove_data_file(new_file_location)
+        else:
+            replace_data_file(new_file_location, self.get_file_location())
+            self._record_update(manifest_entry)
+        return manifest_entry
+
+    def _time_query(
+        self, batches: Generator[pl.DataFrame, None, None]
+    ) -> Iterator[pl.DataFrame]:
+        """Yield each batch, adding the time taken to fetch it to metrics.query_seconds."""
+        try:
+            while True:
+                fetch_start = perf_counter()
+                batch = next(batches, None)
+                self.metrics.query_seconds += perf_counter() - fetch_start
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            # Return the pooled connection even if writing fails part way through.
+            batches.close()
+
+    def _finish_metrics(
+        self, start: float, start_peak_memory: Optional[int], manifest_entry: dict
+    ) -> None:
+        self.metrics.status = self.extract_status
+        self.metrics.total_seconds = perf_counter() - start
+        self.metrics.rows = manifest_entry["rows"]
+        self.metrics.schema_fingerprint = get_schema_fingerprint(
+            manifest_entry["schema"]
+        )
+        if self.extract_status == "updated":
+            self.metrics.bytes_written = get_path_size(self.get_file_location())
+        peak_memory = get_peak_memory_bytes()
+        if peak_memory is not None and start_peak_memory is not None:
+            self.metrics.peak_memory_increase_bytes = peak_memory - start_peak_memory
+        emit_extract_metrics(self.metrics)
+
+    def _get_write_options(self) -> dict:
+        """Return the options the extract file is written with, for its manifest entry."""
+        compression = {
+            DataFileFormat.PARQUET.value: self.parquet_compression,
+            DataFileFormat.IPC.value: self.ipc_compression,
+        }.get(self.file_format)
+        return {
+            "file_format": self.file_format,
+            "compression": compression,
+            "partition_by": self.partition_by,
+        }
+
+    def _is_unchanged(self, manifest_entry: dict) -> bool:
+        if extract_is_unchanged(self.dir, self.filename, manifest_entry):
+            logger.info("%s unchanged, file not rewritten", self.filename)
+            self.extract_status = "unchanged"
+            return True
+        return False
+
+    def _record_update(self, manifest_entry: dict) -> None:
+        update_extract_manifest(self.dir, self.filename, manifest_entry)
+        self.extract_status = "updated"
+
     # @staticmethod
     def get_file_location(self):
         """Get the location of the file."""
         return os.path.join(self.dir, self.filename)
+
+    def load_data(
+        self, lazy: bool = False, filters: Optional[dict[str, Any]] = None
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Load the extract written by get_data_from_cds.
+
+        Args:
+            lazy (bool): If True, return a LazyFrame which scans the file. Defaults to False.
+            filters (Optional[dict[str, Any]]): Column names mapped to the value, or list of
+                values, of the rows to load. Only the matching partitions are read if
+                partition_by is set.
+        """
+        return load_data_file(
+            self.get_file_location(),
+            self.file_format,
+            lazy=lazy,
+            schema=self.schema,
+            filters=filters,
+        )
+
+    def _get_incremental_data(self) -> Optional[pl.DataFrame]:
+        """Return the local data with newer rows from CDS appended, or None if a full refresh
+        is needed."""
+        if not os.path.exists(self.get_file_location()):
+            return None
+        existing_df = self.load_data()
+        watermark = existing_df[self.watermark_column].max()
+        if watermark is None:
+            return None
+
+        query, parameters = self.get_filtered_query()
+        new_df = read_cds_query_odbc(
+            get_incremental_query(query, self.watermark_column),
+            self.server,
+            parameters=(parameters or []) + [watermark],
+        )
+        if new_df.columns != existing_df.columns:
+            logger.info("%s columns have changed, running full refresh", self.filename)
+            return None
+        new_df = apply_schema(new_df, self.schema)
+        # Casting would silently convert lossy changes, e.g. 3.7 to 3 for an integer column,
+        # so only columns without values may differ.
+        if any(
+            dtype != existing_df.schema[column]
+            and new_df[column].null_count() < new_df.height
+            for column, dtype in new_df.schema.items()
+        ):
+            logger.info(
+                "%s column types have changed, running full refresh", self.filename
+            )
+            return None
+        new_df = new_df.cast(existing_df.schema)
+
+        self.metrics.mode = "incremental"
+        logger.info(
+            "%s pulled %s rows from the watermark", self.filename, new_df.height
+        )
+        if not self.unique_key:
+            existing_df = existing_df.filter(
+                pl.col(self.watermark_column).ne_missing(watermark)
+            )
+        df = pl.concat([existing_df, new_df])
+        if self.unique_key:
+            df = df.unique(subset=self.unique_key, keep="last", maintain_order=True)
+        return df
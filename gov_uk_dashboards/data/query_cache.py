@@ -0,0 +1,151 @@
+"""Local cache of CDS query results, so repeated runs of the same query skip the database.
+
+Intended for development and CI, where the same extracts are run again and again. Results
+are stored as zstd compressed Arrow IPC files named after a hash of the query text, server
+and parameters. A file's modified time records when it was written, for the TTL, and its
+access time is set when it is used, for least recently used eviction.
+
+The cache used by read_cds_query_odbc is configured from environment variables:
+CDS_QUERY_CACHE_DIR enables it, and CDS_QUERY_CACHE_TTL_SECONDS and
+CDS_QUERY_CACHE_MAX_SIZE_MB override the defaults of one hour and no size limit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import polars as pl
+
+from gov_uk_dashboards.data.data_files import load_data_file, write_data_file
+from gov_uk_dashboards.data.enums import DataFileFormat
+
+QUERY_CACHE_FILE_SUFFIX = ".arrow"
+
+
+class QueryResultCache:
+    """Directory of query results, expiring after a TTL and evicting the least recently used
+    results over a size cap."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float = 3600,
+        max_size_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            directory (str): Directory the results are stored in. Created if missing.
+            ttl_seconds (float): Seconds a result is used for after it is written.
+                Defaults to one hour.
+            max_size_bytes (Optional[int]): Maximum total size of the stored results.
+                Unlimited if None.
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+    def get_key(
+        self, query: str, server: str, parameters: Optional[list] = None
+    ) -> str:
+        """Return the hash identifying the result of query on server with parameters."""
+        return hashlib.sha256(
+            json.dumps([query, server, parameters], default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(
+        self, query: str, server: str, parameters: Optional[list] = None
+    ) -> Optional[pl.DataFrame]:
+        """Return the stored result, or None if there is none or it has expired."""
+        path = self._get_path(self.get_key(query, server, parameters))
+        try:
+            modified_time = os.stat(path).st_mtime
+            if time.time() - modified_time > self.ttl_seconds:
+                os.remove(path)
+                return None
+            df = load_data_file(path, DataFileFormat.IPC.value, memory_map=False)
+            os.utime(path, (time.time(), modified_time))
+        except FileNotFoundError:
+            return None
+        return df
+
+    def put(
+        self,
+        query: str,
+        server: str,
+        parameters: Optional[list],
+        df: pl.DataFrame,
+    ) -> None:
+        """Store df as the result of query, then evict results over the size cap.
+
+        Raises:
+            Exception: Any error writing df, e.g. for a column type which cannot be written
+                as Arrow IPC, after removing the partly written file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._get_path(self.get_key(query, server, parameters))
+        try:
+            write_data_file(df, path, DataFileFormat.IPC.value, ipc_compression="zstd")
+        except Exception:
+            _remove_quietly(f"{path}.tmp")
+            raise
+        self._evict_over_size()
+
+    def clear(self) -> None:
+        """Remove every stored result."""
+        for path in self._get_paths():
+            _remove_quietly(path)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + QUERY_CACHE_FILE_SUFFIX)
+
+    def _get_paths(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.endswith(QUERY_CACHE_FILE_SUFFIX)
+        ]
+
+    def _evict_over_size(self) -> None:
+        if self.max_size_bytes is None:
+            return
+        with self._lock:
+            stats = []
+            for path in self._get_paths():
+                try:
+                    stats.append((path, os.stat(path)))
+                except FileNotFoundError:
+                    continue
+            total_size = sum(stat.st_size for _, stat in stats)
+            # Keep the most recently used result, even if it alone exceeds the cap.
+            for path, stat in sorted(stats, key=lambda item: item[1].st_atime)[:-1]:
+                if total_size <= self.max_size_bytes:
+                    break
+                _remove_quietly(path)
+                total_size -= stat.st_size
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def get_query_result_cache_from_environment() -> Optional[QueryResultCache]:
+    """Return a QueryResultCache configured by environment variables, or None if
+    CDS_QUERY_CACHE_DIR is not set."""
+    directory = os.environ.get("CDS_QUERY_CACHE_DIR")
+    if not directory:
+        return None
+    max_size_mb = os.environ.get("CDS_QUERY_CACHE_MAX_SIZE_MB")
+    return QueryResultCache(
+        directory,
+        ttl_seconds=float(os.environ.get("CDS_QUERY_CACHE_TTL_SECONDS", 3600)),
+        max_size_bytes=(int(float(max_size_mb) * 1024 * 1024) if max_size_mb else None),
+    )
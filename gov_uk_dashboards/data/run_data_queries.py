@@ -0,0 +1,194 @@
+"""Run many GenericDataQuery extracts concurrently on a bounded thread pool"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import logging
+from time import perf_counter
+from typing import Optional, Union
+
+from gov_uk_dashboards.data.extract_metrics import (
+    ExtractMetrics,
+    format_extract_metrics_table,
+)
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+logger = logging.getLogger(__name__)
+
+
+class DataQueryBatchError(RuntimeError):
+    """Raised when one or more queries in a batch fail.
+
+    The result of the whole batch, including the queries which succeeded, is available on
+    the batch_result attribute.
+    """
+
+    def __init__(self, message: str, batch_result: "DataQueryBatchResult"):
+        super().__init__(message)
+        self.batch_result = batch_result
+
+
+@dataclass
+class DataQueryBatchResult:
+    """
+    Result of running a batch of data queries.
+
+    Attributes:
+        stats_release_filenames (list[str]): Filenames returned by get_data_from_cds for
+            queries with stats_release set, in the order the queries were given.
+        query_seconds (dict[str, float]): Wall time in seconds for each query, by filename.
+        unchanged_filenames (list[str]): Filenames of extracts whose data was unchanged, so
+            were not rewritten.
+        errors (dict[str, Exception]): Exception raised by each failed query, by filename.
+        total_seconds (float): Wall time in seconds for the whole batch.
+        metrics (dict[str, ExtractMetrics]): Metrics for each successful query, by
+            filename.
+    """
+
+    stats_release_filenames: list[str] = field(default_factory=list)
+    query_seconds: dict[str, float] = field(default_factory=dict)
+    unchanged_filenames: list[str] = field(default_factory=list)
+    errors: dict[str, Exception] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    metrics: dict[str, ExtractMetrics] = field(default_factory=dict)
+
+
+def _run_timed_query(query: GenericDataQuery) -> tuple[Optional[str], float]:
+    start = perf_counter()
+    stats_release_filename = query.get_data_from_cds()
+    return stats_release_filename, perf_counter() - start
+
+
+def _record_query_outcome(
+    batch_result: DataQueryBatchResult,
+    query: GenericDataQuery,
+    outcome: Union[tuple[Optional[str], float], Exception],
+) -> Optional[str]:
+    """Add the outcome of a query to batch_result and return its stats release filename."""
+    if isinstance(outcome, Exception):
+        batch_result.errors[query.filename] = outcome
+        return None
+    stats_release_filename, seconds = outcome
+    batch_result.query_seconds[query.filename] = seconds
+    if query.extract_status == "unchanged":
+        batch_result.unchanged_filenames.append(query.filename)
+    if query.metrics is not None:
+        batch_result.metrics[query.filename] = query.metrics
+    logger.info("%s finished in %.2f seconds", query.filename, seconds)
+    return stats_release_filename
+
+
+def _finish_batch(
+    batch_result: DataQueryBatchResult,
+    queries: list[GenericDataQuery],
+    stats_release_filenames: list[Optional[str]],
+    start: float,
+) -> DataQueryBatchResult:
+    batch_result.total_seconds = perf_counter() - start
+    batch_result.stats_release_filenames = [
+        filename for filename in stats_release_filenames if filename is not None
+    ]
+    if batch_result.metrics:
+        logger.info(
+            "\n%s", format_extract_metrics_table(list(batch_result.metrics.values()))
+        )
+    logger.info(
+        "%s queries finished in %.2f seconds", len(queries), batch_result.total_seconds
+    )
+
+    if batch_result.errors:
+        raise DataQueryBatchError(
+            f"{len(batch_result.errors)} of {len(queries)} queries failed: "
+            f"{', '.join(batch_result.errors)}",
+            batch_result,
+        )
+    return batch_result
+
+
+def run_data_queries(
+    queries: list[GenericDataQuery], max_workers: int = 4
+) -> DataQueryBatchResult:
+    """Run get_data_from_cds for each query, at most max_workers at a time.
+
+    Every query is run even if others fail. Once all have finished, a DataQueryBatchError is
+    raised if any of them failed.
+
+    Args:
+        queries (list[GenericDataQuery]): Query instances to run.
+        max_workers (int): Maximum number of queries to run concurrently. Defaults to 4.
+
+    Returns:
+        DataQueryBatchResult: Stats release filenames and timings for the batch.
+
+    Raises:
+        ValueError: If max_workers is less than 1.
+        DataQueryBatchError: If any query raised an exception.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    batch_result = DataQueryBatchResult()
+    stats_release_filenames = [None] * len(queries)
+    start = perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_index = {
+            executor.submit(_run_timed_query, query): i
+            for i, query in enumerate(queries)
+        }
+        for future in as_completed(future_to_index):
+            i = future_to_index[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                outcome = exc
+            stats_release_filenames[i] = _record_query_outcome(
+                batch_result, queries[i], outcome
+            )
+
+    return _finish_batch(batch_result, queries, stats_release_filenames, start)
+
+
+async def run_data_queries_async(
+    queries: list[GenericDataQuery], max_workers: int = 4
+) -> DataQueryBatchResult:
+    """Awaitable version of run_data_queries.
+
+    The queries run on a thread pool of max_workers threads, so the event loop is free to
+    run other tasks, such as post-processing of earlier extracts, while they run.
+
+    Args:
+        queries (list[GenericDataQuery]): Query instances to run.
+        max_workers (int): Maximum number of queries to run concurrently. Defaults to 4.
+
+    Returns:
+        DataQueryBatchResult: Stats release filenames and timings for the batch.
+
+    Raises:
+        ValueError: If max_workers is less than 1.
+        DataQueryBatchError: If any query raised an exception.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    batch_result = DataQueryBatchResult()
+    stats_release_filenames = [None] * len(queries)
+    start = perf_counter()
+    loop = asyncio.get_running_loop()
+
+    async def run_query(i: int, executor: ThreadPoolExecutor):
+        try:
+            return i, await loop.run_in_executor(executor, _run_timed_query, queries[i])
+        except Exception as exc:  # pylint: disable=broad-except
+            return i, exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for task in asyncio.as_completed(
+            [run_query(i, executor) for i in range(len(queries))]
+        ):
+            i, outcome = await task
+            stats_release_filenames[i] = _record_query_outcome(
+                batch_result, queries[i], outcome
+            )
+
+    return _finish_batch(batch_result, queries, stats_release_filenames, start)
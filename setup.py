@@ -11,7 +11,7 @@ setup(
     author="Ministry of Housing, Communities & Local Government",
     description="Provides access to functionality common to creating a data dashboard.",
     name="gov_uk_dashboards",
-    version="33.11.0",
+    version="33.36.0",
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(),
@@ -0,0 +1,87 @@
+"""Fixtures shared by the chart tests"""
+
+from typing import Optional
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.components.plotly.stacked_barchart import StackedBarChart
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+TITLE_AND_SUBTITLE = {"main_title": "test", "subtitle": "testsub"}
+
+
+def _get_trace_names(df: pl.DataFrame) -> list[str]:
+    return df[MEASURE].unique(maintain_order=True).to_list()
+
+
+def _get_hover_data(trace_names: list[str]) -> dict[str, dict[str, list[str]]]:
+    return {
+        name: {
+            "custom_data": [DATE_VALID, VALUE],
+            "hover_text_headers": ["Date", "Value"],
+        }
+        for name in trace_names
+    }
+
+
+@pytest.fixture(name="chart_df")
+def fixture_chart_df():
+    """Monthly values through 2024 of three measures"""
+    return pl.DataFrame(
+        {
+            MEASURE: [f"Measure {i // 12 + 1}" for i in range(36)],
+            DATE_VALID: [f"2024-{month:02}-01" for month in range(1, 13)] * 3,
+            VALUE: [float(i) for i in range(36)],
+        }
+    )
+
+
+@pytest.fixture(name="trace_names")
+def fixture_trace_names(chart_df):
+    """Trace names of chart_df"""
+    return _get_trace_names(chart_df)
+
+
+@pytest.fixture(name="get_time_series_chart")
+def fixture_get_time_series_chart(chart_df):
+    """Function returning a TimeSeriesChart with a trace for each MEASURE of df, by default
+    chart_df, whose hover shows each point's date and value"""
+
+    def get_time_series_chart(
+        df: Optional[pl.DataFrame] = None, **kwargs
+    ) -> TimeSeriesChart:
+        df = chart_df if df is None else df
+        return TimeSeriesChart(
+            TITLE_AND_SUBTITLE,
+            VALUE,
+            _get_hover_data(_get_trace_names(df)),
+            df,
+            _get_trace_names(df),
+            trace_name_column=MEASURE,
+            **kwargs,
+        )
+
+    return get_time_series_chart
+
+
+@pytest.fixture(name="get_stacked_bar_chart")
+def fixture_get_stacked_bar_chart(chart_df):
+    """Function returning a StackedBarChart with a trace for each MEASURE of df, by default
+    chart_df, whose hover shows each bar's date and value"""
+
+    def get_stacked_bar_chart(
+        df: Optional[pl.DataFrame] = None, **kwargs
+    ) -> StackedBarChart:
+        df = chart_df if df is None else df
+        return StackedBarChart(
+            TITLE_AND_SUBTITLE,
+            VALUE,
+            _get_hover_data(_get_trace_names(df)),
+            df,
+            _get_trace_names(df),
+            trace_name_column=MEASURE,
+            **kwargs,
+        )
+
+    return get_stacked_bar_chart
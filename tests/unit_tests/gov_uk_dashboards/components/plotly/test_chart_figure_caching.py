@@ -0,0 +1,79 @@
+"""Test TimeSeriesChart and StackedBarChart create their figure once, on first use"""
+
+import json
+
+import pytest
+from gov_uk_dashboards.components.plotly.stacked_barchart import StackedBarChart
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+
+@pytest.fixture(name="chart_and_create_calls", params=["time_series", "stacked_bar"])
+def fixture_chart_and_create_calls(
+    request, monkeypatch, get_time_series_chart, get_stacked_bar_chart
+):
+    """A chart of each class, and a list recording the calls made to create its figure"""
+    chart_class, create_method, get_chart = {
+        "time_series": (
+            TimeSeriesChart,
+            "create_time_series_chart",
+            get_time_series_chart,
+        ),
+        "stacked_bar": (
+            StackedBarChart,
+            "create_stacked_bar_chart",
+            get_stacked_bar_chart,
+        ),
+    }[request.param]
+    create = getattr(chart_class, create_method)
+    calls = []
+
+    def counting_create(self):
+        calls.append(self)
+        return create(self)
+
+    monkeypatch.setattr(chart_class, create_method, counting_create)
+    return get_chart(), calls
+
+
+def _get_download_figure(chart):
+    if isinstance(chart, TimeSeriesChart):
+        return chart.get_time_series_chart_for_download()
+    return chart.get_stacked_bar_chart_for_download()
+
+
+def test_chart_figure_is_created_once_on_first_use(chart_and_create_calls):
+    """Test to check the figure is not created by __init__, and is reused afterwards"""
+    chart, create_calls = chart_and_create_calls
+    assert not create_calls
+
+    fig = chart.fig
+
+    assert chart.fig is fig
+    assert len(create_calls) == 1
+
+
+def test_chart_for_download_is_copy_of_figure(chart_and_create_calls):
+    """Test to check the download figure reuses the figure without changing it"""
+    chart, create_calls = chart_and_create_calls
+    fig_json = chart.fig.to_json()
+
+    download_fig = _get_download_figure(chart)
+
+    assert len(create_calls) == 1
+    assert download_fig is not chart.fig
+    assert chart.fig.to_json() == fig_json
+    assert "test" in download_fig.layout.title.text
+    assert json.loads(download_fig.to_json())["data"] == json.loads(fig_json)["data"]
+
+
+def test_chart_to_dict_excludes_figure(chart_and_create_calls):
+    """Test to check to_dict leaves out the cached figure, and from_dict restores an
+    equivalent chart"""
+    chart, _ = chart_and_create_calls
+    fig_json = chart.fig.to_json()
+
+    data = chart.to_dict()
+    restored_chart = type(chart).from_dict(data)
+
+    assert "_fig" not in data
+    assert restored_chart.fig.to_json() == fig_json
@@ -0,0 +1,179 @@
+"""Test TimeSeriesChart and StackedBarChart give each trace a single hover template"""
+
+import datetime
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+
+
+@pytest.fixture(name="chart_df")
+def fixture_chart_df():
+    """Values of a trace, with string and number columns to show for the last point"""
+    return pl.DataFrame(
+        {
+            MEASURE: ["Measure 1"] * 3,
+            DATE_VALID: ["2023-10-12", "2023-11-15", "2023-12-25"],
+            VALUE: [1.5, 2.5, 3.5],
+            "Last value": ["a", "b", "c"],
+            "Last number": [7.25, 8.25, 9.25],
+        }
+    )
+
+
+def test_time_series_chart_trace_has_single_hover_template(get_time_series_chart):
+    """Test to check a trace's hover template is a single string and customdata holds the
+    hover data columns"""
+    trace = get_time_series_chart().fig.data[0]
+
+    assert trace.hovertemplate == (
+        "Measure 1<br>Date: %{customdata[0]}<br>Value: %{customdata[1]}<extra></extra>"
+    )
+    assert trace.hoverinfo is None
+    assert [list(row) for row in trace.customdata] == [
+        ["2023-10-12", 1.5],
+        ["2023-11-15", 2.5],
+        ["2023-12-25", 3.5],
+    ]
+
+
+def test_time_series_chart_different_hover_for_last_point_uses_customdata(
+    get_time_series_chart,
+):
+    """Test to check the last point's hover data and headers are swapped in through
+    customdata"""
+    trace = get_time_series_chart(
+        hover_data_for_traces_with_different_hover_for_last_point={
+            "Measure 1": {
+                "custom_data": [DATE_VALID, "Last value"],
+                "hover_text_headers": ["Date", "Projected"],
+            }
+        }
+    ).fig.data[0]
+
+    assert trace.hovertemplate == (
+        "Measure 1<br>%{customdata[2]}: %{customdata[0]}<br>"
+        "%{customdata[3]}: %{customdata[1]}<extra></extra>"
+    )
+    assert [list(row) for row in trace.customdata] == [
+        ["2023-10-12", 1.5, "Date", "Value"],
+        ["2023-11-15", 2.5, "Date", "Value"],
+        ["2023-12-25", "c", "Date", "Projected"],
+    ]
+
+
+def test_time_series_chart_last_point_hover_data_of_same_type_is_swapped_in(
+    get_time_series_chart,
+):
+    """Test to check last point columns of the same type are swapped in for the last
+    point"""
+    trace = get_time_series_chart(
+        hover_data_for_traces_with_different_hover_for_last_point={
+            "Measure 1": {
+                "custom_data": [DATE_VALID, "Last number"],
+                "hover_text_headers": ["Date", "Projected"],
+            }
+        },
+        x_unified_hovermode=True,
+    ).fig.data[0]
+
+    assert [list(row) for row in trace.customdata] == [
+        ["2023-10-12", 1.5],
+        ["2023-11-15", 2.5],
+        ["2023-12-25", 9.25],
+    ]
+
+
+def test_time_series_chart_last_point_hover_data_keeps_column_types(
+    get_time_series_chart, chart_df
+):
+    """Test to check swapping in last point columns of a different type leaves every
+    point's values unchanged, rather than casting them to a common type"""
+    chart = get_time_series_chart(
+        chart_df.with_columns(
+            pl.Series("Last date", [datetime.date(2024, 1, i) for i in range(1, 4)]),
+            pl.Series("Last list", [[1, 2]] * 3),
+        ),
+        hover_data_for_traces_with_different_hover_for_last_point={
+            "Measure 1": {
+                "custom_data": ["Last list", "Last date"],
+                "hover_text_headers": ["Range", "Projected"],
+            }
+        },
+    )
+
+    trace = chart.fig.data[0]
+
+    assert [list(row) for row in trace.customdata] == [
+        ["2023-10-12", 1.5, "Date", "Value"],
+        ["2023-11-15", 2.5, "Date", "Value"],
+        [[1, 2], datetime.date(2024, 1, 3), "Range", "Projected"],
+    ]
+
+
+def _get_hover_labels(trace, x_unified_hovermode: bool) -> list:
+    """Return the hover label Plotly.js draws for each point of trace, or None where it
+    draws no label.
+
+    Plotly.js leaves points with a hoverinfo of "none" out of x unified hovers. In closest
+    hovermode a point with a hover template always gets a label, and otherwise the label
+    holds the hoverinfo flags it shows and is removed when they leave it empty.
+    """
+    labels = []
+    for index, row in enumerate(trace.customdata):
+        hoverinfo = (
+            trace.hoverinfo[index]
+            if isinstance(trace.hoverinfo, tuple)
+            else trace.hoverinfo or "all"
+        )
+        if x_unified_hovermode and hoverinfo == "none":
+            labels.append(None)
+        elif trace.hovertemplate:
+            labels.append(
+                trace.hovertemplate.replace("%{customdata[0]}", str(row[0])).replace(
+                    "%{customdata[1]}", str(row[1])
+                )
+            )
+        elif hoverinfo in ("all", "text"):
+            labels.append(trace.hovertext[index] or None)
+        else:
+            labels.append(None)
+    return labels
+
+
+def test_time_series_chart_prevents_hover_of_first_point(get_time_series_chart):
+    """Test to check only the first point's hover label is hidden in closest hovermode"""
+    trace = get_time_series_chart(
+        trace_names_to_prevent_hover_of_first_point_list=["Measure 1"],
+    ).fig.data[0]
+
+    assert _get_hover_labels(trace, x_unified_hovermode=False) == [
+        None,
+        "Measure 1<br>Date: 2023-11-15<br>Value: 2.5",
+        "Measure 1<br>Date: 2023-12-25<br>Value: 3.5",
+    ]
+
+
+def test_time_series_chart_prevents_hover_of_first_point_in_x_unified_hovermode(
+    get_time_series_chart,
+):
+    """Test to check only the first point's hover is hidden in x unified hovermode"""
+    trace = get_time_series_chart(
+        trace_names_to_prevent_hover_of_first_point_list=["Measure 1"],
+        x_unified_hovermode=True,
+    ).fig.data[0]
+
+    assert _get_hover_labels(trace, x_unified_hovermode=True) == [
+        None,
+        "Measure 1: 2023-11-15<extra></extra>",
+        "Measure 1: 2023-12-25<extra></extra>",
+    ]
+
+
+def test_stacked_bar_chart_trace_has_single_hover_template(get_stacked_bar_chart):
+    """Test to check a bar trace's hover template is a single string"""
+    chart = get_stacked_bar_chart()
+
+    assert chart.fig.data[0].hovertemplate == (
+        "Measure 1<br>Date: %{customdata[0]}<br>Value: %{customdata[1]}<extra></extra>"
+    )
@@ -0,0 +1,56 @@
+"""Test TimeSeriesChart and StackedBarChart round trip through a compact to_dict"""
+
+import datetime
+import json
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, VALUE
+from gov_uk_dashboards.components.plotly.stacked_barchart import StackedBarChart
+from gov_uk_dashboards.components.plotly.time_series_and_stacked_barchart_helper_functions import (
+    decode_dataframe_compact,
+    encode_dataframe_compact,
+)
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+
+@pytest.mark.parametrize(
+    "chart_class, get_chart",
+    [
+        (TimeSeriesChart, "get_time_series_chart"),
+        (StackedBarChart, "get_stacked_bar_chart"),
+    ],
+)
+def test_chart_compact_to_dict_round_trips_through_json(
+    chart_class, get_chart, request
+):
+    """Test to check a chart restored from a compact to_dict, sent through JSON, gives the
+    same figure, and the payload is smaller"""
+    chart = request.getfixturevalue(get_chart)()
+
+    compact_json = json.dumps(chart.to_dict(compact=True))
+    restored_chart = chart_class.from_dict(json.loads(compact_json))
+
+    assert restored_chart.fig.to_json() == chart.fig.to_json()
+    assert len(compact_json) < len(json.dumps(chart.to_dict()))
+
+
+def test_decode_dataframe_compact_keeps_column_types():
+    """Test to check column types survive encoding, unlike with a list of row dicts"""
+    df = pl.DataFrame(
+        {
+            DATE_VALID: [datetime.date(2024, 1, 1), None],
+            VALUE: pl.Series([1, 2], dtype=pl.Int16),
+        }
+    )
+
+    assert decode_dataframe_compact(encode_dataframe_compact(df)).equals(df)
+    assert decode_dataframe_compact(encode_dataframe_compact(df)).schema == df.schema
+
+
+def test_decode_dataframe_compact_rejects_unknown_version(chart_df):
+    """Test to check a payload from an unsupported format version raises a ValueError"""
+    value = encode_dataframe_compact(chart_df) | {"_version": 99}
+
+    with pytest.raises(ValueError, match="version"):
+        decode_dataframe_compact(value)
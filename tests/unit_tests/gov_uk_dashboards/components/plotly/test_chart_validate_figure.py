@@ -0,0 +1,104 @@
+"""Test TimeSeriesChart and StackedBarChart build the same figure without validation"""
+
+import base64
+
+import numpy as np
+import pytest
+import polars as pl
+from dash import dcc
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+
+def _normalise(value):
+    """Return value with arrays, including base64 encoded typed arrays, and tuples as lists."""
+    if isinstance(value, dict) and set(value) == {"dtype", "bdata"}:
+        return np.frombuffer(base64.b64decode(value["bdata"]), value["dtype"]).tolist()
+    if isinstance(value, dict):
+        return {key: _normalise(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalise(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _get_timestamps(dates: list[str]) -> list[float]:
+    """Return dates as milliseconds since the epoch, as unvalidated time series give them."""
+    return (
+        pl.Series(dates)
+        .str.to_datetime("%Y-%m-%d")
+        .dt.epoch("ms")
+        .cast(pl.Float64)
+        .to_list()
+    )
+
+
+@pytest.fixture(name="get_chart_with_options")
+def fixture_get_chart_with_options(get_time_series_chart, trace_names):
+    """Function returning a TimeSeriesChart using the trace styling and hover options"""
+
+    def get_chart_with_options(**kwargs) -> TimeSeriesChart:
+        return get_time_series_chart(
+            grey_traces=trace_names[1:],
+            dashed_trace_name_list=[trace_names[1]],
+            initially_hidden_traces=[trace_names[2]],
+            trace_names_to_prevent_hover_of_first_point_list=[trace_names[0]],
+            verticle_line_x_value_and_name=("2024-06-01", "Change"),
+            **kwargs,
+        )
+
+    return get_chart_with_options
+
+
+@pytest.mark.parametrize("webgl_point_threshold", [None, 0])
+def test_time_series_chart_unvalidated_figure_matches_validated_figure(
+    webgl_point_threshold, get_chart_with_options
+):
+    """Test to check a time series chart built as plain dicts is the same figure as the
+    validated one, with dates as timestamps"""
+    fig = get_chart_with_options(
+        validate_figure=False, webgl_point_threshold=webgl_point_threshold
+    ).fig
+    validated_fig = _normalise(
+        get_chart_with_options(
+            webgl_point_threshold=webgl_point_threshold
+        ).fig.to_dict()
+    )
+    for trace in validated_fig["data"]:
+        trace["x"] = _get_timestamps(trace["x"])
+
+    assert isinstance(fig, dict)
+    assert _normalise(fig) == validated_fig
+
+
+def test_stacked_bar_chart_unvalidated_figure_matches_validated_figure(
+    get_stacked_bar_chart, trace_names
+):
+    """Test to check a stacked bar chart built as plain dicts is the same figure as the
+    validated one"""
+    initially_hidden_traces = [trace_names[2]]
+    fig = get_stacked_bar_chart(
+        initially_hidden_traces=initially_hidden_traces, validate_figure=False
+    ).fig
+
+    assert isinstance(fig, dict)
+    assert _normalise(fig) == _normalise(
+        get_stacked_bar_chart(
+            initially_hidden_traces=initially_hidden_traces
+        ).fig.to_dict()
+    )
+
+
+def test_unvalidated_figure_is_passed_to_graph_and_download(get_chart_with_options):
+    """Test to check the plain dict figure goes straight to dcc.Graph, and the chart can
+    still be downloaded"""
+    chart = get_chart_with_options(validate_figure=False)
+
+    graph = chart.get_time_series_chart().children[-1]
+    download_fig = chart.get_time_series_chart_for_download()
+
+    assert isinstance(graph, dcc.Graph)
+    assert graph.figure is chart.fig
+    assert graph.figure["layout"]["dragmode"] is False
+    assert download_fig.layout.title.text.endswith("test</span></b>")
+    assert "title" not in chart.fig["layout"]
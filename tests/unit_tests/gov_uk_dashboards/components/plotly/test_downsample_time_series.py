@@ -0,0 +1,95 @@
+"""Test time series are downsampled with Largest-Triangle-Three-Buckets"""
+
+import datetime
+
+import numpy as np
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.components.helpers.downsample_time_series import (
+    downsample_time_series_df,
+    get_lttb_indices,
+)
+
+WEEKLY_DF = pl.DataFrame(
+    {
+        MEASURE: ["Measure 1"] * 500,
+        DATE_VALID: [
+            (datetime.date(2015, 1, 5) + datetime.timedelta(weeks=i)).isoformat()
+            for i in range(500)
+        ],
+        VALUE: np.sin(np.arange(500) / 20) * 100,
+    }
+)
+
+
+def test_get_lttb_indices_keeps_first_last_and_peaks():
+    """Test to check the first and last points and a spike are kept"""
+    y = np.zeros(100)
+    y[37] = 50
+
+    indices = get_lttb_indices(np.arange(100, dtype=float), y, 10)
+
+    assert len(indices) == 10
+    assert indices[0] == 0
+    assert indices[-1] == 99
+    assert 37 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_get_lttb_indices_keeps_all_points_when_under_max_points():
+    """Test to check nothing is dropped from a short series"""
+    indices = get_lttb_indices(np.arange(5.0), np.arange(5.0), 10)
+
+    assert indices.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_downsample_time_series_df_keeps_rows_aligned():
+    """Test to check whole rows are kept, in order, so hover data matches its point"""
+    downsampled_df = downsample_time_series_df(WEEKLY_DF, DATE_VALID, VALUE, 50)
+
+    assert downsampled_df.height == 50
+    assert downsampled_df.row(0) == WEEKLY_DF.row(0)
+    assert downsampled_df.row(-1) == WEEKLY_DF.row(-1)
+    assert downsampled_df.join(WEEKLY_DF, on=downsampled_df.columns).height == 50
+    assert downsampled_df[DATE_VALID].is_sorted()
+
+
+def test_downsample_time_series_df_keeps_gaps():
+    """Test to check rows with no value are kept, so gaps in the line are not bridged"""
+    df = WEEKLY_DF.with_columns(
+        pl.when(pl.int_range(pl.len()).is_between(200, 209))
+        .then(None)
+        .otherwise(pl.col(VALUE))
+        .alias(VALUE)
+    )
+
+    downsampled_df = downsample_time_series_df(df, DATE_VALID, VALUE, 50)
+
+    assert downsampled_df[VALUE].null_count() == 10
+    assert downsampled_df.height == 60
+
+
+def test_time_series_chart_downsamples_traces(get_time_series_chart):
+    """Test to check each trace has at most max_points_per_trace points, with customdata
+    for the same points"""
+    chart = get_time_series_chart(
+        WEEKLY_DF,
+        xaxis_tick_text_format="week",
+        max_points_per_trace=100,
+    )
+
+    trace = chart.fig.data[0]
+
+    assert len(trace.x) == 100
+    assert [row[0] for row in trace.customdata] == list(trace.x)
+    assert trace.x[0] == WEEKLY_DF[DATE_VALID][0]
+    assert trace.x[-1] == WEEKLY_DF[DATE_VALID][-1]
+
+
+def test_time_series_chart_rejects_too_few_max_points_per_trace(
+    get_time_series_chart,
+):
+    """Test to check max_points_per_trace must leave room for more than the end points"""
+    with pytest.raises(ValueError):
+        get_time_series_chart(WEEKLY_DF, max_points_per_trace=2)
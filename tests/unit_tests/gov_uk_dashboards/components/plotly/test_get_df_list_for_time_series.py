@@ -132,3 +132,30 @@ def test_get_df_list_for_time_series_returns_correct_df_list_when_trace_name_col
     assert len(actual_df_list) == len(expected_df_list)
     for actual_df, expected_df in zip(actual_df_list, expected_df_list):
         assert actual_df.equals(expected_df)
+
+
+def test_get_df_list_for_time_series_sorts_each_trace_and_keeps_missing_traces():
+    """test to check each trace's dataframe is sorted by date when the data is not, and a
+    trace with no data gets an empty dataframe."""
+    trace_name_list = ["Small", "Missing", "Large"]
+    hover_data = {
+        trace_name: {
+            "custom_data": [DATE_VALID, VALUE],
+            "hover_text_headers": ["header1", "header2"],
+        }
+        for trace_name in trace_name_list
+    }
+    time_series_class = TimeSeriesChart(
+        {"main_title": "test", "subtitle": "testsub"},
+        VALUE,
+        hover_data,
+        pl.concat([DF_MEASURE1_SMALL, DF_MEASURE1_LARGE]).reverse(),
+        trace_name_list,
+        trace_name_column=UNIT_SIZE,
+    )
+    # pylint: disable=protected-access
+    actual_df_list = time_series_class._get_df_list_for_time_series()
+
+    assert actual_df_list[0].equals(DF_MEASURE1_SMALL)
+    assert actual_df_list[1].is_empty()
+    assert actual_df_list[2].equals(DF_MEASURE1_LARGE)
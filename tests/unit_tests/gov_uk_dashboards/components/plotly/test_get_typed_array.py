@@ -0,0 +1,84 @@
+"""Test trace data is encoded as base64 typed arrays for Plotly.js"""
+
+import base64
+
+import numpy as np
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.components.plotly.time_series_and_stacked_barchart_helper_functions import (
+    get_typed_array,
+)
+
+
+def _decode(typed_array: dict[str, str]) -> list:
+    return np.frombuffer(
+        base64.b64decode(typed_array["bdata"]), typed_array["dtype"]
+    ).tolist()
+
+
+@pytest.mark.parametrize(
+    "values, expected_dtype",
+    [
+        (pl.Series([1.5, 2.5, -3.0]), "f8"),
+        (pl.Series([1.5, 2.5, -3.0], dtype=pl.Float32), "f4"),
+        (pl.Series([1, 2, -3]), "i4"),
+        (pl.Series([1, 2, 3], dtype=pl.UInt8), "u1"),
+    ],
+)
+def test_get_typed_array_encodes_numbers(values, expected_dtype):
+    """Test to check numeric Series are encoded as typed arrays of a Plotly.js dtype"""
+    typed_array = get_typed_array(values)
+
+    assert typed_array["dtype"] == expected_dtype
+    assert _decode(typed_array) == values.to_list()
+
+
+def test_get_typed_array_encodes_nulls_and_large_integers_as_floats():
+    """Test to check nulls become NaN, and integers too large for 32 bits become floats"""
+    typed_array = get_typed_array(pl.Series([1, None, 2**40]))
+
+    assert typed_array["dtype"] == "f8"
+    assert _decode(typed_array)[0] == 1
+    assert np.isnan(_decode(typed_array)[1])
+    assert _decode(typed_array)[2] == 2**40
+
+
+def test_get_typed_array_encodes_numeric_dataframe_with_shape():
+    """Test to check a DataFrame of numbers becomes a two dimensional typed array"""
+    typed_array = get_typed_array(pl.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]}))
+
+    assert typed_array["shape"] == "2, 2"
+    assert _decode(typed_array) == [1.0, 3.0, 2.0, 4.0]
+
+
+def test_get_typed_array_returns_other_values_as_lists():
+    """Test to check strings stay lists, and DataFrames with strings lists of rows"""
+    assert get_typed_array(pl.Series(["a", "b"])) == ["a", "b"]
+    assert get_typed_array(pl.DataFrame({"a": ["x", "y"], "b": [1, 2]})) == [
+        ("x", 1),
+        ("y", 2),
+    ]
+
+
+def test_unvalidated_time_series_chart_encodes_dates_as_timestamps(
+    get_time_series_chart,
+):
+    """Test to check an unvalidated time series trace has its dates and values as typed
+    arrays, on a date x-axis"""
+    fig = get_time_series_chart(
+        pl.DataFrame(
+            {
+                MEASURE: ["Measure 1"] * 2,
+                DATE_VALID: ["1970-01-02", "2024-01-01"],
+                VALUE: [1.0, 2.0],
+            }
+        ),
+        validate_figure=False,
+    ).fig
+    trace = fig["data"][0]
+
+    assert fig["layout"]["xaxis"]["type"] == "date"
+    assert _decode(trace["x"]) == [86_400_000.0, 1_704_067_200_000.0]
+    assert _decode(trace["y"]) == [1.0, 2.0]
+    assert trace["customdata"] == [("1970-01-02", 1.0), ("2024-01-01", 2.0)]
@@ -0,0 +1,41 @@
+"""Test TimeSeriesChart draws every trace when there are more traces than markers or
+colours"""
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+
+
+@pytest.fixture(name="chart_df")
+def fixture_chart_df():
+    """Values for 30 traces, more than there are markers or colours"""
+    return pl.DataFrame(
+        {
+            MEASURE: [f"Measure {i // 3 + 1}" for i in range(90)],
+            DATE_VALID: ["2024-01-01", "2024-02-01", "2024-03-01"] * 30,
+            VALUE: [float(i) for i in range(90)],
+        }
+    )
+
+
+def test_time_series_chart_draws_every_trace(get_time_series_chart, trace_names):
+    """Test to check a trace is drawn for each trace name, with markers and colours
+    repeated once they have all been used"""
+    chart = get_time_series_chart()
+
+    traces = chart.fig.data
+    markers = chart.markers
+
+    assert [trace.name.strip() for trace in traces] == trace_names
+    assert [trace.marker.symbol for trace in traces] == [
+        markers[i % len(markers)] for i in range(len(trace_names))
+    ]
+    assert len(chart.colour_list) == len(trace_names)
+    assert traces[-1].line.color == chart.colour_list[-1]
+
+
+def test_time_series_chart_draws_every_grey_trace(get_time_series_chart, trace_names):
+    """Test to check every grey trace is drawn alongside the focus trace"""
+    chart = get_time_series_chart(grey_traces=trace_names[1:])
+
+    assert len(chart.fig.data) == len(trace_names)
@@ -0,0 +1,56 @@
+"""Test TimeSeriesChart switches to WebGL rendering for charts with many points"""
+
+import pytest
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+
+@pytest.fixture(name="get_chart")
+def fixture_get_chart(get_time_series_chart, trace_names):
+    """Function returning a TimeSeriesChart with grey and dashed traces"""
+
+    def get_chart(**kwargs) -> TimeSeriesChart:
+        return get_time_series_chart(
+            grey_traces=trace_names[1:],
+            dashed_trace_name_list=[trace_names[1]],
+            **kwargs,
+        )
+
+    return get_chart
+
+
+@pytest.mark.parametrize(
+    "webgl_point_threshold, expected_trace_type",
+    [(None, "scatter"), (36, "scatter"), (35, "scattergl")],
+)
+def test_time_series_chart_uses_webgl_above_point_threshold(
+    webgl_point_threshold, expected_trace_type, get_chart
+):
+    """Test to check traces are rendered with WebGL only when the chart has more points
+    than webgl_point_threshold"""
+    chart = get_chart(webgl_point_threshold=webgl_point_threshold)
+
+    assert {trace.type for trace in chart.fig.data} == {expected_trace_type}
+
+
+def test_time_series_chart_webgl_draws_focus_trace_last(get_chart, trace_names):
+    """Test to check the focus trace is drawn over the grey traces, with the legend and
+    line styles unchanged"""
+    chart = get_chart(webgl_point_threshold=0)
+
+    traces = chart.fig.data
+
+    assert [trace.name.strip() for trace in traces] == [
+        trace_names[1],
+        trace_names[2],
+        trace_names[0],
+    ]
+    assert [trace.legendrank for trace in traces] == [1, 2, 0]
+    assert traces[0].line.dash == "dot"
+    assert traces[2].hovertemplate == get_chart().fig.data[0].hovertemplate
+
+
+def test_time_series_chart_stacked_does_not_use_webgl(get_chart):
+    """Test to check stacked charts stay SVG, as WebGL traces cannot stack"""
+    chart = get_chart(webgl_point_threshold=0, stacked=True)
+
+    assert {trace.type for trace in chart.fig.data} == {"scatter"}
@@ -0,0 +1,108 @@
+"""Test TimeSeriesChart x-axis ticks for string and native date columns"""
+
+import datetime
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.components.plotly import time_series_chart
+from gov_uk_dashboards.components.plotly.enums import XAxisFormat
+from gov_uk_dashboards.components.plotly.time_series_chart import TimeSeriesChart
+
+DATES = ["2024-01-31", "2024-03-15", "2024-09-30"]
+
+
+@pytest.fixture(name="get_chart")
+def fixtureget_chart(get_time_series_chart):
+    """Function returning a TimeSeriesChart of a trace with a point on each of dates"""
+
+    def get_chart(dates, xaxis_tick_text_format, **kwargs) -> TimeSeriesChart:
+        return get_time_series_chart(
+            pl.DataFrame(
+                {
+                    MEASURE: ["Measure 1"] * len(dates),
+                    DATE_VALID: dates,
+                    VALUE: [1.0, 2.0, 3.0],
+                }
+            ),
+            xaxis_tick_text_format=xaxis_tick_text_format,
+            **kwargs,
+        )
+
+    return get_chart
+
+
+@pytest.mark.parametrize(
+    "xaxis_tick_text_format",
+    [
+        XAxisFormat.YEAR.value,
+        XAxisFormat.MONTH_YEAR.value,
+        XAxisFormat.MONTH_YEAR_MONTHLY_DATA.value,
+        XAxisFormat.WEEK.value,
+    ],
+)
+@pytest.mark.parametrize("date_type", [pl.Date, pl.Datetime])
+def test_get_x_axis_content_is_same_for_native_date_column(
+    xaxis_tick_text_format, date_type, get_chart
+):
+    """Test to check a pl.Date or pl.Datetime x-axis column gives the same ticks as the
+    same dates as strings"""
+    native_dates = pl.Series(DATES).str.strptime(date_type, "%Y-%m-%d")
+
+    # pylint: disable=protected-access
+    assert (
+        get_chart(native_dates, xaxis_tick_text_format)._get_x_axis_content()
+        == get_chart(DATES, xaxis_tick_text_format)._get_x_axis_content()
+    )
+
+
+def test_get_x_axis_content_month_year(get_chart):
+    """Test to check month ticks run from x_axis_start_datetime's month, with a tick added
+    after the last month"""
+    chart = get_chart(
+        DATES,
+        XAxisFormat.MONTH_YEAR.value,
+        x_axis_start_datetime=datetime.date(2024, 6, 1),
+    )
+
+    # pylint: disable=protected-access
+    tick_text, tick_values, range_x = chart._get_x_axis_content()
+
+    assert tick_text == ["Jun 2024", "Jul 2024", "Aug 2024", "Sep 2024", "Oct 2024"]
+    assert tick_values[0] == datetime.datetime(2024, 6, 1)
+    assert tick_values[-1] == datetime.datetime(2024, 10, 1)
+    assert range_x == [datetime.datetime(2024, 6, 1), datetime.datetime(2024, 11, 15)]
+
+
+def test_get_x_axis_content_week(get_chart):
+    """Test to check week ticks fall on Mondays, from a week before the first date to a week
+    after the last"""
+    chart = get_chart(
+        ["2025-09-10", "2025-09-17", "2025-09-24"], XAxisFormat.WEEK.value
+    )
+
+    # pylint: disable=protected-access
+    tick_text, tick_values, range_x = chart._get_x_axis_content()
+
+    assert tick_text == [
+        "01 Sep 2025",
+        "08 Sep 2025",
+        "15 Sep 2025",
+        "22 Sep 2025",
+        "29 Sep 2025",
+    ]
+    assert all(tick_value.weekday() == 0 for tick_value in tick_values)
+    assert range_x == [datetime.datetime(2025, 9, 3), datetime.datetime(2025, 10, 1)]
+
+
+def test_get_x_axis_ticks_are_cached(get_chart):
+    """Test to check building a chart reuses the ticks for its date range and format"""
+    # pylint: disable=protected-access
+    time_series_chart._get_x_axis_ticks.cache_clear()
+
+    for _ in range(2):
+        assert get_chart(DATES, XAxisFormat.MONTH_YEAR.value).fig.data
+
+    cache_info = time_series_chart._get_x_axis_ticks.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 3
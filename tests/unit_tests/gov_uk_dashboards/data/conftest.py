@@ -0,0 +1,45 @@
+"""Fixtures shared by the data layer tests"""
+
+import sqlite3
+
+import pytest
+from gov_uk_dashboards.data.get_data import (
+    CdsConnectionPool,
+    close_cds_connection_pools,
+    quote_sql_identifier,
+    set_cds_connection_pool,
+)
+
+
+class SqliteCdsDatabase:
+    """sqlite3 database standing in for CDS, recording each connection opened to it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connections = []
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection for a CdsConnectionPool."""
+        self.connections.append(sqlite3.connect(self.path, check_same_thread=False))
+        return self.connections[-1]
+
+    def create_table(self, name: str, columns: list[str], rows: list[tuple]):
+        """Create table name with columns and insert rows."""
+        placeholders = ", ".join("?" for _ in columns)
+        self.connection.execute(
+            f"CREATE TABLE {name} "
+            f"({', '.join(quote_sql_identifier(column) for column in columns)})"
+        )
+        self.connection.executemany(f"INSERT INTO {name} VALUES ({placeholders})", rows)
+        self.connection.commit()
+
+
+@pytest.fixture(name="cds_database")
+def fixture_cds_database(tmp_path):
+    """sqlite3 database registered as the "test-server" CDS server"""
+    database = SqliteCdsDatabase(tmp_path / "cds.db")
+    set_cds_connection_pool("test-server", CdsConnectionPool(database.connect))
+    yield database
+    database.connection.close()
+    close_cds_connection_pools()
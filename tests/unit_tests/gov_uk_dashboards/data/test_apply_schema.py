@@ -0,0 +1,92 @@
+"""Test declared schemas are applied at extraction and preserved on load"""
+
+import datetime
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import AREA_CODE, DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.data_files import (
+    apply_schema,
+    write_data_file_in_batches,
+)
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+TEST_DF = pl.DataFrame(
+    {
+        MEASURE: ["Measure 1", "Measure 2", "Measure 1"],
+        AREA_CODE: ["E06000001", "E06000002", "E06000001"],
+        DATE_VALID: ["2023-10-12", "2023-11-15", "2023-12-25"],
+        VALUE: [1, 2, 3],
+    }
+)
+TEST_SCHEMA = {
+    MEASURE: pl.Enum(["Measure 1", "Measure 2"]),
+    AREA_CODE: pl.Categorical(),
+    DATE_VALID: pl.Date,
+    VALUE: pl.Int16,
+}
+
+
+def test_apply_schema_casts_declared_columns():
+    """Test to check declared columns are cast and others are unchanged"""
+    df = apply_schema(TEST_DF, {DATE_VALID: pl.Date, VALUE: pl.Int16})
+
+    assert df.schema == pl.Schema(
+        {MEASURE: pl.String, AREA_CODE: pl.String, DATE_VALID: pl.Date, VALUE: pl.Int16}
+    )
+    assert df[DATE_VALID][0] == datetime.date(2023, 10, 12)
+
+
+def test_apply_schema_raises_for_missing_column():
+    """Test to check a declared column missing from the data raises a ValueError"""
+    with pytest.raises(ValueError):
+        apply_schema(TEST_DF, {"Region": pl.Categorical})
+
+
+@pytest.mark.parametrize(
+    "filename, file_format",
+    [("extract.csv", "csv"), ("extract.parquet", "parquet"), ("extract.arrow", "ipc")],
+)
+def test_declared_schema_is_applied_at_extraction_and_on_load(
+    tmp_path, monkeypatch, filename, file_format
+):
+    """Test to check load_data returns the declared types for every file format"""
+    monkeypatch.setattr(
+        get_data, "read_cds_query_odbc", lambda query, server, parameters=None: TEST_DF
+    )
+
+    class TypedQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        dir = str(tmp_path)
+        server = "test-server"
+        schema = TEST_SCHEMA
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    TypedQuery.filename = filename
+    TypedQuery.file_format = file_format
+    query = TypedQuery()
+
+    query.get_data_from_cds()
+
+    assert query.load_data().schema == pl.Schema(TEST_SCHEMA)
+    assert query.load_data(lazy=True).collect_schema() == pl.Schema(TEST_SCHEMA)
+
+
+def test_write_data_file_in_batches_writes_categorical_batches_to_ipc(tmp_path):
+    """Test to check categorical batches with different categories can be written to one
+    Arrow IPC file"""
+    path = tmp_path / "extract.arrow"
+    batches = (
+        apply_schema(batch, TEST_SCHEMA) for batch in TEST_DF.iter_slices(n_rows=1)
+    )
+
+    write_data_file_in_batches(batches, path)
+
+    assert apply_schema(pl.read_ipc(path), TEST_SCHEMA).equals(
+        apply_schema(TEST_DF, TEST_SCHEMA)
+    )
@@ -0,0 +1,89 @@
+"""Test the asyncio versions of the CDS data layer, using sqlite3 as a stand-in for CDS"""
+
+import asyncio
+
+import pytest
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data.get_data import GenericDataQuery, read_cds_query_odbc_async
+from gov_uk_dashboards.data.run_data_queries import (
+    DataQueryBatchError,
+    run_data_queries_async,
+)
+
+
+@pytest.fixture(name="extract_table", autouse=True)
+def fixture_extract_table(cds_database):
+    """Table of three rows in the "test-server" CDS database"""
+    cds_database.create_table(
+        "extract", [MEASURE, VALUE], [(f"Measure {i}", i) for i in range(3)]
+    )
+
+
+def _make_query(tmp_path, name, sql, stats_release=False):
+    class TestQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = f"{name}.parquet"
+        dir = str(tmp_path / "data")
+        server = "test-server"
+        file_format = "parquet"
+
+        def query(self):
+            """Return the query text."""
+            return sql
+
+    TestQuery.stats_release = stats_release
+    return TestQuery()
+
+
+def test_read_cds_query_odbc_async_can_be_gathered():
+    """Test to check several reads can be awaited concurrently"""
+
+    async def read_all():
+        return await asyncio.gather(
+            *(
+                read_cds_query_odbc_async(
+                    f"SELECT * FROM extract WHERE [{VALUE}] = ?",
+                    "test-server",
+                    parameters=[i],
+                )
+                for i in range(3)
+            )
+        )
+
+    dfs = asyncio.run(read_all())
+
+    assert [df[MEASURE].to_list() for df in dfs] == [
+        ["Measure 0"],
+        ["Measure 1"],
+        ["Measure 2"],
+    ]
+
+
+def test_get_data_from_cds_async_writes_extract(tmp_path):
+    """Test to check the awaited extract is written and returns its stats release
+    filename"""
+    query = _make_query(
+        tmp_path, "extract", "SELECT * FROM extract", stats_release=True
+    )
+
+    filename = asyncio.run(query.get_data_from_cds_async())
+
+    assert filename == "extract.parquet"
+    assert query.load_data()[VALUE].to_list() == [0, 1, 2]
+
+
+def test_run_data_queries_async_raises_after_running_every_query(tmp_path):
+    """Test to check a failing query does not stop the others from running"""
+    queries = [
+        _make_query(tmp_path, "failing", "SELECT * FROM missing_table"),
+        _make_query(tmp_path, "working", "SELECT * FROM extract", stats_release=True),
+    ]
+
+    with pytest.raises(DataQueryBatchError) as exc_info:
+        asyncio.run(run_data_queries_async(queries, max_workers=2))
+
+    batch_result = exc_info.value.batch_result
+    assert list(batch_result.errors) == ["failing.parquet"]
+    assert batch_result.stats_release_filenames == ["working.parquet"]
+    assert queries[1].load_data().height == 3
@@ -0,0 +1,82 @@
+"""Test CdsConnectionPool reuses, health checks and evicts connections, using sqlite3 as a
+stand-in for the CDS ODBC driver"""
+
+import sqlite3
+import time
+
+import pytest
+from gov_uk_dashboards.data.get_data import (
+    CdsConnectionPool,
+    close_cds_connection_pools,
+    read_cds_query_odbc,
+    set_cds_connection_pool,
+)
+
+
+class CountingConnect:
+    """Connection factory which counts the sqlite3 connections it opens."""
+
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.opened.append(connection)
+        return connection
+
+
+@pytest.fixture(name="connect")
+def fixture_connect():
+    """Connection factory, with every registered pool closed afterwards"""
+    yield CountingConnect()
+    close_cds_connection_pools()
+
+
+def test_read_cds_query_odbc_reuses_pooled_connection(connect):
+    """Test to check repeated queries against a server use a single connection"""
+    set_cds_connection_pool("test-server", CdsConnectionPool(connect))
+
+    for _ in range(3):
+        df = read_cds_query_odbc("SELECT 1 AS value", "test-server")
+
+    assert df["value"].to_list() == [1]
+    assert len(connect.opened) == 1
+
+
+def test_connection_pool_replaces_unhealthy_connection(connect):
+    """Test to check a connection which fails its health check is not reused"""
+    pool = CdsConnectionPool(connect)
+    with pool.connection() as connection:
+        first_connection = connection
+    first_connection.close()
+
+    with pool.connection() as connection:
+        assert connection is not first_connection
+
+    assert len(connect.opened) == 2
+
+
+def test_connection_pool_closes_idle_connections(connect):
+    """Test to check connections idle for longer than idle_timeout_seconds are closed"""
+    pool = CdsConnectionPool(connect, idle_timeout_seconds=0.01)
+    with pool.connection():
+        pass
+    time.sleep(0.02)
+
+    with pool.connection():
+        pass
+
+    assert len(connect.opened) == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        connect.opened[0].execute("SELECT 1")
+
+
+def test_connection_pool_opens_no_more_than_max_size_connections(connect):
+    """Test to check concurrently borrowed connections are limited to max_size"""
+    pool = CdsConnectionPool(connect, max_size=2)
+    with pool.connection(), pool.connection():
+        assert not pool._available.acquire(  # pylint: disable=protected-access
+            blocking=False
+        )
+
+    assert pool.idle_count == 2
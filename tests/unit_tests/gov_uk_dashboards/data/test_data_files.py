@@ -0,0 +1,112 @@
+"""Test write_data_file and load_data_file round trip data in each file format"""
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.data.data_files import (
+    get_data_file_format,
+    load_data_file,
+    write_data_file,
+    write_data_file_in_batches,
+)
+
+TEST_DF = pl.DataFrame(
+    {
+        MEASURE: ["Measure 1", "Measure 2", "Measure 3"],
+        VALUE: [1, 2, 3],
+        DATE_VALID: ["2023-10-12", "2023-11-15", "2023-12-25"],
+    }
+).with_columns(pl.col(VALUE).cast(pl.Int16))
+
+
+@pytest.mark.parametrize(
+    "filename, expected_file_format",
+    [
+        ("extract.csv", "csv"),
+        ("extract.parquet", "parquet"),
+        ("extract.arrow", "ipc"),
+        ("extract.feather", "ipc"),
+    ],
+)
+def test_get_data_file_format_returns_format_from_suffix(
+    filename, expected_file_format
+):
+    """Test to check the file format is inferred from the file suffix"""
+    assert get_data_file_format(filename) == expected_file_format
+
+
+def test_get_data_file_format_raises_for_unknown_suffix():
+    """Test to check an unknown suffix raises a ValueError"""
+    with pytest.raises(ValueError):
+        get_data_file_format("extract.xlsx")
+
+
+@pytest.mark.parametrize("filename", ["extract.parquet", "extract.arrow"])
+def test_load_data_file_preserves_dtypes_for_columnar_formats(tmp_path, filename):
+    """Test to check Parquet and Arrow IPC files load with the dtypes they were written with"""
+    path = tmp_path / filename
+    write_data_file(TEST_DF, path)
+
+    assert load_data_file(path).equals(TEST_DF)
+    assert load_data_file(path).schema == TEST_DF.schema
+
+
+@pytest.mark.parametrize(
+    "filename", ["extract.csv", "extract.parquet", "extract.arrow"]
+)
+def test_load_data_file_returns_lazy_frame_when_lazy(tmp_path, filename):
+    """Test to check a LazyFrame is returned when lazy is True"""
+    path = tmp_path / filename
+    write_data_file(TEST_DF, path)
+
+    lazy_df = load_data_file(path, lazy=True)
+
+    assert isinstance(lazy_df, pl.LazyFrame)
+    assert lazy_df.collect()[MEASURE].to_list() == TEST_DF[MEASURE].to_list()
+
+
+def test_write_data_file_does_not_leave_temporary_file(tmp_path):
+    """Test to check the temporary file is moved into place"""
+    path = tmp_path / "extract.parquet"
+    write_data_file(TEST_DF, path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["extract.parquet"]
+
+
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_load_data_file_reads_batched_ipc_file(tmp_path, memory_map):
+    """Test to check an Arrow IPC file written in batches loads with or without memory
+    mapping"""
+    path = tmp_path / "extract.arrow"
+    write_data_file_in_batches(TEST_DF.iter_slices(n_rows=2), path)
+
+    assert load_data_file(path, memory_map=memory_map).equals(TEST_DF)
+
+
+def test_load_data_file_reads_compressed_ipc_file(tmp_path):
+    """Test to check a compressed Arrow IPC file is read without memory mapping"""
+    path = tmp_path / "extract.arrow"
+    write_data_file(TEST_DF, path, ipc_compression="zstd")
+
+    assert load_data_file(path, memory_map=False).equals(TEST_DF)
+
+
+@pytest.mark.parametrize("filename", ["extract.parquet", "extract.arrow"])
+def test_write_data_file_in_batches_promotes_columns_null_in_first_batch(
+    tmp_path, filename
+):
+    """Test to check a column with only nulls in the first batches takes the type of a
+    later batch"""
+    path = tmp_path / filename
+    batches = [
+        TEST_DF.head(1).with_columns(pl.lit(None).alias(VALUE)),
+        TEST_DF.slice(1, 1).with_columns(pl.lit(None).alias(VALUE)),
+        TEST_DF.tail(1),
+    ]
+
+    write_data_file_in_batches(batches, path)
+
+    df = load_data_file(path)
+    assert df.schema == TEST_DF.schema
+    assert df[VALUE].to_list() == [None, None, 3]
+    assert df[MEASURE].to_list() == TEST_DF[MEASURE].to_list()
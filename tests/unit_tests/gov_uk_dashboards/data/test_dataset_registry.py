@@ -0,0 +1,157 @@
+"""Test DatasetRegistry caches loaded files and evicts the least recently used"""
+
+import os
+import time
+
+import polars as pl
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import dataset_registry
+from gov_uk_dashboards.data.dataset_registry import DatasetRegistry
+
+TEST_DF = pl.DataFrame(
+    {MEASURE: ["Measure 1", "Measure 2", "Measure 3"], VALUE: [1, 2, 3]}
+)
+
+
+def _write_files(tmp_path, count):
+    paths = [tmp_path / f"extract_{i}.parquet" for i in range(count)]
+    for path in paths:
+        TEST_DF.write_parquet(path)
+    return paths
+
+
+def test_get_dataset_returns_cached_frame(tmp_path):
+    """Test to check a file is only loaded once"""
+    (path,) = _write_files(tmp_path, 1)
+    registry = DatasetRegistry()
+
+    first_df = registry.get_dataset(path)
+    second_df = registry.get_dataset(str(path))
+
+    assert first_df is second_df
+    assert first_df.equals(TEST_DF)
+    assert registry.get_stats()["hits"] == 1
+    assert registry.get_stats()["misses"] == 1
+
+
+def test_get_dataset_caches_lazy_and_eager_frames_separately(tmp_path):
+    """Test to check a LazyFrame is returned when lazy is True, even if the eager frame is
+    cached"""
+    (path,) = _write_files(tmp_path, 1)
+    registry = DatasetRegistry()
+
+    registry.get_dataset(path)
+
+    assert isinstance(registry.get_dataset(path, lazy=True), pl.LazyFrame)
+    assert registry.get_stats()["misses"] == 2
+
+
+def test_get_dataset_evicts_least_recently_used_over_budget(tmp_path):
+    """Test to check the least recently used frame is evicted once over budget"""
+    paths = _write_files(tmp_path, 3)
+    registry = DatasetRegistry(memory_budget_bytes=2 * TEST_DF.estimated_size())
+
+    first_df = registry.get_dataset(paths[0])
+    registry.get_dataset(paths[1])
+    registry.get_dataset(paths[0])
+    registry.get_dataset(paths[2])
+
+    assert registry.get_stats()["evictions"] == 1
+    assert registry.get_stats()["datasets"] == 2
+    assert registry.get_dataset(paths[0]) is first_df
+    assert registry.get_stats()["misses"] == 3
+
+
+def test_reload_changed_datasets_swaps_in_rewritten_file(tmp_path):
+    """Test to check a rewritten file is reloaded and unchanged files are not"""
+    paths = _write_files(tmp_path, 2)
+    registry = DatasetRegistry()
+    registry.get_dataset(paths[0])
+    unchanged_df = registry.get_dataset(paths[1])
+
+    TEST_DF.with_columns(pl.col(VALUE) * 2).write_parquet(paths[0])
+    os.utime(paths[0], ns=(0, 0))
+
+    assert registry.reload_changed_datasets() == [os.path.abspath(paths[0])]
+    assert registry.get_dataset(paths[0])[VALUE].to_list() == [2, 4, 6]
+    assert registry.get_dataset(paths[1]) is unchanged_df
+    assert registry.get_stats()["reloads"] == 1
+    assert registry.get_stats()["misses"] == 2
+
+
+def test_reload_changed_datasets_keeps_frame_while_file_is_missing(tmp_path):
+    """Test to check the cached frame is still served if the file has been removed"""
+    (path,) = _write_files(tmp_path, 1)
+    registry = DatasetRegistry()
+    df = registry.get_dataset(path)
+
+    os.remove(path)
+
+    assert not registry.reload_changed_datasets()
+    assert registry.get_dataset(path) is df
+
+
+def test_reload_changed_datasets_keeps_frame_when_reload_fails(tmp_path, monkeypatch):
+    """Test to check a file which fails to load keeps its cached frame, and the other
+    files are still reloaded"""
+    paths = _write_files(tmp_path, 2)
+    registry = DatasetRegistry()
+    df = registry.get_dataset(paths[0])
+    registry.get_dataset(paths[1])
+    load_data_file = dataset_registry.load_data_file
+
+    def _load_data_file(**load_kwargs):
+        if load_kwargs["path"] == os.path.abspath(paths[0]):
+            raise pl.exceptions.InvalidOperationError("conversion failed")
+        return load_data_file(**load_kwargs)
+
+    monkeypatch.setattr(dataset_registry, "load_data_file", _load_data_file)
+    for path in paths:
+        TEST_DF.with_columns(pl.col(VALUE) * 2).write_parquet(path)
+        os.utime(path, ns=(0, 0))
+
+    assert registry.reload_changed_datasets() == [os.path.abspath(paths[1])]
+    assert registry.get_dataset(paths[0]) is df
+    assert registry.get_dataset(paths[1])[VALUE].to_list() == [2, 4, 6]
+
+
+def test_auto_reload_keeps_running_after_failed_reload(monkeypatch):
+    """Test to check the auto reload thread carries on after a reload raises"""
+    registry = DatasetRegistry()
+    calls = []
+
+    def _reload_changed_datasets():
+        calls.append(None)
+        if len(calls) == 1:
+            raise pl.exceptions.InvalidOperationError("conversion failed")
+        return []
+
+    monkeypatch.setattr(registry, "reload_changed_datasets", _reload_changed_datasets)
+    registry.start_auto_reload(interval_seconds=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_auto_reload()
+
+    assert len(calls) >= 2
+
+
+def test_auto_reload_picks_up_rewritten_file(tmp_path):
+    """Test to check the auto reload thread reloads a rewritten file"""
+    (path,) = _write_files(tmp_path, 1)
+    registry = DatasetRegistry()
+    registry.get_dataset(path)
+
+    TEST_DF.with_columns(pl.col(VALUE) * 2).write_parquet(path)
+    os.utime(path, ns=(0, 0))
+    registry.start_auto_reload(interval_seconds=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while registry.get_stats()["reloads"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_auto_reload()
+
+    assert registry.get_dataset(path)[VALUE].to_list() == [2, 4, 6]
@@ -0,0 +1,150 @@
+"""Test unchanged extracts are detected from the extract manifest and not rewritten"""
+
+import os
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.extract_manifest import (
+    ExtractHasher,
+    get_extract_manifest_entry,
+    read_extract_manifest,
+)
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+TEST_DF = pl.DataFrame(
+    {MEASURE: ["Measure 1", "Measure 2", "Measure 3"], VALUE: [1, 2, 3]}
+)
+
+
+@pytest.fixture(name="query_result")
+def fixture_query_result(monkeypatch):
+    """Replace the CDS read with one returning query_result["df"]"""
+    query_result = {"df": TEST_DF}
+    monkeypatch.setattr(
+        get_data,
+        "read_cds_query_odbc",
+        lambda query, server, parameters=None: query_result["df"],
+    )
+    return query_result
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path):
+    """Query class writing to a temporary directory"""
+
+    class TestQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path)
+        server = "test-server"
+        file_format = "parquet"
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    return TestQuery()
+
+
+def test_get_data_from_cds_does_not_rewrite_unchanged_extract(
+    query, query_result
+):  # pylint: disable=unused-argument
+    """Test to check the file is left untouched when the data has not changed"""
+    query.get_data_from_cds()
+    os.utime(query.get_file_location(), ns=(0, 0))
+
+    query.get_data_from_cds()
+
+    assert query.extract_status == "unchanged"
+    assert os.stat(query.get_file_location()).st_mtime_ns == 0
+
+
+def test_get_data_from_cds_rewrites_changed_extract(query, query_result):
+    """Test to check the file and manifest are updated when the data has changed"""
+    query.get_data_from_cds()
+    query_result["df"] = TEST_DF.with_columns(pl.col(VALUE) * 2)
+
+    query.get_data_from_cds()
+
+    assert query.extract_status == "updated"
+    assert query.load_data()[VALUE].to_list() == [2, 4, 6]
+    assert read_extract_manifest(query.dir)[query.filename]["hash"] == (
+        get_extract_manifest_entry(query_result["df"])["hash"]
+    )
+
+
+@pytest.mark.parametrize(
+    "write_option, value",
+    [("partition_by", [MEASURE]), ("parquet_compression", "snappy")],
+)
+def test_get_data_from_cds_rewrites_extract_when_write_options_change(
+    query, query_result, write_option, value
+):  # pylint: disable=unused-argument
+    """Test to check unchanged data is rewritten when the way it is written changes"""
+    query.get_data_from_cds()
+
+    setattr(query, write_option, value)
+    query.get_data_from_cds()
+
+    assert query.extract_status == "updated"
+    assert (
+        read_extract_manifest(query.dir)[query.filename]["write_options"][
+            "partition_by" if write_option == "partition_by" else "compression"
+        ]
+        == value
+    )
+    assert os.path.isdir(query.get_file_location()) == (write_option == "partition_by")
+
+
+def test_get_data_from_cds_rewrites_missing_extract(
+    query, query_result
+):  # pylint: disable=unused-argument
+    """Test to check the file is written if it is missing, even if the manifest matches"""
+    query.get_data_from_cds()
+    os.remove(query.get_file_location())
+
+    query.get_data_from_cds()
+
+    assert query.extract_status == "updated"
+    assert os.path.exists(query.get_file_location())
+
+
+def test_extract_hasher_does_not_depend_on_batches():
+    """Test to check the hash is the same however the rows are split into batches"""
+    hasher = ExtractHasher()
+    for batch in TEST_DF.iter_slices(n_rows=2):
+        hasher.update(batch)
+
+    assert hasher.get_manifest_entry() == get_extract_manifest_entry(TEST_DF)
+
+
+def test_extract_hasher_hashes_nested_and_binary_columns():
+    """Test to check columns which cannot be written as CSV are hashed, batch by batch"""
+    df = TEST_DF.with_columns(
+        pl.Series("List", [[1], None, [2, 3]]),
+        pl.Series("Struct", [{"a": 1}, {"a": 2}, None]),
+        pl.Series("Binary", [b"a", b"b", b"c"]),
+    )
+    hasher = ExtractHasher()
+    for batch in df.iter_slices(n_rows=2):
+        hasher.update(batch)
+
+    assert hasher.get_manifest_entry() == get_extract_manifest_entry(df)
+    assert (
+        hasher.get_manifest_entry()["hash"]
+        != get_extract_manifest_entry(
+            df.with_columns(pl.col("List").list.eval(pl.element() + 1))
+        )["hash"]
+    )
+
+
+def test_get_extract_manifest_entry_depends_on_schema():
+    """Test to check a change of column type changes the hash"""
+    assert get_extract_manifest_entry(TEST_DF)["hash"] != (
+        get_extract_manifest_entry(TEST_DF.with_columns(pl.col(VALUE).cast(pl.Int32)))[
+            "hash"
+        ]
+    )
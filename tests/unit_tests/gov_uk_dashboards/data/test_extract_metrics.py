@@ -0,0 +1,137 @@
+"""Test GenericDataQuery records and emits metrics for each extract"""
+
+import json
+import logging
+import os
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.extract_metrics import (
+    ExtractMetrics,
+    format_extract_metrics_table,
+    get_schema_fingerprint,
+)
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+TEST_DF = pl.DataFrame(
+    {MEASURE: ["Measure 1", "Measure 2", "Measure 3"], VALUE: [1, 2, 3]}
+)
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path, monkeypatch):
+    """Query class writing TEST_DF to a temporary directory"""
+    monkeypatch.setattr(
+        get_data, "read_cds_query_odbc", lambda query, server, parameters=None: TEST_DF
+    )
+
+    class TestQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path)
+        server = "test-server"
+        file_format = "parquet"
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    return TestQuery()
+
+
+def test_get_data_from_cds_records_metrics(query, tmp_path, monkeypatch):
+    """Test to check the metrics describe the extract and are appended to
+    EXTRACT_METRICS_PATH as a JSON line"""
+    metrics_path = tmp_path / "metrics.jsonl"
+    monkeypatch.setenv("EXTRACT_METRICS_PATH", str(metrics_path))
+
+    query.get_data_from_cds()
+
+    metrics = query.metrics
+    assert metrics.mode == "full"
+    assert metrics.status == "updated"
+    assert metrics.rows == 3
+    assert metrics.bytes_written == os.path.getsize(query.get_file_location())
+    assert metrics.schema_fingerprint == get_schema_fingerprint(
+        {MEASURE: "String", VALUE: "Int64"}
+    )
+    assert metrics.total_seconds >= metrics.query_seconds + metrics.write_seconds
+    assert json.loads(metrics_path.read_text(encoding="utf-8")) == json.loads(
+        metrics.to_json()
+    )
+
+
+def test_get_data_from_cds_records_peak_memory_increase_of_extract(query, monkeypatch):
+    """Test to check the peak memory recorded is the rise during the extract, not the
+    process peak"""
+    peak_memory = iter([1000 * 1024 * 1024, 1500 * 1024 * 1024])
+    monkeypatch.setattr(get_data, "get_peak_memory_bytes", lambda: next(peak_memory))
+
+    query.get_data_from_cds()
+
+    assert query.metrics.peak_memory_increase_bytes == 500 * 1024 * 1024
+
+
+def test_get_data_from_cds_logs_metrics(query, caplog):
+    """Test to check the metrics are logged as a JSON line"""
+    with caplog.at_level(logging.INFO):
+        query.get_data_from_cds()
+
+    assert query.metrics.to_json() in caplog.messages
+
+
+def test_get_data_from_cds_records_no_write_for_unchanged_extract(query):
+    """Test to check nothing is reported as written when the extract is unchanged"""
+    query.get_data_from_cds()
+
+    query.get_data_from_cds()
+
+    assert query.metrics.status == "unchanged"
+    assert query.metrics.write_seconds == 0
+    assert query.metrics.bytes_written == 0
+    assert query.metrics.rows == 3
+
+
+def test_get_data_from_cds_records_streamed_metrics(tmp_path, cds_database):
+    """Test to check a streamed extract reports its mode and total rows"""
+    cds_database.create_table(
+        "extract", [MEASURE, VALUE], [(f"Measure {i}", i) for i in range(5)]
+    )
+
+    class StreamingQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.csv"
+        dir = str(tmp_path / "data")
+        server = "test-server"
+        batch_size = 2
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    query = StreamingQuery()
+    query.get_data_from_cds()
+
+    assert query.metrics.mode == "streamed"
+    assert query.metrics.rows == 5
+    assert query.metrics.query_seconds > 0
+
+
+def test_format_extract_metrics_table_lists_slowest_first():
+    """Test to check the table has a header and a row per extract, slowest first"""
+    table = format_extract_metrics_table(
+        [
+            ExtractMetrics("fast.csv", "test-server", total_seconds=1, rows=1000),
+            ExtractMetrics("slow.csv", "test-server", total_seconds=5),
+        ]
+    )
+
+    lines = table.splitlines()
+    assert lines[0].startswith("Extract")
+    assert lines[1].startswith("slow.csv")
+    assert lines[2].startswith("fast.csv")
+    assert "1,000" in lines[2]
@@ -0,0 +1,170 @@
+"""Test GenericDataQuery only pulls new rows when watermark_column is set, using sqlite3 as a
+stand-in for CDS"""
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+
+@pytest.fixture(name="database")
+def fixture_database(cds_database):
+    """Connection to the "test-server" CDS database, with an extract table"""
+    cds_database.create_table(
+        "extract",
+        [MEASURE, VALUE, DATE_VALID],
+        [("Measure 1", 1, "2024-01-01"), ("Measure 1", 2, "2024-02-01")],
+    )
+    return cds_database.connection
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path):
+    """Incremental query against the extract table"""
+
+    class IncrementalQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path / "data")
+        server = "test-server"
+        file_format = "parquet"
+        watermark_column = DATE_VALID
+        unique_key = [MEASURE, DATE_VALID]
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    return IncrementalQuery()
+
+
+@pytest.fixture(name="read_queries")
+def fixture_read_queries(monkeypatch):
+    """Record the SQL text of every query sent to CDS"""
+    read_queries = []
+    read_cds_query_odbc = get_data.read_cds_query_odbc
+
+    def recording_read(query, server, parameters=None):
+        read_queries.append(query)
+        return read_cds_query_odbc(query, server, parameters=parameters)
+
+    monkeypatch.setattr(get_data, "read_cds_query_odbc", recording_read)
+    return read_queries
+
+
+def test_get_data_from_cds_appends_only_new_rows(database, query, read_queries):
+    """Test to check the second run only queries for and appends rows after the watermark"""
+    query.get_data_from_cds()
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?)", ("Measure 1", 3, "2024-03-01")
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+
+    assert "incremental_query" not in read_queries[0]
+    assert "incremental_query" in read_queries[1]
+    assert query.load_data()[VALUE].to_list() == [1, 2, 3]
+
+
+def test_get_data_from_cds_runs_full_refresh_when_columns_change(
+    database, query, read_queries
+):
+    """Test to check a change to the query's columns triggers a full refresh"""
+    query.get_data_from_cds()
+    database.execute("ALTER TABLE extract ADD COLUMN [Region]")
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?, ?)",
+        ("Measure 1", 3, "2024-03-01", "London"),
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+
+    assert "incremental_query" not in read_queries[-1]
+    assert query.load_data()["Region"].to_list() == [None, None, "London"]
+
+
+def test_get_data_from_cds_runs_full_query_when_full_refresh(
+    database, query, read_queries
+):  # pylint: disable=unused-argument
+    """Test to check full_refresh skips the incremental query"""
+    query.get_data_from_cds()
+    query.get_data_from_cds(full_refresh=True)
+
+    assert all("incremental_query" not in sql for sql in read_queries)
+    assert query.load_data().height == 2
+
+
+def test_get_data_from_cds_deduplicates_on_unique_key(database, query):
+    """Test to check rows are deduplicated on unique_key, keeping the newest"""
+    query.get_data_from_cds()
+    existing_df = query.load_data()
+    duplicated_df = pl.concat(
+        [existing_df, existing_df.with_columns(pl.lit(5, dtype=pl.Int64).alias(VALUE))]
+    )
+    duplicated_df.write_parquet(query.get_file_location())
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?)", ("Measure 1", 3, "2024-03-01")
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+
+    # the row at the watermark is pulled from CDS again, so is the newest
+    assert query.load_data()[VALUE].to_list() == [5, 2, 3]
+
+
+def test_get_data_from_cds_runs_full_refresh_when_types_change(
+    database, query, read_queries
+):
+    """Test to check new rows which would only fit the local types by a lossy cast, such as
+    a float in an integer column, trigger a full refresh"""
+    query.get_data_from_cds()
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?)", ("Measure 1", 3.7, "2024-03-01")
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+
+    assert "incremental_query" in read_queries[1]
+    assert "incremental_query" not in read_queries[2]
+    assert query.load_data()[VALUE].to_list() == [1, 2, 3.7]
+
+
+def test_get_data_from_cds_pulls_rows_arriving_late_at_watermark(database, query):
+    """Test to check rows arriving after an extract with the latest date already extracted
+    are pulled, without duplicating the rows already extracted for that date"""
+    query.get_data_from_cds()
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?)", ("Measure 2", 4, "2024-02-01")
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+
+    assert query.load_data().rows() == [
+        ("Measure 1", 1, "2024-01-01"),
+        ("Measure 1", 2, "2024-02-01"),
+        ("Measure 2", 4, "2024-02-01"),
+    ]
+
+
+def test_get_data_from_cds_replaces_rows_at_watermark_without_unique_key(
+    database, query
+):
+    """Test to check rows at the watermark are not duplicated when there is no unique_key"""
+    query.unique_key = None
+    query.get_data_from_cds()
+    database.execute(
+        "INSERT INTO extract VALUES (?, ?, ?)", ("Measure 2", 4, "2024-02-01")
+    )
+    database.commit()
+
+    query.get_data_from_cds()
+    query.get_data_from_cds()
+
+    assert query.load_data()[VALUE].to_list() == [1, 2, 4]
@@ -0,0 +1,82 @@
+"""Test the local synthetic SQLite backend serves GenericDataQuery extracts offline"""
+
+import sqlite3
+
+import pytest
+from gov_uk_dashboards.constants import MEASURE
+from gov_uk_dashboards.data.get_data import (
+    CdsConnectionPool,
+    GenericDataQuery,
+    QueryFilter,
+    close_cds_connection_pools,
+    get_cds_connection_pool,
+    read_cds_query_odbc,
+    set_cds_connection_pool,
+)
+from gov_uk_dashboards.data.local_backend import (
+    SYNTHETIC_TABLE_NAME,
+    get_synthetic_data,
+    local_cds_backend,
+)
+
+
+def test_get_synthetic_data_is_reproducible():
+    """Test to check the same seed gives the same data"""
+    assert get_synthetic_data(100, seed=1).equals(get_synthetic_data(100, seed=1))
+    assert not get_synthetic_data(100, seed=1).equals(get_synthetic_data(100, seed=2))
+
+
+def test_local_cds_backend_serves_filtered_streamed_extract(tmp_path):
+    """Test to check a filtered, streamed extract runs against the synthetic database"""
+
+    class LocalQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path)
+        server = "local-cds"
+        file_format = "parquet"
+        batch_size = 100
+
+        def query(self):
+            """Return the query text."""
+            return f"SELECT * FROM {SYNTHETIC_TABLE_NAME}"
+
+    with local_cds_backend("local-cds", rows=1000):
+        query = LocalQuery().with_filter(QueryFilter(measures=["Measure 1"]))
+        query.get_data_from_cds()
+
+    synthetic_df = get_synthetic_data(1000)
+    expected_df = synthetic_df.filter(synthetic_df[MEASURE] == "Measure 1")
+    assert query.load_data().equals(expected_df)
+
+
+def test_local_cds_backend_is_read_only():
+    """Test to check queries cannot modify the synthetic database"""
+    with local_cds_backend("local-cds", rows=10):
+        query = f"SELECT COUNT(*) AS row_count FROM {SYNTHETIC_TABLE_NAME}"
+        assert read_cds_query_odbc(query, "local-cds").item() == 10
+        with get_cds_connection_pool("local-cds").connection() as connection:
+            with pytest.raises(sqlite3.OperationalError):
+                connection.execute(f"DELETE FROM {SYNTHETIC_TABLE_NAME}")
+
+
+def test_local_cds_backend_leaves_other_servers_pools_open():
+    """Test to check only the local backend's pool is closed on exit"""
+    connections = []
+
+    def connect():
+        connections.append(sqlite3.connect(":memory:", check_same_thread=False))
+        return connections[-1]
+
+    other_pool = CdsConnectionPool(connect)
+    set_cds_connection_pool("other-server", other_pool)
+    read_cds_query_odbc("SELECT 1 AS x", "other-server")
+
+    with local_cds_backend("local-cds", rows=10):
+        local_pool = get_cds_connection_pool("local-cds")
+
+    assert get_cds_connection_pool("other-server") is other_pool
+    assert get_cds_connection_pool("local-cds") is not local_pool
+    assert connections[0].execute("SELECT 1").fetchall() == [(1,)]
+    close_cds_connection_pools()
@@ -0,0 +1,142 @@
+"""Test GenericDataQuery writes Hive partitioned extracts when partition_by is set, and
+load_data only reads the partitions matching its filters"""
+
+import os
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import AREA_CODE, MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.data_files import (
+    load_data_file,
+    write_data_file,
+    write_data_file_in_batches,
+)
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+TEST_DF = pl.DataFrame(
+    {
+        MEASURE: ["Measure 1", "Measure 2", "Measure 1", "Measure/3"],
+        AREA_CODE: ["E06000001", "E06000001", "E06000002", "E06000001"],
+        VALUE: [1, 2, 3, 4],
+    }
+).with_columns(pl.col(MEASURE).cast(pl.Categorical()))
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path, monkeypatch):
+    """Query class writing an extract partitioned by measure"""
+    monkeypatch.setattr(
+        get_data, "read_cds_query_odbc", lambda query, server, parameters=None: TEST_DF
+    )
+
+    class PartitionedQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path)
+        server = "test-server"
+        file_format = "parquet"
+        partition_by = [MEASURE]
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    return PartitionedQuery()
+
+
+def test_get_data_from_cds_writes_a_directory_per_partition(query):
+    """Test to check each measure is written to its own directory, and the data round trips
+    with its column order and types"""
+    query.get_data_from_cds()
+
+    assert sorted(os.listdir(query.get_file_location())) == [
+        "measure=Measure%201",
+        "measure=Measure%202",
+        "measure=Measure%2F3",
+    ]
+    assert query.load_data().sort(VALUE).equals(TEST_DF)
+
+
+def test_load_data_only_reads_matching_partitions(query):
+    """Test to check files of other partitions are not read when filtering on the
+    partition column"""
+    query.get_data_from_cds()
+    partition_path = os.path.join(query.get_file_location(), "measure=Measure%202")
+    for filename in os.listdir(partition_path):
+        with open(os.path.join(partition_path, filename), "wb") as file:
+            file.write(b"not a parquet file")
+
+    df = query.load_data(filters={MEASURE: "Measure 1"})
+
+    assert df[VALUE].to_list() == [1, 3]
+
+
+@pytest.mark.parametrize(
+    "partition_type",
+    [pl.Categorical(), pl.Enum(["Measure 1", "Measure 2", "Measure/3"])],
+)
+def test_load_data_file_only_reads_matching_partitions_with_schema(
+    tmp_path, partition_type
+):
+    """Test to check filters still skip other partitions when schema casts the partition
+    column to a different type from the one it was written with"""
+    path = tmp_path / "extract.parquet"
+    write_data_file(
+        TEST_DF.with_columns(pl.col(MEASURE).cast(pl.String)),
+        path,
+        partition_by=[MEASURE],
+    )
+    partition_path = path / "measure=Measure%202"
+    for filename in os.listdir(partition_path):
+        (partition_path / filename).write_bytes(b"not a parquet file")
+
+    df = load_data_file(
+        path, schema={MEASURE: partition_type}, filters={MEASURE: "Measure 1"}
+    )
+
+    assert df[VALUE].to_list() == [1, 3]
+    assert df.schema[MEASURE] == partition_type
+
+
+def test_get_data_from_cds_replaces_existing_partitions(query, monkeypatch):
+    """Test to check a rewrite removes partitions which no longer have any rows"""
+    query.get_data_from_cds()
+    monkeypatch.setattr(
+        get_data,
+        "read_cds_query_odbc",
+        lambda query, server, parameters=None: TEST_DF.head(1),
+    )
+
+    query.get_data_from_cds()
+
+    assert os.listdir(query.get_file_location()) == ["measure=Measure%201"]
+    assert not os.path.exists(f"{query.get_file_location()}.old")
+
+
+def test_write_data_file_in_batches_matches_write_data_file_layout(tmp_path):
+    """Test to check batched and whole partitioned writes give the same directories and
+    data"""
+    batched_path = tmp_path / "batched.parquet"
+    whole_path = tmp_path / "whole.parquet"
+
+    write_data_file_in_batches(
+        TEST_DF.iter_slices(n_rows=2), batched_path, partition_by=[MEASURE, AREA_CODE]
+    )
+    write_data_file(TEST_DF, whole_path, partition_by=[MEASURE, AREA_CODE])
+
+    for root, _, _ in os.walk(whole_path):
+        assert os.path.isdir(batched_path / os.path.relpath(root, whole_path))
+    filters = {AREA_CODE: ["E06000001"]}
+    assert (
+        load_data_file(batched_path, filters=filters)
+        .sort(VALUE)
+        .equals(load_data_file(whole_path, filters=filters).sort(VALUE))
+    )
+
+
+def test_write_data_file_raises_for_partitioned_csv(tmp_path):
+    """Test to check partition_by raises a ValueError for formats other than Parquet"""
+    with pytest.raises(ValueError):
+        write_data_file(TEST_DF, tmp_path / "extract.csv", partition_by=[MEASURE])
@@ -0,0 +1,126 @@
+"""Test read_cds_query_odbc reuses cached results within the TTL, using sqlite3 as a
+stand-in for CDS"""
+
+import os
+import time
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import query_cache
+from gov_uk_dashboards.data.get_data import (
+    CdsConnectionPool,
+    read_cds_query_odbc,
+    set_cds_connection_pool,
+    set_query_result_cache,
+)
+from gov_uk_dashboards.data.query_cache import QueryResultCache
+
+QUERY = f"SELECT * FROM extract WHERE [{VALUE}] > ?"
+
+
+@pytest.fixture(name="connections")
+def fixture_connections(cds_database):
+    """Connections opened to the "test-server" CDS database, which has an extract table"""
+    cds_database.create_table(
+        "extract", [MEASURE, VALUE], [(f"Measure {i}", i) for i in range(3)]
+    )
+    # An idle timeout of 0 closes returned connections, so each query connects.
+    set_cds_connection_pool(
+        "test-server", CdsConnectionPool(cds_database.connect, idle_timeout_seconds=0)
+    )
+    yield cds_database.connections
+    set_query_result_cache(None)
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path):
+    """Query result cache used by read_cds_query_odbc"""
+    cache = QueryResultCache(str(tmp_path / "cache"), ttl_seconds=60)
+    set_query_result_cache(cache)
+    return cache
+
+
+def test_read_cds_query_odbc_reuses_cached_result(connections, cache):
+    """Test to check a repeated query is answered from the cache"""
+    first_df = read_cds_query_odbc(QUERY, "test-server", parameters=[0])
+    second_df = read_cds_query_odbc(QUERY, "test-server", parameters=[0])
+
+    assert len(connections) == 1
+    assert second_df.equals(first_df)
+    assert len(os.listdir(cache.directory)) == 1
+
+
+def test_read_cds_query_odbc_does_not_share_results_between_parameters(
+    connections, cache
+):  # pylint: disable=unused-argument
+    """Test to check different parameters are cached separately"""
+    read_cds_query_odbc(QUERY, "test-server", parameters=[0])
+
+    df = read_cds_query_odbc(QUERY, "test-server", parameters=[1])
+
+    assert df[VALUE].to_list() == [2]
+    assert len(connections) == 2
+
+
+def test_read_cds_query_odbc_returns_result_which_cannot_be_cached(
+    connections, cache, monkeypatch, caplog
+):  # pylint: disable=unused-argument
+    """Test to check a failure to write the cache is logged and the result still
+    returned"""
+
+    def fail_write(*args, **kwargs):
+        raise OSError("Read-only file system")
+
+    monkeypatch.setattr(query_cache, "write_data_file", fail_write)
+
+    df = read_cds_query_odbc(QUERY, "test-server", parameters=[0])
+
+    assert df[VALUE].to_list() == [1, 2]
+    assert "Could not cache query result" in caplog.messages
+    assert not os.listdir(cache.directory)
+
+
+def test_query_result_cache_put_removes_partly_written_file(tmp_path):
+    """Test to check a result which cannot be written as Arrow IPC raises and leaves no
+    file behind"""
+    cache = QueryResultCache(str(tmp_path))
+
+    with pytest.raises(Exception):
+        cache.put(QUERY, "test-server", None, pl.DataFrame({VALUE: [object()]}))
+
+    assert not os.listdir(tmp_path)
+
+
+def test_query_result_cache_expires_results_after_ttl(tmp_path):
+    """Test to check a result older than the TTL is not used"""
+    cache = QueryResultCache(str(tmp_path), ttl_seconds=60)
+    cache.put(QUERY, "test-server", None, pl.DataFrame({VALUE: [1]}))
+    path = os.path.join(tmp_path, cache.get_key(QUERY, "test-server") + ".arrow")
+    os.utime(path, (time.time(), time.time() - 120))
+
+    assert cache.get(QUERY, "test-server") is None
+    assert not os.path.exists(path)
+
+
+def test_query_result_cache_evicts_least_recently_used_over_size(tmp_path):
+    """Test to check the least recently used result is evicted once over the size cap"""
+    cache = QueryResultCache(str(tmp_path))
+    df = pl.DataFrame({VALUE: list(range(100))})
+    for i in range(2):
+        cache.put(f"SELECT {i}", "test-server", None, df)
+    paths = {
+        i: os.path.join(
+            tmp_path, cache.get_key(f"SELECT {i}", "test-server") + ".arrow"
+        )
+        for i in range(3)
+    }
+    os.utime(paths[0], (time.time() - 10, time.time()))
+    os.utime(paths[1], (time.time() - 20, time.time()))
+    cache.max_size_bytes = 2 * os.path.getsize(paths[0])
+
+    cache.put("SELECT 2", "test-server", None, df)
+
+    assert cache.get("SELECT 0", "test-server").equals(df)
+    assert cache.get("SELECT 1", "test-server") is None
+    assert cache.get("SELECT 2", "test-server").equals(df)
@@ -0,0 +1,100 @@
+"""Test QueryFilter renders projections and predicates into the SQL, using sqlite3 as a
+stand-in for CDS"""
+
+import datetime
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import AREA_CODE, DATE_VALID, MEASURE, VALUE
+from gov_uk_dashboards.data.get_data import GenericDataQuery, QueryFilter
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path, cds_database):
+    """Query against a sqlite3 database registered as the "test-server" CDS server"""
+    cds_database.create_table(
+        "extract",
+        [MEASURE, AREA_CODE, VALUE],
+        [
+            ("Measure 1", "E06000001", 1),
+            ("Measure 1", "E06000002", 2),
+            ("Measure 2", "E06000001", 3),
+            ("Measure 3", "E06000001", 4),
+        ],
+    )
+
+    class TestQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path / "data")
+        server = "test-server"
+        file_format = "parquet"
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract;"
+
+    return TestQuery()
+
+
+def test_with_filter_extracts_only_matching_rows_and_columns(query):
+    """Test to check only the filtered columns and rows are written"""
+    filtered_query = query.with_filter(
+        QueryFilter(
+            columns=[MEASURE, VALUE],
+            measures=["Measure 1", "Measure 2"],
+            area_codes=["E06000001"],
+        )
+    )
+
+    filtered_query.get_data_from_cds()
+
+    df = filtered_query.load_data()
+    assert df.columns == [MEASURE, VALUE]
+    assert df[VALUE].to_list() == [1, 3]
+
+
+def test_with_filter_only_applies_schema_to_selected_columns(query):
+    """Test to check a schema column left out of the filter's columns is not required, and
+    the selected columns keep their declared types"""
+    query.schema = {MEASURE: pl.Categorical(), VALUE: pl.Float64}
+    filtered_query = query.with_filter(QueryFilter(columns=[VALUE]))
+
+    filtered_query.get_data_from_cds()
+
+    df = filtered_query.load_data()
+    assert df.schema == {VALUE: pl.Float64}
+    assert query.schema == {MEASURE: pl.Categorical(), VALUE: pl.Float64}
+
+
+def test_with_filter_writes_each_filter_to_its_own_file(query):
+    """Test to check filtered extracts do not overwrite the full extract or each other, and
+    the same filter gives the same file"""
+    filename = query.with_filter(QueryFilter(measures=["Measure 1"])).filename
+
+    assert query.filename == "extract.parquet"
+    assert filename.startswith("extract_") and filename.endswith(".parquet")
+    assert filename == query.with_filter(QueryFilter(measures=["Measure 1"])).filename
+    assert filename != query.with_filter(QueryFilter(measures=["Measure 2"])).filename
+
+
+def test_query_filter_passes_values_as_parameters():
+    """Test to check values are bound as parameters and column names are quoted"""
+    sql, parameters = QueryFilter(
+        columns=["Value]; DROP TABLE extract; --"],
+        start_date=datetime.date(2024, 1, 1),
+        end_date=datetime.date(2024, 12, 31),
+    ).apply("SELECT * FROM extract")
+
+    assert sql == (
+        "SELECT [Value]]; DROP TABLE extract; --] FROM (SELECT * FROM extract) AS "
+        f"filtered_query WHERE [{DATE_VALID}] >= ? AND [{DATE_VALID}] <= ?"
+    )
+    assert parameters == [datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)]
+
+
+def test_query_filter_raises_for_empty_list():
+    """Test to check an empty list of measures raises a ValueError"""
+    with pytest.raises(ValueError):
+        QueryFilter(measures=[])
@@ -0,0 +1,59 @@
+"""Test full extracts can be read with polars' arrow-odbc reader rather than the pool"""
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.get_data import GenericDataQuery, read_cds_query_arrow_odbc
+
+TEST_DF = pl.DataFrame({MEASURE: ["Measure 1", "Measure 2"], VALUE: [1, 2]})
+
+
+@pytest.fixture(name="read_database_calls")
+def fixture_read_database_calls(monkeypatch):
+    """Record the arguments of every pl.read_database call, returning TEST_DF"""
+    monkeypatch.setenv("AZURE_SQL_SERVER_USER", "user")
+    monkeypatch.setenv("AZURE_SQL_SERVER_PASSWORD", "password")
+    calls = []
+
+    def read_database(query, connection, execute_options=None):
+        calls.append((query, connection, execute_options))
+        return TEST_DF
+
+    monkeypatch.setattr(get_data.pl, "read_database", read_database)
+    return calls
+
+
+def test_read_cds_query_arrow_odbc_uses_connection_string(read_database_calls):
+    """Test to check the query is passed to polars with an ODBC connection string, so
+    polars reads it with arrow-odbc"""
+    df = read_cds_query_arrow_odbc("SELECT * FROM extract WHERE x = ?", "server", [1])
+
+    query, connection, execute_options = read_database_calls[0]
+    assert df.equals(TEST_DF)
+    assert query == "SELECT * FROM extract WHERE x = ?"
+    assert connection == get_data.get_cds_odbc_connection_string("server")
+    assert execute_options == {"parameters": [1]}
+
+
+def test_get_data_from_cds_uses_arrow_odbc_when_set(read_database_calls, tmp_path):
+    """Test to check a full extract with arrow_odbc set is read with arrow-odbc"""
+
+    class ArrowOdbcQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = "extract.parquet"
+        dir = str(tmp_path)
+        server = "server"
+        file_format = "parquet"
+        arrow_odbc = True
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    query = ArrowOdbcQuery()
+    query.get_data_from_cds()
+
+    assert isinstance(read_database_calls[0][1], str)
+    assert query.load_data().equals(TEST_DF)
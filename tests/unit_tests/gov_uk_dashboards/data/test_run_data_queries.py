@@ -0,0 +1,98 @@
+"""Test run_data_queries runs queries concurrently and collects their results"""
+
+import threading
+import time
+
+import pytest
+import polars as pl
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+from gov_uk_dashboards.data.run_data_queries import (
+    DataQueryBatchError,
+    run_data_queries,
+)
+
+
+def _make_query(tmp_path, name, stats_release=False):
+    class TestQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        filename = f"{name}.csv"
+        dir = str(tmp_path)
+        server = "test-server"
+
+        def query(self):
+            """Return the query text."""
+            return name
+
+    TestQuery.stats_release = stats_release
+    return TestQuery()
+
+
+@pytest.fixture(name="concurrency")
+def fixture_concurrency(monkeypatch):
+    """Replace the CDS read with a slow stand-in and record peak concurrency"""
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fake_read(query, server, parameters=None):  # pylint: disable=unused-argument
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+        if query == "failing":
+            raise RuntimeError("query failed")
+        return pl.DataFrame({"query": [query]})
+
+    monkeypatch.setattr(get_data, "read_cds_query_odbc", fake_read)
+    return state
+
+
+def test_run_data_queries_limits_concurrency_and_collects_results(
+    tmp_path, concurrency
+):
+    """Test to check no more than max_workers queries run at once, and stats release
+    filenames are returned in query order"""
+    queries = [
+        _make_query(tmp_path, f"query_{i}", stats_release=i % 2 == 0) for i in range(6)
+    ]
+
+    result = run_data_queries(queries, max_workers=2)
+
+    assert concurrency["peak"] == 2
+    assert result.stats_release_filenames == [
+        "query_0.csv",
+        "query_2.csv",
+        "query_4.csv",
+    ]
+    assert set(result.query_seconds) == {query.filename for query in queries}
+    assert all(seconds > 0 for seconds in result.query_seconds.values())
+    assert (tmp_path / "query_5.csv").exists()
+
+
+def test_run_data_queries_raises_after_running_every_query(
+    tmp_path, concurrency
+):  # pylint: disable=unused-argument
+    """Test to check a failing query does not stop the others from running"""
+    queries = [_make_query(tmp_path, "failing"), _make_query(tmp_path, "working")]
+
+    with pytest.raises(DataQueryBatchError) as exc_info:
+        run_data_queries(queries, max_workers=1)
+
+    assert list(exc_info.value.batch_result.errors) == ["failing.csv"]
+    assert (tmp_path / "working.csv").exists()
+
+
+def test_run_data_queries_reports_unchanged_extracts(
+    tmp_path, concurrency
+):  # pylint: disable=unused-argument
+    """Test to check extracts whose data has not changed are reported as unchanged"""
+    run_data_queries([_make_query(tmp_path, "query_0")])
+
+    result = run_data_queries(
+        [_make_query(tmp_path, "query_0"), _make_query(tmp_path, "query_1")]
+    )
+
+    assert result.unchanged_filenames == ["query_0.csv"]
@@ -0,0 +1,95 @@
+"""Test GenericDataQuery streams the query to file in batches when batch_size is set, using
+sqlite3 as a stand-in for CDS"""
+
+import pytest
+import polars as pl
+import pyarrow.parquet
+from gov_uk_dashboards.constants import MEASURE, VALUE
+from gov_uk_dashboards.data import get_data
+from gov_uk_dashboards.data.data_files import write_data_file_in_batches
+from gov_uk_dashboards.data.get_data import GenericDataQuery
+
+
+@pytest.fixture(name="streaming_query")
+def fixture_streaming_query(tmp_path, monkeypatch, cds_database):
+    """Query class streaming five rows from a sqlite3 database two rows at a time"""
+    cds_database.create_table(
+        "extract", [MEASURE, VALUE], [(f"Measure {i}", i) for i in range(5)]
+    )
+
+    def fail_read(*args, **kwargs):
+        raise AssertionError("The full result should not be read into memory")
+
+    monkeypatch.setattr(get_data, "read_cds_query_odbc", fail_read)
+
+    class StreamingQuery(GenericDataQuery):
+        """Query class for use in tests."""
+
+        dir = str(tmp_path / "data")
+        server = "test-server"
+        batch_size = 2
+
+        def query(self):
+            """Return the query text."""
+            return "SELECT * FROM extract"
+
+    return StreamingQuery
+
+
+@pytest.mark.parametrize(
+    "filename, file_format",
+    [("extract.csv", "csv"), ("extract.parquet", "parquet"), ("extract.arrow", "ipc")],
+)
+def test_get_data_from_cds_streams_all_rows(streaming_query, filename, file_format):
+    """Test to check every batch is written to the file"""
+    streaming_query.filename = filename
+    streaming_query.file_format = file_format
+    query = streaming_query()
+
+    query.get_data_from_cds()
+
+    assert query.load_data()[VALUE].to_list() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "filename, file_format", [("extract.parquet", "parquet"), ("extract.arrow", "ipc")]
+)
+def test_get_data_from_cds_streams_column_null_in_first_batch(
+    streaming_query, cds_database, filename, file_format
+):
+    """Test to check a column with only nulls in the first batch is written with the type
+    of the later batches"""
+    cds_database.connection.execute(
+        f"UPDATE extract SET [{VALUE}] = NULL WHERE [{VALUE}] < 2"
+    )
+    cds_database.connection.commit()
+    streaming_query.filename = filename
+    streaming_query.file_format = file_format
+    query = streaming_query()
+
+    query.get_data_from_cds()
+
+    df = query.load_data()
+    assert df.schema[VALUE] == pl.Int64
+    assert df[VALUE].to_list() == [None, None, 2, 3, 4]
+
+
+def test_get_data_from_cds_writes_a_parquet_row_group_per_batch(streaming_query):
+    """Test to check each batch is written as its own Parquet row group"""
+    streaming_query.filename = "extract.parquet"
+    streaming_query.file_format = "parquet"
+    query = streaming_query()
+
+    query.get_data_from_cds()
+
+    assert pyarrow.parquet.ParquetFile(query.get_file_location()).num_row_groups == 3
+
+
+def test_write_data_file_in_batches_writes_empty_file_for_no_batches(tmp_path):
+    """Test to check an empty file is written when there are no batches"""
+    path = tmp_path / "extract.parquet"
+
+    row_count = write_data_file_in_batches(iter([]), path)
+
+    assert row_count == 0
+    assert pl.read_parquet(path).is_empty()